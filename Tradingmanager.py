@@ -1,14 +1,80 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
-import json
-import os
-from datetime import datetime
+from tkinter import ttk, messagebox, filedialog, simpledialog
+import argparse
 import random
 import math
+from collections import deque
+import threading
+import time
+
+import accounts
+import autosave
+import bootstrap
+import bot_api
+from display_scheduler import DisplayScheduler
+from equity_chart import EquityChart
+from history_view import VirtualHistoryView
+import metrics
+import outcome_solver
+import parameter_sweep
+import risk_simulator
+from session_stats import format_stats
+import sizing
+from toast import ToastManager
+import trade_export
+import trade_import
+from trading_engine import (
+    TradingEngine, TRADE_APPLIED, TARGET_HIT, STOP_HIT, STOP_BREACHED, INSUFFICIENT_BALANCE, TRADING_LOCKED
+)
+
+# PARAMETER GRID input for each sizing policy: (label, policy parameter, entry value per parameter unit)
+SIZING_INPUTS = {
+    'anti_martingale': ("MAX PRESS STEPS:", 'max_steps', 1),
+    'fixed_fractional': ("RISK FRACTION (%):", 'fraction', 100),
+    'kelly_capped': ("KELLY CAP (%):", 'cap', 100)
+}
+
+
+def _engine_field(name):
+    """Exposes a TradingEngine attribute on the window under its historical name."""
+    return property(lambda self: getattr(self.engine, name), lambda self, value: setattr(self.engine, name, value))
+
+
+def _account_field(name):
+    """Exposes an attribute of the active accounts.Account on the window."""
+    return property(lambda self: getattr(self.account, name), lambda self, value: setattr(self.account, name, value))
+
 
 class ProfessionalTradingManager:
-    def __init__(self, root):
+    engine = _account_field('engine')
+    journal = _account_field('journal')
+    stats = _account_field('stats')
+    history_store = _account_field('history_store')
+    autosaver = _account_field('autosaver')
+    session_ready = _account_field('loaded')
+    initial_capital = _engine_field('initial_capital')
+    daily_growth_target = _engine_field('daily_growth_target')
+    stop_loss_limit = _engine_field('stop_loss_limit')
+    starting_trade_value = _engine_field('starting_trade_value')
+    trade_multiplier = _engine_field('trade_multiplier')
+    current_balance = _engine_field('current_balance')
+    daily_start_balance = _engine_field('daily_start_balance')
+    current_trade_value = _engine_field('current_trade_value')
+    trades_history = _engine_field('trades_history')
+    wins_count = _engine_field('wins_count')
+    losses_count = _engine_field('losses_count')
+    session_date = _engine_field('session_date')
+
+    def __init__(self, root, started_at=None, metrics_registry=None, session_format=None, bot_server=None):
+        """`started_at`: time.perf_counter() at process start, for the time-to-first-paint report.
+        `metrics_registry`: an enabled metrics.MetricsRegistry to time the handlers (off by default).
+        `session_format`: 'json' or 'binary' snapshots; None keeps the format last used.
+        `bot_server`: a started bot_api.BotServer whose trades are applied to the active account."""
         self.root = root
+        self.bot_server = bot_server
+        self.metrics = metrics_registry or metrics.MetricsRegistry()
+        self.started_at = time.perf_counter() if started_at is None else started_at
+        self.startup_times = {} # 'first_paint' / 'session_loaded': seconds since started_at
         self.root.title("R2HABH TRADING MANAGER // CYBERPUNK EDITION") # Updated title
         self.root.geometry("1200x900")
         self.root.configure(bg='#0A0A0A') # Very dark, almost black
@@ -26,21 +92,13 @@ class ProfessionalTradingManager:
         self.button_color = '#2A2A3A' # Dark button base
         self.entry_bg = '#0F0F0F' # Even darker for entry fields
 
-        # Initialize variables (unchanged business logic)
-        self.initial_capital = 50.0
-        self.daily_growth_target = 5.0
-        self.stop_loss_limit = 5.0
-        self.starting_trade_value = 1.0
-        self.trade_multiplier = 1.5
-        
-        # Session variables
-        self.current_balance = self.initial_capital
-        self.daily_start_balance = self.initial_capital
-        self.current_trade_value = self.starting_trade_value
-        self.trades_history = []
-        self.wins_count = 0
-        self.losses_count = 0
-        self.session_date = datetime.now().strftime("%Y-%m-%d")
+        # Session state and rules live in per-account headless engines; this window is a view on the active one
+        self.account_names, active, saved_format = accounts.read_registry()
+        self.session_format = session_format or saved_format
+        accounts.write_registry(self.account_names, active, self.session_format)
+        self.accounts = {} # name -> accounts.Account, opened on first use
+        self.metrics.count_from('saves', lambda: sum(account.autosaver.saves for account in self.accounts.values()))
+        self.account = self.open_account(active)
         self.trading_tips = [
             "Risk Management: Never risk more than 1-2% of your capital on a single trade",
             "Discipline: Stick to your trading plan even during emotional times",
@@ -54,13 +112,30 @@ class ProfessionalTradingManager:
             "Risk/Reward: Aim for at least 1:2 risk/reward ratio in your trades"
         ]
         
-        # Load previous session if exists
-        self.load_session()
+        self.instrument_handlers()
+        self.trade_queue = deque() # Button / hotkey results waiting for the next idle pass, in arrival order
+        self._trade_queue_pending = False
         
-        # Create GUI
+        # Create GUI first; the previous session is loaded once the window is on screen
         self.create_widgets()
         self.update_display()
         self.show_random_tip()
+        self.set_session_controls('disabled')
+        self.toasts = ToastManager(self.root, {
+            'bg': self.panel_color, 'info': self.highlight_color, 'success': self.accent_color,
+            'warning': '#FFB000', 'error': self.loss_color
+        })
+        for key, is_win in (('w', True), ('W', True), ('l', False), ('L', False)):
+            self.root.bind(f'<KeyPress-{key}>', lambda e, is_win=is_win: self.on_trade_key(e, is_win))
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after_idle(self.on_first_paint)
+        self.poll_autosave()
+        if self.bot_server is not None:
+            self.drain_bot_events()
+        if self.metrics.enabled:
+            self.metrics.instrument(self.display, 'flush', 'update_display') # The coalesced repaint update_display queues
+            self.metrics_overlay = None
+            self.root.bind('<F12>', lambda e: self.toggle_metrics_overlay())
 
     def create_widgets(self):
         """Creates and arranges all the widgets in the main window using a structured grid layout."""
@@ -102,6 +177,7 @@ class ProfessionalTradingManager:
         self.create_balance_display(balance_frame)
         
         self.create_right_notebook(right_pane, 1, 0)
+        self.register_display()
 
     def create_header(self, parent):
         """Creates the main header section."""
@@ -119,6 +195,30 @@ class ProfessionalTradingManager:
             font=('Cyberpunk', 13), fg=self.text_color, bg=self.bg_color # Attempting a different font
         )
         subtitle_label.pack(side='left', anchor='sw', padx=15, pady=(0, 4))
+        
+        self.save_status_label = tk.Label(
+            header_frame, text="● MEMORY IDLE", font=('Consolas', 10), fg=self.text_color, bg=self.bg_color
+        )
+        self.save_status_label.pack(side='right', anchor='se', pady=(0, 4))
+        
+        self.boot_label = tk.Label(
+            header_frame, text="● BOOTING...", font=('Consolas', 9), fg=self.text_color, bg=self.bg_color
+        )
+        self.boot_label.pack(side='right', anchor='se', padx=15, pady=(0, 5))
+        
+        add_account_btn = tk.Button(
+            header_frame, text="+", command=self.add_account, bg=self.button_color, fg=self.accent_color,
+            font=('Arial', 10, 'bold'), relief=tk.FLAT, padx=6, activebackground='#3A3A4A', activeforeground=self.accent_color
+        )
+        add_account_btn.pack(side='right', anchor='se', padx=(4, 15), pady=(0, 2))
+        self.account_var = tk.StringVar(value=self.account.name)
+        self.account_box = ttk.Combobox(
+            header_frame, textvariable=self.account_var, values=self.account_names, state='readonly', width=14,
+            font=('Consolas', 10)
+        )
+        self.account_box.pack(side='right', anchor='se', pady=(0, 3))
+        self.account_box.bind('<<ComboboxSelected>>', lambda e: self.switch_account(self.account_var.get()))
+        tk.Label(header_frame, text="ACCOUNT:", font=('Consolas', 9), fg=self.text_color, bg=self.bg_color).pack(side='right', anchor='se', padx=(0, 5), pady=(0, 5))
 
     def create_panel(self, parent, title, r, c, padx_config=(0, 0), pady_config=(0, 0)):
         """Helper function to create a styled LabelFrame panel."""
@@ -164,7 +264,58 @@ class ProfessionalTradingManager:
             fg=self.highlight_color, font=('Arial', 10, 'bold'), relief=tk.FLAT, padx=15, pady=8,
             activebackground='#3A3A4A', activeforeground=self.highlight_color # Darker hover with neon text
         )
-        update_btn.grid(row=4, column=0, columnspan=2, sticky='ew', padx=15, pady=(10, 5))
+        self.sizing_var = tk.StringVar(value=self.engine.sizing.name)
+        self.sizing_param_var = tk.StringVar()
+        tk.Label(
+            parent, text="SIZING POLICY:", fg=self.text_color, bg=self.panel_color, font=('Arial', 11), anchor='w'
+        ).grid(row=4, column=0, sticky='w', padx=15, pady=8)
+        sizing_box = ttk.Combobox(
+            parent, textvariable=self.sizing_var, values=list(sizing.POLICIES), state='readonly', width=15,
+            font=('Consolas', 11)
+        )
+        sizing_box.grid(row=4, column=1, sticky='ew', padx=15, pady=8)
+        sizing_box.bind('<<ComboboxSelected>>', lambda e: self.on_sizing_selected(reset=True))
+        self.sizing_param_label = tk.Label(
+            parent, text="", fg=self.text_color, bg=self.panel_color, font=('Arial', 11), anchor='w'
+        )
+        self.sizing_param_label.grid(row=5, column=0, sticky='w', padx=15, pady=8)
+        self.sizing_param_entry = tk.Entry(
+            parent, textvariable=self.sizing_param_var, bg=self.entry_bg, fg=self.accent_color,
+            insertbackground=self.accent_color, font=('Consolas', 11), relief=tk.FLAT, width=15,
+            disabledbackground=self.panel_color
+        )
+        self.sizing_param_entry.grid(row=5, column=1, sticky='ew', padx=15, pady=8)
+        self.show_sizing(self.engine.sizing)
+        
+        update_btn.grid(row=6, column=0, columnspan=2, sticky='ew', padx=15, pady=(10, 5))
+        self.session_buttons = [update_btn]
+        
+        sweep_btn = tk.Button(
+            parent, text="SWEEP MODE", command=self.open_sweep_window, bg=self.button_color,
+            fg=self.accent_color, font=('Arial', 10, 'bold'), relief=tk.FLAT, padx=15, pady=6,
+            activebackground='#3A3A4A', activeforeground=self.accent_color
+        )
+        sweep_btn.grid(row=7, column=0, columnspan=2, sticky='ew', padx=15, pady=(0, 5))
+
+        self.odds_win_rate_var = tk.StringVar(value="50")
+        tk.Label(
+            parent, text="ODDS AT WIN RATE (%):", fg=self.text_color, bg=self.panel_color,
+            font=('Arial', 11), anchor='w'
+        ).grid(row=8, column=0, sticky='w', padx=15, pady=(8, 0))
+        tk.Entry(
+            parent, textvariable=self.odds_win_rate_var, bg=self.entry_bg, fg=self.accent_color,
+            insertbackground=self.accent_color, font=('Consolas', 11), relief=tk.FLAT, width=15
+        ).grid(row=8, column=1, sticky='ew', padx=15, pady=(8, 0))
+        self.odds_label = tk.Label(
+            parent, text="", fg=self.highlight_color, bg=self.panel_color, font=('Consolas', 9),
+            justify='left', anchor='w'
+        )
+        self.odds_label.grid(row=9, column=0, columnspan=2, sticky='w', padx=15, pady=(4, 0))
+        self._odds_pending = False
+        for var in (self.capital_var, self.growth_var, self.stop_loss_var, self.multiplier_var, self.odds_win_rate_var,
+                    self.sizing_var, self.sizing_param_var):
+            var.trace_add('write', lambda *args: self.schedule_odds())
+        self.schedule_odds()
 
     def create_balance_display(self, parent):
         parent.columnconfigure(0, weight=1)
@@ -224,14 +375,14 @@ class ProfessionalTradingManager:
         buttons_frame.columnconfigure(1, weight=1)
         
         self.win_button = tk.Button(
-            buttons_frame, text="✅ GAIN PROTOCOL", command=self.execute_win, bg=self.win_color, fg='black', # Black text on neon
+            buttons_frame, text="✅ GAIN PROTOCOL [W]", command=lambda: self.queue_trade(True), bg=self.win_color, fg='black', # Black text on neon
             font=('Arial', 13, 'bold'), height=2, relief=tk.FLAT, bd=0, 
             activebackground='#00CC77', activeforeground='black' 
         )
         self.win_button.grid(row=0, column=0, padx=(0, 5), sticky='nsew')
         
         self.lose_button = tk.Button(
-            buttons_frame, text="❌ LOSS PROTOCOL", command=self.execute_loss, bg=self.loss_color, fg='white', # White text on neon
+            buttons_frame, text="❌ LOSS PROTOCOL [L]", command=lambda: self.queue_trade(False), bg=self.loss_color, fg='white', # White text on neon
             font=('Arial', 13, 'bold'), height=2, relief=tk.FLAT, bd=0, 
             activebackground='#EE008C', activeforeground='white' 
         )
@@ -285,34 +436,51 @@ class ProfessionalTradingManager:
         wisdom_tab = tk.Frame(notebook, bg=self.panel_color, padx=10, pady=10)
         strategy_tab = tk.Frame(notebook, bg=self.panel_color, padx=10, pady=10)
         risk_tab = tk.Frame(notebook, bg=self.panel_color, padx=10, pady=10)
+        chart_tab = tk.Frame(notebook, bg=self.panel_color, padx=10, pady=10)
 
         notebook.add(history_tab, text='📊 DATA LOG') # Cyberpunk naming
+        notebook.add(chart_tab, text='📉 EQUITY CURVE')
         notebook.add(wisdom_tab, text='💡 KNOWLEDGE CORE')
         notebook.add(strategy_tab, text='📈 STRATEGY PROTOCOLS')
         notebook.add(risk_tab, text='🛡️ RISK ANALYTICS')
 
-        # Populate tabs
+        # Only the DATA LOG is built now; the other tabs are populated the first time they are selected
         self.create_history_display(history_tab)
-        self.populate_wisdom_tab(wisdom_tab)
-        self.populate_strategy_tab(strategy_tab)
-        self.populate_risk_tab(risk_tab)
+        self.tip_label = None
+        self.pending_tabs = {
+            str(wisdom_tab): (self.populate_wisdom_tab, wisdom_tab),
+            str(strategy_tab): (self.populate_strategy_tab, strategy_tab),
+            str(risk_tab): (self.populate_risk_tab, risk_tab),
+            str(chart_tab): (self.populate_chart_tab, chart_tab)
+        }
+        notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+
+    def on_tab_changed(self, event):
+        """Builds a notebook tab's widgets on its first selection."""
+        pending = self.pending_tabs.pop(event.widget.select(), None)
+        if pending is not None:
+            populate, tab = pending
+            populate(tab)
 
     def create_history_display(self, parent):
-        """Creates the ScrolledText widget for trade history."""
+        """Creates the virtualized trade history view (only visible rows are drawn)."""
         parent.rowconfigure(0, weight=1)
         parent.columnconfigure(0, weight=1)
-        self.history_text = scrolledtext.ScrolledText(
-            parent, bg=self.entry_bg, fg=self.text_color, font=('Consolas', 10), # Monospaced font
-            state='disabled', padx=10, pady=10, relief=tk.FLAT, bd=0, insertbackground=self.text_color # Cursor color
+        self.history_view = VirtualHistoryView(
+            parent, source=lambda: self.trades_history,
+            colors={
+                'bg': self.entry_bg, 'panel': self.panel_color, 'text': self.text_color, 'header': self.highlight_color,
+                'win': self.win_color, 'loss': self.loss_color, 'select': self.button_color
+            }
         )
-        self.history_text.grid(row=0, column=0, sticky='nsew')
+        self.history_view.grid(row=0, column=0, sticky='nsew')
 
     def populate_wisdom_tab(self, parent):
         """Populates the Trading Wisdom tab."""
         parent.rowconfigure(0, weight=1)
         parent.columnconfigure(0, weight=1)
         self.tip_label = tk.Label(
-            parent, text="", wraplength=480, justify='left', fg=self.text_color, 
+            parent, text=self.current_tip, wraplength=480, justify='left', fg=self.text_color, 
             bg=self.panel_color, font=('Arial', 12, 'italic'), padx=15, pady=15
         )
         self.tip_label.grid(row=0, column=0, sticky='nsew')
@@ -350,6 +518,24 @@ class ProfessionalTradingManager:
         )
         strategy_label.pack(fill='both', expand=True)
 
+    def populate_chart_tab(self, parent):
+        """Equity curve of the current cycle; new trades append segments on the coalesced repaint."""
+        self.equity_chart = EquityChart(
+            parent, source=lambda: self.trades_history,
+            levels=lambda: (self.daily_start_balance, self.calculate_daily_target(), self.calculate_stop_loss()),
+            colors={
+                'bg': self.entry_bg, 'panel': self.panel_color, 'grid': '#4A4A5A', 'line': self.accent_color,
+                'target': self.highlight_color, 'stop': self.loss_color, 'text': self.text_color
+            }
+        )
+        self.equity_chart.pack(fill='both', expand=True)
+        self.display.register(
+            'chart', lambda: (id(self.trades_history), len(self.trades_history), self.daily_start_balance,
+                              self.calculate_daily_target(), self.calculate_stop_loss()),
+            lambda _: self.equity_chart.refresh()
+        )
+        self.display.mark('chart')
+    
     def populate_risk_tab(self, parent):
         """Populates the Risk Management tab."""
         risk_text = """// QUANTUM RISK MANAGEMENT CORE //
@@ -374,10 +560,75 @@ class ProfessionalTradingManager:
             padx=15, pady=15, anchor='nw'
         )
         risk_label.pack(fill='both', expand=True)
+        
+        self.stats_label = tk.Label(
+            parent, text="", justify='left', anchor='w', fg=self.highlight_color,
+            bg=self.entry_bg, font=('Consolas', 10), padx=15, pady=10
+        )
+        self.stats_label.pack(fill='x', padx=15, pady=(0, 10))
+        self.display.register('analytics', lambda: format_stats(self.stats), lambda text: self.stats_label.config(text=text))
+        self.display.mark('analytics')
+        self.create_simulator_panel(parent)
+
+    def create_simulator_panel(self, parent):
+        """Monte Carlo risk-of-ruin runner for the current parameter grid."""
+        sim_frame = tk.Frame(parent, bg=self.panel_color)
+        sim_frame.pack(fill='x', padx=15, pady=(0, 10))
+        
+        self.sim_win_rate_var = tk.StringVar(value="50")
+        self.sim_sessions_var = tk.StringVar(value="1000000")
+        for label_text, var in (("WIN RATE (%):", self.sim_win_rate_var), ("SESSIONS:", self.sim_sessions_var)):
+            tk.Label(sim_frame, text=label_text, fg=self.text_color, bg=self.panel_color, font=('Arial', 10)).pack(side='left')
+            tk.Entry(
+                sim_frame, textvariable=var, bg=self.entry_bg, fg=self.accent_color, insertbackground=self.accent_color,
+                font=('Consolas', 10), relief=tk.FLAT, width=9
+            ).pack(side='left', padx=(5, 15))
+        
+        self.sim_button = tk.Button(
+            sim_frame, text="RUN MONTE CARLO", command=self.run_simulation, bg=self.button_color,
+            fg=self.highlight_color, font=('Arial', 10, 'bold'), relief=tk.FLAT, padx=10, pady=4,
+            activebackground='#3A3A4A', activeforeground=self.highlight_color
+        )
+        self.sim_button.pack(side='right')
+        
+        self.sim_result_label = tk.Label(
+            parent, text="// SIMULATION IDLE //", justify='left', anchor='w', fg=self.accent_color,
+            bg=self.entry_bg, font=('Consolas', 10), padx=15, pady=10
+        )
+        self.sim_result_label.pack(fill='x', padx=15, pady=(0, 10))
+        self.create_bootstrap_panel(parent)
+
+    def create_bootstrap_panel(self, parent):
+        """Block bootstrap of this cycle's recorded trades under the current sizing and locks."""
+        boot_frame = tk.Frame(parent, bg=self.panel_color)
+        boot_frame.pack(fill='x', padx=15, pady=(0, 10))
+        
+        self.boot_resamples_var = tk.StringVar(value="100000")
+        self.boot_block_var = tk.StringVar(value="AUTO")
+        for label_text, var in (("RESAMPLES:", self.boot_resamples_var), ("BLOCK:", self.boot_block_var)):
+            tk.Label(boot_frame, text=label_text, fg=self.text_color, bg=self.panel_color, font=('Arial', 10)).pack(side='left')
+            tk.Entry(
+                boot_frame, textvariable=var, bg=self.entry_bg, fg=self.accent_color, insertbackground=self.accent_color,
+                font=('Consolas', 10), relief=tk.FLAT, width=9
+            ).pack(side='left', padx=(5, 15))
+        
+        self.boot_button = tk.Button(
+            boot_frame, text="BOOTSTRAP TRADE LOG", command=self.run_bootstrap, bg=self.button_color,
+            fg=self.highlight_color, font=('Arial', 10, 'bold'), relief=tk.FLAT, padx=10, pady=4,
+            activebackground='#3A3A4A', activeforeground=self.highlight_color
+        )
+        self.boot_button.pack(side='right')
+        self.boot_cancel = None
+        
+        self.boot_result_label = tk.Label(
+            parent, text="// BOOTSTRAP IDLE //", justify='left', anchor='w', fg=self.accent_color,
+            bg=self.entry_bg, font=('Consolas', 10), padx=15, pady=10
+        )
+        self.boot_result_label.pack(fill='x', padx=15, pady=(0, 10))
 
     def create_control_buttons(self, parent):
         """Creates the main control buttons and the quote label."""
-        parent.columnconfigure((0, 1, 2), weight=1)
+        parent.columnconfigure((0, 1, 2, 3, 4), weight=1)
         
         button_style = {
             'font': ('Arial', 10, 'bold'), 'relief': tk.FLAT, 'padx': 15, 'pady': 8
@@ -392,6 +643,13 @@ class ProfessionalTradingManager:
         save_btn = tk.Button(parent, text="💾 SAVE MEMORY", command=self.save_session, bg='#8A2BE2', fg='white', **button_style, activebackground='#6A1BBF') # Electric Purple
         save_btn.grid(row=0, column=2, padx=5, sticky='ew')
         
+        import_btn = tk.Button(parent, text="📥 IMPORT FILLS", command=self.import_trades, bg='#00BFFF', fg='black', **button_style, activebackground='#0099CC') # Electric Blue
+        import_btn.grid(row=0, column=3, padx=5, sticky='ew')
+        
+        export_btn = tk.Button(parent, text="📤 EXPORT LOG", command=self.export_trades, bg='#00FF8C', fg='black', **button_style, activebackground='#00CC70') # Neon Green
+        export_btn.grid(row=0, column=4, padx=5, sticky='ew')
+        self.session_buttons += [new_day_btn, reset_btn, save_btn, import_btn, export_btn]
+        
         quotes = [
             "DISCIPLINE IS THE ALGORITHM BETWEEN GOALS AND ACHIEVEMENT.",
             "THE MARKET IS A DATA CONDUIT TRANSFERRING CRYPTOS FROM THE IMPATIENT TO THE PATIENT.",
@@ -404,97 +662,363 @@ class ProfessionalTradingManager:
             parent, text=random.choice(quotes), fg=self.highlight_color, bg=self.bg_color,
             font=('Consolas', 10, 'italic'), padx=10, wraplength=350, justify='center' # Monospaced font for quotes
         )
-        self.quote_label.grid(row=1, column=0, columnspan=3, sticky='ew', pady=(15, 0))
+        self.quote_label.grid(row=1, column=0, columnspan=5, sticky='ew', pady=(15, 0))
 
     # ===================================================================
-    # BUSINESS LOGIC AND HELPER METHODS (Unchanged from original code)
+    # BUSINESS LOGIC AND HELPER METHODS (rules delegated to TradingEngine)
     # ===================================================================
 
+    def schedule_odds(self):
+        """Coalesces keystrokes in the PARAMETER GRID into one odds refresh per idle pass."""
+        if not self._odds_pending:
+            self._odds_pending = True
+            self.root.after_idle(self.refresh_odds)
+    
+    def refresh_odds(self):
+        """Odds for the settings as typed: exact for martingale / fixed sizing, a fixed-seed batch run otherwise.
+        Both are memoized, so revisiting a value is instant."""
+        self._odds_pending = False
+        try:
+            policy = self.sizing_from_inputs()
+            settings = (
+                float(self.capital_var.get()), float(self.growth_var.get()), float(self.stop_loss_var.get()),
+                float(self.multiplier_var.get())
+            )
+            win_rate = float(self.odds_win_rate_var.get()) / 100
+            if policy.name in ('martingale', 'fixed'):
+                if policy.name == 'fixed':
+                    settings = settings[:3] + (1.0,)
+                text = outcome_solver.format_odds(
+                    outcome_solver.solve(*settings, win_rate, self.engine.starting_trade_value)
+                ).replace('   P(INSUFF)', '\nP(INSUFF)')
+            else:
+                odds = sizing.estimate_odds(
+                    tuple(sorted(policy.to_dict().items())), *settings, self.engine.starting_trade_value, win_rate
+                )
+                text = (f"≈ P(TARGET) {odds['p_target']:.1%}   P(STOP) {odds['p_stop']:.1%}\n"
+                        f"P(OPEN) {odds['p_open']:.1%}   E[TRADES] {odds['expected_trades']:.1f}")
+        except (ValueError, RuntimeError) as e:
+            self.odds_label.config(text=f"ODDS OFFLINE: {e}" if isinstance(e, RuntimeError) else "ODDS: AWAITING VALID INPUT") # Cyberpunk message
+            return
+        self.odds_label.config(text=text)
+    
+    def sizing_from_inputs(self):
+        """The sizing policy described by the PARAMETER GRID; ValueError on bad input."""
+        name = self.sizing_var.get()
+        spec = SIZING_INPUTS.get(name)
+        if spec is None:
+            return sizing.make_policy(name)
+        _, param, scale = spec
+        value = float(self.sizing_param_var.get()) / scale
+        params = {param: int(value) if param == 'max_steps' else value}
+        if name == 'kelly_capped': # The edge Kelly sizes for is the win rate the odds are shown at
+            params['win_rate'] = float(self.odds_win_rate_var.get()) / 100
+        return sizing.make_policy(name, **params)
+    
+    def show_sizing(self, policy):
+        """Puts a policy's name and parameter into the PARAMETER GRID inputs."""
+        self.sizing_var.set(policy.name)
+        spec = SIZING_INPUTS.get(policy.name)
+        if spec is not None:
+            self.sizing_param_var.set(f"{policy.params[spec[1]] * spec[2]:g}")
+        self.on_sizing_selected()
+    
+    def on_sizing_selected(self, reset=False):
+        """Relabels the parameter input for the chosen policy; `reset` loads that policy's default value."""
+        spec = SIZING_INPUTS.get(self.sizing_var.get())
+        if spec is None:
+            self.sizing_param_label.config(text="POLICY PARAMETER:")
+            self.sizing_param_entry.config(state='disabled')
+            return
+        label, param, scale = spec
+        self.sizing_param_label.config(text=label)
+        self.sizing_param_entry.config(state='normal')
+        if reset or not self.sizing_param_var.get():
+            self.sizing_param_var.set(f"{sizing.POLICIES[self.sizing_var.get()].defaults[param] * scale:g}")
+    
+    def run_simulation(self):
+        """Starts a Monte Carlo run on a worker thread so the window stays responsive."""
+        try:
+            win_rate = float(self.sim_win_rate_var.get()) / 100
+            sessions = int(self.sim_sessions_var.get())
+            if sessions <= 0: raise ValueError("Sessions must be positive")
+        except ValueError as e:
+            self.notify(f"INPUT ERROR: {str(e)}", 'error') # Cyberpunk message
+            return
+        params = (self.initial_capital, self.daily_growth_target, self.stop_loss_limit, self.trade_multiplier, win_rate)
+        policy = self.engine.sizing # The sizing actually in force, not just what the selector shows
+        outcome = {}
+        
+        def work():
+            try:
+                outcome['result'] = risk_simulator.simulate_sessions(*params, sessions=sessions, policy=policy)
+            except Exception as e:
+                outcome['error'] = e
+        
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
+        self.sim_button.config(state='disabled')
+        self.sim_result_label.config(text="// SIMULATION RUNNING... //")
+        self.poll_simulation(worker, outcome)
+    
+    def poll_simulation(self, worker, outcome):
+        if worker.is_alive():
+            self.root.after(100, self.poll_simulation, worker, outcome)
+            return
+        self.sim_button.config(state='normal')
+        if 'error' in outcome:
+            self.sim_result_label.config(text=f"SIMULATION FAILURE: {outcome['error']}")
+        else:
+            self.sim_result_label.config(text=risk_simulator.format_report(outcome['result']))
+    
+    def run_bootstrap(self):
+        """Resamples the trade log on a process pool from a worker thread; the button cancels a running job."""
+        if self.boot_cancel is not None: # Running: the button acts as CANCEL
+            self.boot_cancel.set()
+            return
+        try:
+            resamples = int(self.boot_resamples_var.get())
+            block_text = self.boot_block_var.get().strip().upper()
+            block = None if block_text in ('', 'AUTO') else int(block_text)
+            log = bootstrap.outcome_log(self.trades_history.types)
+            if len(log) < bootstrap.MIN_LOG_TRADES:
+                raise ValueError(f"Record at least {bootstrap.MIN_LOG_TRADES} trades to bootstrap")
+        except (ValueError, RuntimeError) as e:
+            self.notify(f"INPUT ERROR: {str(e)}", 'error') # Cyberpunk message
+            return
+        # Rules are captured here, on the Tk thread; the worker never touches the engine
+        params = (self.initial_capital, self.daily_growth_target, self.stop_loss_limit, self.trade_multiplier,
+                  self.starting_trade_value)
+        policy = self.engine.sizing
+        cancel = self.boot_cancel = threading.Event()
+        progress = {'done': 0, 'total': resamples}
+        
+        def work():
+            try:
+                progress['result'] = bootstrap.run_bootstrap(
+                    log, resamples, policy, *params, block=block, cancel_event=cancel,
+                    progress=lambda done, total: progress.update(done=done)
+                )
+            except Exception as e:
+                progress['error'] = e
+        
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
+        self.boot_button.config(text="CANCEL BOOTSTRAP")
+        self.poll_bootstrap(worker, progress)
+    
+    def poll_bootstrap(self, worker, progress):
+        if worker.is_alive():
+            status = f"// BOOTSTRAP RUNNING... {progress['done']:,}/{progress['total']:,} //"
+            self.boot_result_label.config(text=status + (" CANCELLING..." if self.boot_cancel.is_set() else ""))
+            self.root.after(200, self.poll_bootstrap, worker, progress)
+            return
+        self.boot_button.config(text="BOOTSTRAP TRADE LOG")
+        self.boot_cancel = None
+        if 'error' in progress:
+            self.boot_result_label.config(text=f"BOOTSTRAP FAILURE: {progress['error']}")
+        else:
+            self.boot_result_label.config(text=bootstrap.format_report(progress['result']))
+    
+    def open_sweep_window(self):
+        """Non-modal window that sweeps the parameter grid on all cores and streams rows to a CSV."""
+        if getattr(self, 'sweep_window', None) is not None and self.sweep_window.winfo_exists():
+            self.sweep_window.lift()
+            return
+        window = self.sweep_window = tk.Toplevel(self.root)
+        window.title("PARAMETER SWEEP // MULTI-CORE")
+        window.configure(bg=self.panel_color, padx=15, pady=15)
+        window.transient(self.root)
+        
+        self.sweep_vars = {
+            'growth': tk.StringVar(value="2:10:1"), 'stop': tk.StringVar(value="2:10:1"),
+            'multiplier': tk.StringVar(value="1.5,2,2.5"), 'win_rate': tk.StringVar(value="0.45,0.5,0.55"),
+            'sessions': tk.StringVar(value="10000"), 'out': tk.StringVar(value="sweep.csv")
+        }
+        labels = [
+            ("GROWTH TARGETS (%):", 'growth'), ("STOP LOSS LIMITS (%):", 'stop'), ("LOSS MULTIPLIERS:", 'multiplier'),
+            ("WIN RATES (0-1):", 'win_rate'), ("SESSIONS PER CELL:", 'sessions'), ("OUTPUT CSV:", 'out')
+        ]
+        for i, (label_text, key) in enumerate(labels):
+            tk.Label(window, text=label_text, fg=self.text_color, bg=self.panel_color, font=('Arial', 10), anchor='w').grid(row=i, column=0, sticky='w', pady=4)
+            tk.Entry(
+                window, textvariable=self.sweep_vars[key], bg=self.entry_bg, fg=self.accent_color,
+                insertbackground=self.accent_color, font=('Consolas', 10), relief=tk.FLAT, width=20
+            ).grid(row=i, column=1, sticky='ew', padx=(10, 0), pady=4)
+        tk.Label(window, text="LIST (1,2,3) OR RANGE (START:STOP:STEP)", fg=self.highlight_color, bg=self.panel_color, font=('Arial', 8)).grid(row=len(labels), column=0, columnspan=2, sticky='w')
+        
+        self.sweep_status_label = tk.Label(window, text="// SWEEP IDLE //", fg=self.accent_color, bg=self.panel_color, font=('Consolas', 10))
+        self.sweep_status_label.grid(row=len(labels) + 1, column=0, columnspan=2, sticky='w', pady=(10, 5))
+        self.sweep_button = tk.Button(
+            window, text="START SWEEP", command=self.start_sweep, bg=self.button_color, fg=self.highlight_color,
+            font=('Arial', 10, 'bold'), relief=tk.FLAT, padx=10, pady=4, activebackground='#3A3A4A', activeforeground=self.highlight_color
+        )
+        self.sweep_button.grid(row=len(labels) + 2, column=0, columnspan=2, sticky='ew')
+        self.sweep_cancel = None
+    
+    def start_sweep(self):
+        if self.sweep_cancel is not None: # Running: the button acts as CANCEL
+            self.sweep_cancel.set()
+            return
+        try:
+            cells = parameter_sweep.build_grid(*(parameter_sweep.parse_range(self.sweep_vars[key].get()) for key in ('growth', 'stop', 'multiplier', 'win_rate')))
+            sessions = int(self.sweep_vars['sessions'].get())
+            if not cells: raise ValueError("Grid is empty")
+        except ValueError as e:
+            self.notify(f"INPUT ERROR: {str(e)}", 'error') # Cyberpunk message
+            return
+        path = self.sweep_vars['out'].get()
+        capital = self.initial_capital
+        policy = self.engine.sizing
+        cancel = self.sweep_cancel = threading.Event()
+        progress = {'done': 0, 'total': len(cells)}
+        
+        def work():
+            try:
+                parameter_sweep.run_sweep_to_csv(
+                    path, cells, progress=lambda done, total: progress.update(done=done),
+                    initial_capital=capital, sessions=sessions, cancel_event=cancel, policy=policy
+                )
+            except Exception as e:
+                progress['error'] = e
+        
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
+        self.sweep_button.config(text="CANCEL SWEEP")
+        self.poll_sweep(worker, progress, path)
+    
+    def poll_sweep(self, worker, progress, path):
+        if not self.sweep_window.winfo_exists(): # Closing the window cancels the sweep
+            self.sweep_cancel.set()
+            self.sweep_cancel = None
+            return
+        status = f"CELLS: {progress['done']}/{progress['total']}"
+        if worker.is_alive():
+            self.sweep_status_label.config(text=status + (" // CANCELLING..." if self.sweep_cancel.is_set() else ""))
+            self.root.after(200, self.poll_sweep, worker, progress, path)
+            return
+        if 'error' in progress:
+            status = f"SWEEP FAILURE: {progress['error']}"
+        else:
+            status += f" // {'CANCELLED' if self.sweep_cancel.is_set() else 'COMPLETE'} -> {path}"
+        self.sweep_status_label.config(text=status)
+        self.sweep_button.config(text="START SWEEP")
+        self.sweep_cancel = None
+    
     def show_random_tip(self):
-        tip = random.choice(self.trading_tips)
-        self.tip_label.config(text=tip)
+        self.current_tip = random.choice(self.trading_tips)
+        if self.tip_label is not None: # KNOWLEDGE CORE not opened yet: shown when it is built
+            self.tip_label.config(text=self.current_tip)
     
     def update_settings(self):
         try:
             new_capital = float(self.capital_var.get())
-            self.daily_growth_target = float(self.growth_var.get())
-            self.stop_loss_limit = float(self.stop_loss_var.get())
-            self.trade_multiplier = float(self.multiplier_var.get())
-            
-            if new_capital <= 0: raise ValueError("Capital must be positive")
-            if self.daily_growth_target <= 0: raise ValueError("Growth target must be positive")
-            if self.stop_loss_limit <= 0: raise ValueError("Stop loss must be positive")
-            if self.trade_multiplier <= 1: raise ValueError("Multiplier must be greater than 1")
-            
-            if new_capital != self.initial_capital:
-                self.initial_capital = new_capital
-                self.current_balance = new_capital
-                self.daily_start_balance = new_capital
-                self.current_trade_value = self.starting_trade_value
-                self.trades_history = []
-                self.wins_count = 0
-                self.losses_count = 0
-                messagebox.showinfo("Capital Updated", f"Capital updated to ${new_capital:.2f}\nSession has been reset.")
-            else:
-                self.initial_capital = new_capital
+            capital_changed = self.engine.apply_settings(
+                new_capital, float(self.growth_var.get()), float(self.stop_loss_var.get()), float(self.multiplier_var.get()),
+                self.sizing_from_inputs()
+            )
+            self.record_lifecycle(clear_history=capital_changed)
+            if capital_changed:
+                self.notify(f"Capital updated to ${new_capital:.2f}. Session has been reset.")
             
             self.enable_trading()
             self.update_display()
-            messagebox.showinfo("Success", "SETTINGS PROTOCOL APPLIED! 🎉") # Cyberpunk message
+            self.notify("SETTINGS PROTOCOL APPLIED! 🎉", 'success') # Cyberpunk message
             
         except ValueError as e:
-            messagebox.showerror("Error", f"INPUT ERROR: {str(e)}") # Cyberpunk message
+            self.notify(f"INPUT ERROR: {str(e)}", 'error') # Cyberpunk message
     
     def calculate_daily_target(self):
-        return self.daily_start_balance * (1 + self.daily_growth_target / 100)
+        return self.engine.calculate_daily_target()
     
     def calculate_stop_loss(self):
-        return max(0.01, self.daily_start_balance * (1 - self.stop_loss_limit / 100))
+        return self.engine.calculate_stop_loss()
+    
+    def on_trade_key(self, event, is_win):
+        """W / L hotkeys; ignored while typing into an entry field."""
+        if isinstance(event.widget, (tk.Entry, ttk.Entry)):
+            return
+        if not self.session_ready:
+            self.notify("SESSION STILL LOADING", 'warning') # Cyberpunk message
+            return
+        self.queue_trade(is_win)
+    
+    def queue_trade(self, is_win):
+        """Queues a result; everything queued is applied in order on the next idle pass."""
+        self.trade_queue.append(is_win)
+        if not self._trade_queue_pending:
+            self._trade_queue_pending = True
+            self.root.after_idle(self.process_trade_queue)
+    
+    def process_trade_queue(self):
+        """Applies queued results in order. Once a trade locks the session the rest of the burst is dropped;
+        the engine refuses anything after a lock as well, so no queued trade can slip through."""
+        self._trade_queue_pending = False
+        queue = self.trade_queue
+        while queue:
+            (self.execute_win if queue.popleft() else self.execute_loss)()
+            if self.engine.locked and queue:
+                self.notify(f"{len(queue)} QUEUED TRADES DISCARDED: TRADING LOCKED", 'warning') # Cyberpunk message
+                queue.clear()
     
     def execute_win(self):
-        if self.check_can_trade():
-            self.current_balance += self.current_trade_value
-            self.trades_history.append({
-                'type': 'WIN', 'amount': self.current_trade_value, 'balance': self.current_balance,
-                'timestamp': datetime.now().strftime("%H:%M:%S")
-            })
-            self.wins_count += 1
-            self.current_trade_value = self.starting_trade_value
-            self.update_display()
-            self.check_daily_target()
+        self.handle_trade_event(self.engine.win())
             
     def execute_loss(self):
-        if self.check_can_trade():
-            self.current_balance -= self.current_trade_value
-            self.trades_history.append({
-                'type': 'LOSE', 'amount': self.current_trade_value, 'balance': self.current_balance,
-                'timestamp': datetime.now().strftime("%H:%M:%S")
-            })
-            self.losses_count += 1
-            self.current_trade_value = max(1.0, self.current_trade_value * self.trade_multiplier)
-            self.update_display()
-            self.check_stop_loss()
-    
-    def check_can_trade(self):
-        if self.current_balance < self.current_trade_value:
-            messagebox.showwarning("INSUFFICIENT CREDITS", f"INSUFFICIENT BALANCE FOR ${self.current_trade_value:.2f} TRADE!") # Cyberpunk message
-            return False
-        stop_loss = self.calculate_stop_loss()
-        if self.current_balance <= stop_loss:
-            messagebox.showwarning("STOP LOSS BREACHED", "STOP LOSS THRESHOLD REACHED! SYSTEM LOCKDOWN INITIATED!") # Cyberpunk message
-            self.disable_trading() 
-            return False
-        return True
-    
-    def check_daily_target(self):
-        if self.current_balance >= self.calculate_daily_target():
-            self.show_success_popup()
+        self.handle_trade_event(self.engine.loss())
+    
+    def handle_trade_event(self, event):
+        """Presents a TradingEngine result event: refresh, warn or lock the interface."""
+        if event == INSUFFICIENT_BALANCE:
+            self.notify(f"INSUFFICIENT BALANCE FOR ${self.current_trade_value:.2f} TRADE!", 'warning') # Cyberpunk message
+        elif event == STOP_BREACHED:
+            self.metrics.count('locks')
+            self.notify("STOP LOSS THRESHOLD REACHED! SYSTEM LOCKDOWN INITIATED!", 'error') # Cyberpunk message
             self.disable_trading()
+        elif event == TRADING_LOCKED:
+            self.notify("TRADING LOCKED: START A NEW CYCLE TO CONTINUE", 'warning') # Cyberpunk message
+        elif event in TRADE_APPLIED:
+            self.record_trade()
+            self.update_display()
+            if event == TARGET_HIT:
+                self.metrics.count('locks')
+                self.show_success_popup()
+                self.disable_trading()
+            elif event == STOP_HIT:
+                self.metrics.count('locks')
+                self.show_stop_loss_popup()
+                self.disable_trading()
+    
+    def record_trade(self):
+        """Journals, archives and accounts for the trade the engine just applied."""
+        self.metrics.count('trades')
+        self.journal.append(self.trades_history.record(-1), self.current_trade_value)
+        self.history_store.record_last(self.trades_history)
+        self.stats.add_last(self.trades_history)
+        if self.journal.needs_compaction():
+            self.checkpoint_session()
     
-    def check_stop_loss(self):
-        if self.current_balance <= self.calculate_stop_loss():
-            self.show_stop_loss_popup()
+    def drain_bot_events(self):
+        """Applies queued bot results in arrival order, with one repaint and at most one lock popup per batch."""
+        batch = self.bot_server.drain() if self.session_ready else [] # Held in the queue until the session is loaded
+        lock_event = None
+        for is_win, reply in batch:
+            event, payload = bot_api.apply_result(self.engine, is_win)
+            if event in TRADE_APPLIED:
+                self.record_trade()
+            if event in (TARGET_HIT, STOP_HIT, STOP_BREACHED):
+                self.metrics.count('locks')
+                lock_event = event
+            reply(payload)
+        if batch:
+            self.update_display()
+        if lock_event is not None:
             self.disable_trading()
+            if lock_event == TARGET_HIT:
+                self.show_success_popup()
+            elif lock_event == STOP_HIT:
+                self.show_stop_loss_popup()
+        self.root.after(1 if batch else 10, self.drain_bot_events) # Poll fast while bots are sending
     
     def show_success_popup(self):
         dialog = tk.Toplevel(self.root)
@@ -502,8 +1026,7 @@ class ProfessionalTradingManager:
         dialog.geometry("400x300")
         dialog.configure(bg=self.panel_color)
         dialog.resizable(False, False)
-        dialog.transient(self.root)
-        dialog.grab_set()
+        dialog.transient(self.root) # Non-modal: hotkeys and the rest of the window stay live
 
         tk.Label(dialog, text="✅", font=('Arial', 48), fg=self.accent_color, bg=self.panel_color).pack(pady=10) # Green checkmark
         tk.Label(dialog, text="DAILY TARGET ACHIEVED! // DATA INTEGRITY OPTIMAL!", font=('Arial', 14, 'bold'), fg=self.highlight_color, bg=self.panel_color, wraplength=350, justify='center').pack(pady=5)
@@ -525,8 +1048,7 @@ class ProfessionalTradingManager:
         dialog.geometry("450x300")
         dialog.configure(bg=self.panel_color)
         dialog.resizable(False, False)
-        dialog.transient(self.root)
-        dialog.grab_set()
+        dialog.transient(self.root) # Non-modal: hotkeys and the rest of the window stay live
 
         tk.Label(dialog, text="⚠️ SYSTEM BREACH! 📉", font=('Arial', 16, 'bold'), fg=self.loss_color, bg=self.panel_color).pack(pady=20)
         
@@ -545,36 +1067,99 @@ class ProfessionalTradingManager:
         
         self.center_dialog(dialog)
 
+    def notify(self, text, level='info', duration_ms=None):
+        """Non-modal toast; never blocks the event loop or grabs input."""
+        self.toasts.show(text, level, duration_ms)
+    
     def center_dialog(self, dialog):
         dialog.update_idletasks()
         x = self.root.winfo_x() + (self.root.winfo_width() // 2) - (dialog.winfo_width() // 2)
         y = self.root.winfo_y() + (self.root.winfo_height() // 2) - (dialog.winfo_height() // 2)
         dialog.geometry(f"+{x}+{y}")
     
+    def import_trades(self):
+        """Applies a CSV/JSONL file of fills through the session rules with a single refresh at the end."""
+        path = filedialog.askopenfilename(
+            title="IMPORT TRADE FILLS", filetypes=[("Trade files", "*.csv *.jsonl"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        archived = len(self.trades_history)
+        try:
+            report = trade_import.import_file(self.engine, path)
+        except (OSError, ValueError, KeyError) as e:
+            self.notify(f"IMPORT ERROR: DATA STREAM REJECTED: {e}", 'error') # Cyberpunk message
+            return
+        finally:
+            history = self.trades_history
+            if len(history) > archived: # Durable before trading resumes, whether or not a snapshot is in flight
+                self.journal.append_batch([history.record(i) for i in range(archived, len(history))],
+                                          self.engine.to_state_dict())
+            self.checkpoint_session() # Folds the batch into the next snapshot
+            self.history_store.record_history(self.trades_history, archived)
+            self.stats.extend(self.trades_history, archived)
+            self.update_display()
+        
+        summary = f"📥 {report['rows_applied']} TRADES IMPORTED.\n\nBALANCE: ${self.current_balance:.2f}"
+        if report['size_mismatches']:
+            summary += f"\n{report['size_mismatches']} ROWS DIFFER FROM PROTOCOL SIZING."
+        if report['locked_at_row'] is not None:
+            summary += f"\n\nTRADING LOCKED AT ROW {report['locked_at_row']}: {report['last_event'].replace('_', ' ')}"
+        if self.engine.locked:
+            self.disable_trading()
+        self.notify(summary, 'success', duration_ms=8000) # Cyberpunk message
+    
+    def export_trades(self):
+        """Streams the current cycle's trades to CSV / JSONL / columnar on a worker thread."""
+        path = filedialog.asksaveasfilename(
+            title="EXPORT DATA LOG", defaultextension='.csv',
+            filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("Columnar", "*.tmcx")]
+        )
+        if not path:
+            return
+        try:
+            trade_export.format_for(path)
+        except ValueError as e:
+            self.notify(f"EXPORT ERROR: {e}", 'error') # Cyberpunk message
+            return
+        history = self.trades_history
+        trades = trade_export.live_trades(history, len(history)) # Bound here, on the Tk thread, to the rows present now
+        outcome = {}
+        
+        def work():
+            try:
+                outcome['written'] = trade_export.export(trades, path)
+            except Exception as e:
+                outcome['error'] = e
+        
+        worker = threading.Thread(target=work, name='export', daemon=True)
+        worker.start()
+        self.notify("📤 EXPORT STREAM RUNNING...") # Cyberpunk message
+        self.poll_export(worker, outcome, path)
+    
+    def poll_export(self, worker, outcome, path):
+        if worker.is_alive():
+            self.root.after(100, self.poll_export, worker, outcome, path)
+        elif 'error' in outcome:
+            self.notify(f"EXPORT ERROR: {outcome['error']}", 'error') # Cyberpunk message
+        else:
+            self.notify(f"📤 {outcome['written']:,} TRADES EXPORTED TO {path}", 'success') # Cyberpunk message
+    
     def reset_to_original_capital(self, dialog):
-        self.current_balance = self.initial_capital
-        self.daily_start_balance = self.initial_capital
-        self.current_trade_value = self.starting_trade_value
-        self.trades_history = []
-        self.wins_count = 0
-        self.losses_count = 0
-        self.session_date = datetime.now().strftime("%Y-%m-%d")
+        self.engine.reset()
+        self.record_lifecycle(clear_history=True)
         self.enable_trading()
         self.update_display()
         dialog.destroy()
-        messagebox.showinfo("REINITIALIZATION COMPLETE", f"🔄 ASSET REINITIALIZATION COMPLETE!\n\nNEW BALANCE: ${self.current_balance:.2f}") # Cyberpunk message
+        self.notify(f"🔄 ASSET REINITIALIZATION COMPLETE! NEW BALANCE: ${self.current_balance:.2f}", 'success') # Cyberpunk message
     
     def continue_with_current_balance(self, dialog):
-        self.daily_start_balance = self.current_balance
-        self.current_trade_value = self.starting_trade_value
-        self.trades_history = []
-        self.wins_count = 0
-        self.losses_count = 0
-        self.session_date = datetime.now().strftime("%Y-%m-%d")
+        self.engine.new_day()
+        self.record_lifecycle(clear_history=True)
         self.enable_trading()
         self.update_display()
         dialog.destroy()
-        messagebox.showinfo("SESSION CONTINUED", f"➡️ NEW CYCLE INITIATED WITH CURRENT ASSETS!\n\nSTARTING BALANCE: ${self.current_balance:.2f}") # Cyberpunk message
+        self.notify(f"➡️ NEW CYCLE INITIATED WITH CURRENT ASSETS! STARTING BALANCE: ${self.current_balance:.2f}", 'success') # Cyberpunk message
     
     def disable_trading(self):
         self.win_button.config(state='disabled', bg='#1A1A1A', activebackground='#1A1A1A', fg='#555555') # Darker disabled state, muted text
@@ -585,111 +1170,273 @@ class ProfessionalTradingManager:
         self.lose_button.config(state='normal', bg=self.loss_color, activebackground='#EE008C', fg='white')
     
     def new_day(self):
-        self.daily_start_balance = self.current_balance
-        self.current_trade_value = self.starting_trade_value
-        self.trades_history = []
-        self.wins_count = 0
-        self.losses_count = 0
-        self.session_date = datetime.now().strftime("%Y-%m-%d")
+        self.engine.new_day()
+        self.record_lifecycle(clear_history=True)
         self.enable_trading()
         self.update_display()
-        messagebox.showinfo("NEW CYCLE INITIATED", f"🌅 NEW TRADING CYCLE INITIATED!\n\nSTARTING BALANCE: ${self.daily_start_balance:.2f}") # Cyberpunk message
+        self.notify(f"🌅 NEW TRADING CYCLE INITIATED! STARTING BALANCE: ${self.daily_start_balance:.2f}", 'success') # Cyberpunk message
     
     def reset_session(self):
         if messagebox.askyesno("RESET SYSTEM", "CONFIRM SYSTEM RESET? ALL DATA WILL BE WIPED."): # Cyberpunk message
-            self.current_balance = self.initial_capital
-            self.daily_start_balance = self.initial_capital
-            self.current_trade_value = self.starting_trade_value
-            self.trades_history = []
-            self.wins_count = 0
-            self.losses_count = 0
-            self.session_date = datetime.now().strftime("%Y-%m-%d")
+            self.engine.reset()
+            self.record_lifecycle(clear_history=True)
             self.enable_trading()
             self.update_display()
     
-    def update_display(self):
-        self.balance_label.config(text=f"${self.current_balance:.2f}")
-        
+    # Widgets and Tk variables register_display() paints into (see headless())
+    DISPLAY_WIDGETS = ('balance_label', 'daily_target_label', 'stop_loss_label', 'progress_label', 'trade_value_label',
+                       'wins_label', 'losses_label', 'sizing_param_label', 'sizing_param_entry')
+    DISPLAY_VARS = ('capital_var', 'growth_var', 'stop_loss_var', 'multiplier_var', 'progress_var', 'sizing_var',
+                    'sizing_param_var')
+    
+    @classmethod
+    def headless(cls, root, account, widgets):
+        """A window on `account` whose display pipeline paints into stand-ins instead of Tk widgets.
+
+        `widgets` maps every DISPLAY_WIDGETS / DISPLAY_VARS name and 'history_view'
+        (see VirtualHistoryView.headless()) to its stand-in; `root` only needs
+        after_idle(). Nothing else of the window is built, so only update_display(),
+        display.flush() and the handlers they call may be used. This is how
+        benchmark.py times the repaint path on machines without a display.
+        """
+        window = cls.__new__(cls)
+        window.root = root
+        window.bot_server = None
+        window.account = account
+        for name in cls.DISPLAY_WIDGETS + cls.DISPLAY_VARS + ('history_view',):
+            setattr(window, name, widgets[name])
+        window.register_display()
+        return window
+    
+    def register_display(self):
+        """Registers every live widget with the dirty-tracked scheduler: (key, value to show, how to show it)."""
+        self.display = DisplayScheduler(self.root)
+        register = self.display.register
+        register('balance', lambda: f"${self.current_balance:.2f}", lambda text: self.balance_label.config(text=text))
+        register('target', lambda: f"${self.calculate_daily_target():.2f}", lambda text: self.daily_target_label.config(text=text))
+        register('stop', lambda: f"${self.calculate_stop_loss():.2f}", lambda text: self.stop_loss_label.config(text=text))
+        register('progress', self.compute_progress, self.apply_progress)
+        register('trade_value', lambda: f"TRADE VALUE: ${self.current_trade_value:.2f}", lambda text: self.trade_value_label.config(text=text))
+        register('wins', lambda: f"{self.wins_count}", lambda text: self.wins_label.config(text=text))
+        register('losses', lambda: f"{self.losses_count}", lambda text: self.losses_label.config(text=text))
+        # Settings entries are only rewritten when the engine's value changes, never under the user's typing
+        register('capital', lambda: f"{self.initial_capital:.2f}", self.capital_var.set)
+        register('growth', lambda: f"{self.daily_growth_target:.1f}", self.growth_var.set)
+        register('stop_limit', lambda: f"{self.stop_loss_limit:.1f}", self.stop_loss_var.set)
+        register('multiplier', lambda: f"{self.trade_multiplier:.1f}", self.multiplier_var.set)
+        register('sizing', lambda: self.engine.sizing, self.show_sizing)
+        if self.bot_server is not None: # Subscribers get one state push per coalesced repaint
+            register('bot_state', lambda: bot_api.engine_state(self.engine), self.bot_server.publish)
+        register('history', lambda: (id(self.trades_history), len(self.trades_history)), lambda _: self.update_history_display())
+    
+    def compute_progress(self):
         daily_target = self.calculate_daily_target()
-        stop_loss = self.calculate_stop_loss()
-        self.daily_target_label.config(text=f"${daily_target:.2f}")
-        self.stop_loss_label.config(text=f"${stop_loss:.2f}")
-        
         target_diff = daily_target - self.daily_start_balance
         progress = ((self.current_balance - self.daily_start_balance) / target_diff) * 100 if target_diff > 0 else 0
-        self.progress_var.set(max(0, min(100, progress)))
-        self.progress_label.config(text=f"PROGRESS: {progress:.1f}%")
-        
-        self.trade_value_label.config(text=f"TRADE VALUE: ${self.current_trade_value:.2f}")
-        self.wins_label.config(text=f"{self.wins_count}")
-        self.losses_label.config(text=f"{self.losses_count}")
-        
-        self.capital_var.set(f"{self.initial_capital:.2f}")
-        self.growth_var.set(f"{self.daily_growth_target:.1f}")
-        self.stop_loss_var.set(f"{self.stop_loss_limit:.1f}")
-        self.multiplier_var.set(f"{self.trade_multiplier:.1f}")
-        
-        self.update_history_display()
+        return max(0, min(100, progress)), f"PROGRESS: {progress:.1f}%"
+    
+    def apply_progress(self, value):
+        bar_value, text = value
+        self.progress_var.set(bar_value)
+        self.progress_label.config(text=text)
+    
+    def update_display(self):
+        """Queues one coalesced repaint; bursts of trades before Tk goes idle share it."""
+        self.display.mark()
     
     def update_history_display(self):
-        self.history_text.config(state='normal')
-        self.history_text.delete(1.0, tk.END)
-        header = f"{'TIME':<10} {'TYPE':<6} {'AMOUNT':<10} {'BALANCE':<10}\n" + "---" * 15 + "\n" # Shorter dashes
-        self.history_text.insert(tk.END, header, 'header')
-        
-        for trade in reversed(self.trades_history):
-            line = f"{trade['timestamp']:<10} {trade['type']:<6} ${trade['amount']:<8.2f} ${trade['balance']:<8.2f}\n"
-            tag = "win" if trade['type'] == 'WIN' else "loss"
-            self.history_text.insert(tk.END, line, tag)
-            
-        self.history_text.tag_config('header', font=('Consolas', 10, 'bold'), foreground=self.highlight_color) # Monospaced, neon header
-        self.history_text.tag_config('win', foreground=self.win_color) # Neon green win
-        self.history_text.tag_config('loss', foreground=self.loss_color) # Neon pink loss
-        self.history_text.config(state='disabled')
-        self.history_text.see(tk.END)
+        """Repaints the visible DATA LOG rows; the view rebuilds itself when the history list was replaced."""
+        self.history_view.refresh()
+    
+    def checkpoint_session(self):
+        """Folds the active account's trade journal into a fresh session snapshot, written in the background."""
+        self.account.checkpoint()
+    
+    def record_lifecycle(self, clear_history):
+        """Journals a new cycle / reset / settings change, archives a new cycle, then checkpoints."""
+        self.journal.append_state(self.engine.to_state_dict(), clear_history)
+        if clear_history:
+            self.history_store.begin_session(self.engine)
+            self.stats.reset(self.daily_start_balance)
+        self.checkpoint_session()
     
     def save_session(self):
-        session_data = {
-            'current_balance': self.current_balance, 'daily_start_balance': self.daily_start_balance,
-            'current_trade_value': self.current_trade_value, 'trades_history': self.trades_history,
-            'wins_count': self.wins_count, 'losses_count': self.losses_count, 'session_date': self.session_date,
-            'settings': {
-                'initial_capital': self.initial_capital, 'daily_growth_target': self.daily_growth_target,
-                'stop_loss_limit': self.stop_loss_limit, 'trade_multiplier': self.trade_multiplier
-            }
-        }
+        """SAVE MEMORY: queues a background snapshot; the header indicator reports the outcome."""
+        self.checkpoint_session()
+        self.poll_autosave(reschedule=False)
+    
+    def poll_autosave(self, reschedule=True):
+        """Reflects autosave status in the header and fires the periodic / coalesced follow-up saves."""
+        now = time.monotonic()
+        for account in self.accounts.values(): # Inactive accounts keep saving their journaled trades too
+            if account.loaded and account.journal.pending and now - account.last_autosave >= 60:
+                account.checkpoint()
+            account.autosaver.poll()
+            account.history_store.flush() # Trades since the last poll go to the archive in one transaction
+        saver = self.autosaver
+        if saver.status == autosave.SAVING:
+            text, color = "● SAVING MEMORY...", self.highlight_color
+        elif saver.status == autosave.SAVED:
+            stamp = time.strftime("%H:%M:%S", time.localtime(saver.last_saved_at))
+            text, color = f"● MEMORY SYNCED {stamp}", self.accent_color
+        elif saver.status == autosave.FAILED:
+            text, color = f"● SAVE FAILED: {saver.last_error}", self.loss_color
+        else:
+            text, color = "● MEMORY IDLE", self.text_color
+        if self.save_status_label.cget('text') != text:
+            self.save_status_label.config(text=text, fg=color)
+        if reschedule:
+            self.root.after(250, self.poll_autosave)
+    
+    def instrument_handlers(self):
+        """Times the hot handlers when metrics are enabled. Runs before the widgets capture the bound methods."""
+        instrument = self.metrics.instrument
+        instrument(self, 'execute_win')
+        instrument(self, 'execute_loss')
+        instrument(self, 'save_session')
+    
+    def toggle_metrics_overlay(self):
+        """F12: shows/hides the latency table in the top-right corner of the window."""
+        if self.metrics_overlay is not None:
+            self.metrics_overlay.destroy()
+            self.metrics_overlay = None
+            return
+        self.metrics_overlay = tk.Label(
+            self.root, text="", justify='left', anchor='nw', fg=self.accent_color, bg='#000000',
+            font=('Consolas', 9), padx=8, pady=6, relief=tk.FLAT, bd=1
+        )
+        self.metrics_overlay.place(relx=1.0, rely=0.0, x=-10, y=10, anchor='ne')
+        self.refresh_metrics_overlay()
+    
+    def refresh_metrics_overlay(self):
+        if self.metrics_overlay is None:
+            return
+        self.metrics_overlay.config(text=metrics.format_overlay(self.metrics))
+        self.metrics_overlay.lift()
+        self.root.after(500, self.refresh_metrics_overlay)
+    
+    # ===================================================================
+    # ACCOUNTS
+    # ===================================================================
+
+    def open_account(self, name):
+        """Returns the named account, creating its (widget-free) session state on first use."""
+        if name not in self.accounts:
+            account = accounts.Account(name, session_format=self.session_format)
+            self.metrics.instrument(account.journal, 'load', 'load_session') # Snapshot + journal replay on the loader thread
+            self.metrics.instrument(account.journal, 'write_snapshot') # Background autosave writes
+            self.accounts[name] = account
+        return self.accounts[name]
+    
+    def switch_account(self, name):
+        """Points the single widget tree at another account, loading it first if it was never opened."""
+        if name == self.account.name:
+            return
+        self.history_store.flush()
+        self.account = self.open_account(name)
+        self.account_var.set(name)
+        accounts.write_registry(self.account_names, name, self.session_format)
+        if self.session_ready:
+            self.set_session_controls('normal')
+        else:
+            self.set_session_controls('disabled')
+            if self.account.loader is None:
+                self.load_session()
+        self.update_display()
+        self.poll_autosave(reschedule=False)
+    
+    def add_account(self):
+        name = simpledialog.askstring("NEW ACCOUNT", "ACCOUNT DESIGNATION:", parent=self.root) # Cyberpunk message
+        if not name:
+            return
         try:
-            with open('trading_manager_session.json', 'w') as f:
-                json.dump(session_data, f, indent=4)
-            messagebox.showinfo("SUCCESS", "SESSION DATA LOGGED. ✅") # Cyberpunk message
-        except Exception as e:
-            messagebox.showerror("ERROR", f"DATA CORRUPTION: FAILED TO SAVE SESSION: {str(e)}") # Cyberpunk message
+            name = accounts.validate_name(name, self.account_names)
+        except ValueError as e:
+            self.notify(f"INPUT ERROR: {str(e)}", 'error') # Cyberpunk message
+            return
+        self.account_names.append(name)
+        self.account_box.config(values=self.account_names)
+        self.switch_account(name)
+    
+    def set_session_controls(self, state):
+        """Enables/disables every control that reads or changes the session (trade buttons included)."""
+        for button in self.session_buttons:
+            button.config(state=state)
+        if state == 'disabled':
+            self.disable_trading()
+        elif self.engine.locked:
+            self.disable_trading()
+        else:
+            self.enable_trading()
+    
+    def on_first_paint(self):
+        """First idle pass of mainloop: records time-to-first-paint, then starts loading the session."""
+        self.root.update_idletasks()
+        self.startup_times['first_paint'] = time.perf_counter() - self.started_at
+        self.show_startup_times()
+        self.load_session()
+    
+    def show_startup_times(self):
+        times = self.startup_times
+        text = f"● FIRST PAINT {times['first_paint'] * 1000:.0f}ms"
+        if 'session_loaded' in times:
+            text += f" · SESSION {times['session_loaded'] * 1000:.0f}ms ({len(self.trades_history)} TRADES)"
+        else:
+            text += " · LOADING SESSION..."
+        self.boot_label.config(text=text)
     
     def load_session(self):
-        try:
-            if os.path.exists('trading_manager_session.json'):
-                with open('trading_manager_session.json', 'r') as f:
-                    session_data = json.load(f)
-                
-                settings = session_data.get('settings', {})
-                self.initial_capital = settings.get('initial_capital', 50.0)
-                self.daily_growth_target = settings.get('daily_growth_target', 5.0)
-                self.stop_loss_limit = settings.get('stop_loss_limit', 5.0)
-                self.trade_multiplier = settings.get('trade_multiplier', 1.5)
-
-                self.current_balance = session_data.get('current_balance', self.initial_capital)
-                self.daily_start_balance = session_data.get('daily_start_balance', self.initial_capital)
-                self.current_trade_value = session_data.get('current_trade_value', self.starting_trade_value)
-                self.trades_history = session_data.get('trades_history', [])
-                self.wins_count = session_data.get('wins_count', 0)
-                self.losses_count = session_data.get('losses_count', 0)
-                self.session_date = session_data.get('session_date', datetime.now().strftime("%Y-%m-%d"))
-        except Exception as e:
-            messagebox.showerror("LOAD ERROR", f"DATA STREAM INTERRUPTED: COULD NOT LOAD SESSION FILE. INITIATING FRESH BOOT.\nERROR: {e}") # Cyberpunk message
+        """Restores the active account's snapshot and replays its journal on a worker thread; the window stays live."""
+        account = self.account
+        engine, outcome = account.start_load()
+        self.poll_load(account, engine, outcome)
+    
+    def poll_load(self, account, engine, outcome):
+        """Swaps the loaded engine in, rebuilds the analytics / archive link and unlocks the controls."""
+        if account.loader.is_alive():
+            self.root.after(20, self.poll_load, account, engine, outcome)
+            return
+        if 'error' in outcome:
+            self.notify(f"DATA STREAM INTERRUPTED: COULD NOT LOAD SESSION FILE. INITIATING FRESH BOOT.\nORIGINAL FILES KEPT AS *.corrupt\nERROR: {outcome['error']}", 'error', duration_ms=15000) # Cyberpunk message
+            engine = TradingEngine()
+        account.finish_load(engine)
+        if account is not self.account: # Switched away while it was loading
+            return
+        self.set_session_controls('normal')
+        self.update_display()
+        if 'session_loaded' not in self.startup_times:
+            self.startup_times['session_loaded'] = time.perf_counter() - self.started_at
+            self.show_startup_times()
+    
+    def on_close(self):
+        """Finishes every account's pending snapshot writes and flushes their journals before the window goes away."""
+        if self.bot_server is not None:
+            self.bot_server.stop()
+        for account in self.accounts.values():
+            account.close()
+        self.metrics.close()
+        self.root.destroy()
 
 def main():
+    started_at = time.perf_counter()
+    parser = argparse.ArgumentParser(description="R2HABH Trading Manager")
+    parser.add_argument('--metrics', action='store_true', help="Time the trade/display/save handlers (F12 shows them)")
+    parser.add_argument('--metrics-port', type=int, help="Also serve Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument('--session-format', choices=accounts.SESSION_FORMATS, help="Snapshot format (remembered)")
+    parser.add_argument('--bot-port', type=int, help="Accept bot trade results on http://127.0.0.1:PORT (see bot_api.py)")
+    args = parser.parse_args()
+    registry = metrics.MetricsRegistry(enabled=args.metrics or args.metrics_port is not None)
+    if args.metrics_port is not None:
+        registry.serve(args.metrics_port)
+    bot_server = None
+    if args.bot_port is not None:
+        bot_server = bot_api.BotServer(port=args.bot_port)
+        try:
+            bot_server.start()
+        except (OSError, TimeoutError) as e:
+            parser.error(f"--bot-port {args.bot_port}: {e}")
     root = tk.Tk()
-    app = ProfessionalTradingManager(root)
+    app = ProfessionalTradingManager(root, started_at, registry, args.session_format, bot_server)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,134 @@
+"""Several independent trading accounts in one process.
+
+An Account bundles everything one session owns - engine, snapshot + journal,
+running analytics, history-archive cursor and autosave worker - and nothing
+else: the window has a single widget tree that is pointed at whichever account
+is active, so an inactive account costs its data, not another GUI.
+
+The account list, the last active account and the session file format are
+kept in trading_manager_accounts.json. The default account keeps the original
+session and journal file names, so existing sessions open unchanged as MAIN.
+With the 'binary' format snapshots are binary_session .tmsb files; whichever
+format is older is converted from the other when an account is loaded, so the
+choice can be switched back and forth without losing trades.
+"""
+import json
+import os
+import re
+import threading
+import time
+
+import autosave
+import binary_session
+from history_store import HISTORY_DB, HistoryStore
+from session_stats import SessionStats
+from trade_journal import JOURNAL_FILE, SESSION_FILE, TradeJournal
+from trading_engine import TradingEngine
+
+ACCOUNTS_FILE = 'trading_manager_accounts.json'
+DEFAULT_ACCOUNT = 'MAIN'
+SESSION_FORMATS = ('json', 'binary')
+
+
+def account_slug(name):
+    """File-name-safe form of an account name."""
+    return re.sub(r'[^a-z0-9_-]+', '_', name.strip().lower()).strip('_')
+
+
+def account_paths(name, session_format='json'):
+    """(snapshot path, journal path) for an account."""
+    if name == DEFAULT_ACCOUNT:
+        snapshot_path, journal_path = SESSION_FILE, JOURNAL_FILE
+    else:
+        slug = account_slug(name)
+        snapshot_path, journal_path = f'trading_manager_session.{slug}.json', f'trading_manager_journal.{slug}.jsonl'
+    if session_format == 'binary':
+        snapshot_path = snapshot_path[:-len('.json')] + binary_session.BINARY_SUFFIX
+    return snapshot_path, journal_path
+
+
+def validate_name(name, existing):
+    """Normalized account name; raises ValueError when empty or clashing with an existing account's files."""
+    name = name.strip().upper()
+    if not account_slug(name):
+        raise ValueError("Account name needs at least one letter or digit")
+    if any(account_slug(other) == account_slug(name) for other in existing):
+        raise ValueError(f"Account {name} already exists")
+    return name
+
+
+def read_registry(path=ACCOUNTS_FILE):
+    """(account names, active name, session format). A missing file means just the default account, as JSON."""
+    if not os.path.exists(path):
+        return [DEFAULT_ACCOUNT], DEFAULT_ACCOUNT, 'json'
+    with open(path, 'r') as f:
+        data = json.load(f)
+    names = data.get('accounts') or [DEFAULT_ACCOUNT]
+    active = data.get('active')
+    session_format = data.get('session_format')
+    return names, active if active in names else names[0], session_format if session_format in SESSION_FORMATS else 'json'
+
+
+def write_registry(names, active, session_format='json', path=ACCOUNTS_FILE):
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump({'accounts': list(names), 'active': active, 'session_format': session_format}, f, indent=4)
+    os.replace(temp_path, path)
+
+
+class Account:
+    """One account's session state and persistence; no widgets."""
+
+    __slots__ = ('name', 'engine', 'journal', 'stats', 'history_store', 'autosaver', 'loaded', 'loader',
+                 'last_autosave')
+
+    def __init__(self, name, history_db=HISTORY_DB, session_format='json'):
+        snapshot_path, journal_path = account_paths(name, session_format)
+        self.name = name
+        self.engine = TradingEngine()
+        self.journal = TradeJournal(snapshot_path, journal_path) # Snapshot + per-trade write-ahead journal
+        self.stats = SessionStats() # Running analytics for the current cycle
+        self.history_store = HistoryStore(history_db, account=name) # Every cycle's trades, kept across new_day / resets
+        self.autosaver = autosave.Autosaver(self.journal, lambda: self.engine) # Snapshots written off the Tk thread
+        self.loaded = False # Set once the saved session has been loaded
+        self.loader = None
+        self.last_autosave = time.monotonic()
+
+    def start_load(self):
+        """Loads snapshot + journal into a fresh engine on a worker thread. Returns (engine, outcome dict).
+
+        When self.loader has finished, outcome holds 'error' if loading failed; pass the engine to finish_load().
+        """
+        engine = TradingEngine()
+        outcome = {}
+
+        def work():
+            try:
+                other_format = 'json' if binary_session.is_binary_path(self.journal.snapshot_path) else 'binary'
+                binary_session.sync_formats(self.journal.snapshot_path, account_paths(self.name, other_format)[0])
+                self.journal.load(engine)
+            except Exception as e:
+                outcome['error'] = e
+
+        self.loader = threading.Thread(target=work, name=f'load-{account_slug(self.name)}', daemon=True)
+        self.loader.start()
+        return engine, outcome
+
+    def finish_load(self, engine):
+        """Main thread: adopts the loaded engine and rebuilds the analytics / archive link from it."""
+        self.engine = engine
+        self.stats.rebuild(engine.trades_history, engine.daily_start_balance)
+        self.history_store.resume_session(engine)
+        self.loaded = True
+
+    def checkpoint(self):
+        """Folds the journal into a fresh snapshot, written in the background."""
+        self.autosaver.request()
+        self.last_autosave = time.monotonic()
+
+    def close(self):
+        if self.loader is not None:
+            self.loader.join()
+        self.autosaver.close()
+        self.journal.close()
+        self.history_store.close()
@@ -0,0 +1,104 @@
+"""Non-blocking background autosave.
+
+The main thread captures a cheap snapshot (the engine's scalars plus a buffer
+copy of the columnar history) and rotates the journal; a worker thread serializes
+it (JSON or binary) and writes it with temp file + os.replace via TradeJournal. While a
+write is in flight further requests are coalesced into a single follow-up save
+of the newest state, so trades arriving faster than the disk never queue up
+more than one extra snapshot.
+
+Status is exposed as plain attributes for the GUI to poll; nothing here opens a
+dialog or touches Tk.
+"""
+import threading
+import time
+
+IDLE = 'IDLE'
+SAVING = 'SAVING'
+SAVED = 'SAVED'
+FAILED = 'FAILED'
+
+
+class Autosaver:
+    """Single worker thread writing coalesced session snapshots."""
+
+    def __init__(self, journal, engine_source):
+        """`engine_source` returns the TradingEngine to snapshot (read on the main thread only)."""
+        self.journal = journal
+        self.engine_source = engine_source
+        self.status = IDLE
+        self.last_error = None
+        self.last_saved_at = None
+        self.saves = 0
+        self._job = None # (state, history copy, generation) waiting for the worker
+        self._busy = False
+        self._rerun = False
+        self._closing = False
+        self._wakeup = threading.Condition()
+        self._worker = threading.Thread(target=self._run, name='autosave', daemon=True)
+        self._worker.start()
+
+    @property
+    def busy(self):
+        return self._busy or self._job is not None
+
+    def request(self):
+        """Main thread: snapshot now, or once the in-flight save finishes if one is running."""
+        with self._wakeup:
+            if self.busy:
+                self._rerun = True
+                return
+            engine = self.engine_source()
+            history = engine.trades_history.copy()
+            state = engine.to_state_dict()
+            generation = self.journal.rotate(len(history))
+            self._job = (state, history, generation)
+            self.status = SAVING
+            self._wakeup.notify()
+
+    def poll(self):
+        """Main thread, called periodically: starts the coalesced follow-up save when the worker is free."""
+        if self._rerun and not self.busy:
+            self._rerun = False
+            self.request()
+
+    def _run(self):
+        while True:
+            with self._wakeup:
+                while self._job is None and not self._closing:
+                    self._wakeup.wait()
+                if self._job is None:
+                    return
+                state, history, generation = self._job
+                self._job = None
+                self._busy = True
+            try:
+                session_data = dict(state, trades_history=history) # Serialized by the journal in its snapshot format
+                self.journal.write_snapshot(session_data, generation)
+                self.last_saved_at = time.time()
+                self.last_error = None
+                self.saves += 1
+                self.status = SAVED
+            except Exception as e:
+                self.last_error = e
+                self.status = FAILED
+            finally:
+                self._busy = False
+
+    def wait(self, timeout=None):
+        """Blocks until no save is queued or running (or `timeout` seconds pass). Returns True when idle."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.busy or self._rerun:
+            self.poll()
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout=10.0):
+        """Finishes pending saves and stops the worker."""
+        self.wait(timeout)
+        with self._wakeup:
+            self._closing = True
+            self._wakeup.notify()
+        self._worker.join(timeout)
@@ -0,0 +1,278 @@
+"""Backtest the session rules against a price-series file.
+
+A generator pipeline streams an OHLC CSV one bar at a time:
+
+    read_bars(path) -> entry/exit rule -> run_backtest(engine) -> per-day summaries
+
+The rule turns bars into (epoch, day, is_win) trade results. run_backtest()
+feeds them to TradingEngine.win()/loss(), so the sizing, the daily target and
+the stop loss locks are exactly the live ones, and calls new_day() whenever the
+trade date changes. Only the current bar, the rule's rolling window and the
+current day's trades are ever held, so multi-million-bar files run in constant
+memory; the equity curve and the day summaries are written out as they are
+produced.
+
+    python backtest.py prices.csv --rule breakout --param lookback=50 --equity equity.csv --days days.csv
+
+The CSV needs open, high, low and close columns plus a date, datetime,
+timestamp or time column (or date and time columns together); column names are
+case-insensitive.
+"""
+import argparse
+import csv
+import time
+from collections import deque, namedtuple
+from datetime import datetime
+
+from trade_history import TradeHistory
+from trading_engine import (
+    TradingEngine, TRADE_APPLIED, TRADE_RECORDED,
+    DEFAULT_INITIAL_CAPITAL, DEFAULT_DAILY_GROWTH_TARGET, DEFAULT_STOP_LOSS_LIMIT, DEFAULT_TRADE_MULTIPLIER
+)
+
+Bar = namedtuple('Bar', 'epoch day open high low close')
+
+TIME_COLUMNS = ('datetime', 'timestamp', 'date', 'time')
+WRITE_BUFFER = 1 << 20
+DAY_FIELDS = ('date', 'start_balance', 'end_balance', 'pnl', 'trades', 'wins', 'losses', 'skipped',
+              'low_balance', 'high_balance', 'outcome')
+
+
+# ===================================================================
+# BARS
+# ===================================================================
+
+def _bar_time(value):
+    """(epoch, 'YYYY-MM-DD') for an ISO date/datetime or an epoch-seconds string."""
+    if '-' in value:
+        return int(datetime.fromisoformat(value).timestamp()), value[:10]
+    epoch = int(float(value))
+    return epoch, time.strftime('%Y-%m-%d', time.localtime(epoch))
+
+
+def read_bars(path):
+    """Yields a Bar per CSV row, in file order."""
+    with open(path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        header = [name.strip().lower() for name in next(reader)]
+        try:
+            o, h, l, c = (header.index(name) for name in ('open', 'high', 'low', 'close'))
+        except ValueError:
+            raise ValueError(f"{path}: needs open, high, low and close columns") from None
+        if 'date' in header and 'time' in header:
+            date_col, time_col = header.index('date'), header.index('time')
+        else:
+            time_col = None
+            date_col = next((header.index(name) for name in TIME_COLUMNS if name in header), None)
+            if date_col is None:
+                raise ValueError(f"{path}: needs a date, datetime, timestamp or time column")
+        for row in reader:
+            if not row:
+                continue
+            stamp = row[date_col] if time_col is None else f"{row[date_col]} {row[time_col]}"
+            epoch, day = _bar_time(stamp.strip())
+            yield Bar(epoch, day, float(row[o]), float(row[h]), float(row[l]), float(row[c]))
+
+
+# ===================================================================
+# ENTRY / EXIT RULES: bars in, (epoch, day, is_win) trade results out
+# ===================================================================
+
+def candle_rule(bars):
+    """Every bar is a long trade from open to close; dojis are skipped."""
+    for bar in bars:
+        if bar.close != bar.open:
+            yield bar.epoch, bar.day, bar.close > bar.open
+
+
+def momentum_rule(bars, lookback=20, hold=1):
+    """Long at the close when it is above its `lookback`-bar average; exit `hold` bars later at the close."""
+    lookback, hold = int(lookback), int(hold)
+    window = deque(maxlen=lookback)
+    total = 0.0
+    entry = None
+    held = 0
+    for bar in bars:
+        if entry is not None:
+            held += 1
+            if held >= hold:
+                yield bar.epoch, bar.day, bar.close > entry
+                entry = None
+        if len(window) == lookback:
+            total -= window[0]
+        window.append(bar.close)
+        total += bar.close
+        if entry is None and len(window) == lookback and bar.close > total / lookback:
+            entry, held = bar.close, 0
+
+
+def breakout_rule(bars, lookback=20, take=1.0, stop=1.0):
+    """Long at the close above the highest high of the previous `lookback` bars.
+
+    The trade wins at +`take`% and loses at -`stop`%; a bar touching both counts as a loss.
+    """
+    lookback = int(lookback)
+    highs = deque() # (bar index, high), decreasing: highs[0] is the rolling maximum
+    entry = None
+    for index, bar in enumerate(bars):
+        if entry is not None:
+            if bar.low <= entry * (1 - stop / 100):
+                yield bar.epoch, bar.day, False
+                entry = None
+            elif bar.high >= entry * (1 + take / 100):
+                yield bar.epoch, bar.day, True
+                entry = None
+        elif index >= lookback and bar.close > highs[0][1]:
+            entry = bar.close
+        while highs and highs[-1][1] <= bar.high:
+            highs.pop()
+        highs.append((index, bar.high))
+        if highs[0][0] <= index - lookback:
+            highs.popleft()
+
+
+RULES = {'candle': candle_rule, 'momentum': momentum_rule, 'breakout': breakout_rule}
+
+
+# ===================================================================
+# SESSION REPLAY
+# ===================================================================
+
+def run_backtest(engine, trades, on_trade=None):
+    """Applies (epoch, day, is_win) results to `engine`; yields a DAY_FIELDS dict as each day closes.
+
+    A new date starts a new cycle (engine.new_day()). Results arriving after the
+    day locked, or that the balance cannot cover, count as skipped.
+    on_trade(epoch, balance) is called for every applied trade.
+    """
+    win, loss = engine.win, engine.loss
+    day = None
+    for epoch, trade_day, is_win in trades:
+        if trade_day != day:
+            if day is not None:
+                yield _day_summary(engine, day, skipped, low, high, outcome)
+                engine.new_day()
+            engine.session_date = day = trade_day
+            skipped = 0
+            low = high = engine.current_balance
+            outcome = 'OPEN'
+        if engine.locked:
+            skipped += 1
+            continue
+        event = win(epoch) if is_win else loss(epoch)
+        if event in TRADE_APPLIED:
+            balance = engine.current_balance
+            if balance < low:
+                low = balance
+            elif balance > high:
+                high = balance
+            if on_trade is not None:
+                on_trade(epoch, balance)
+        else:
+            skipped += 1
+        if event != TRADE_RECORDED:
+            outcome = event
+        if len(engine.trades_history) > 4096:
+            engine.trades_history = TradeHistory() # Only the counters matter here; keeps a long day's memory bounded
+    if day is not None:
+        yield _day_summary(engine, day, skipped, low, high, outcome)
+
+
+def _day_summary(engine, day, skipped, low, high, outcome):
+    start = engine.daily_start_balance
+    return {
+        'date': day, 'start_balance': start, 'end_balance': engine.current_balance,
+        'pnl': engine.current_balance - start, 'trades': engine.wins_count + engine.losses_count,
+        'wins': engine.wins_count, 'losses': engine.losses_count, 'skipped': skipped,
+        'low_balance': low, 'high_balance': high, 'outcome': outcome
+    }
+
+
+def backtest_file(path, rule='candle', engine=None, equity_path=None, days_path=None, **params):
+    """Runs `rule` over the bars in `path`, streaming the equity curve / day summaries to CSV when paths are given.
+
+    Returns totals: days, trades, wins, losses, target_days, stop_days, start/end balance,
+    max_drawdown (peak-to-trough over the whole run) and elapsed seconds.
+    """
+    engine = engine or TradingEngine()
+    started = time.perf_counter()
+    start_balance = engine.current_balance
+    totals = {'days': 0, 'trades': 0, 'wins': 0, 'losses': 0, 'target_days': 0, 'stop_days': 0}
+    drawdown = {'peak': start_balance, 'max': 0.0}
+
+    equity_file = open(equity_path, 'w', newline='', buffering=WRITE_BUFFER) if equity_path else None
+    days_file = open(days_path, 'w', newline='', buffering=WRITE_BUFFER) if days_path else None
+    try:
+        equity_row = csv.writer(equity_file).writerow if equity_file else None
+        days_writer = csv.DictWriter(days_file, DAY_FIELDS) if days_file else None
+        if equity_row:
+            equity_row(('timestamp', 'balance'))
+        if days_writer:
+            days_writer.writeheader()
+
+        def on_trade(epoch, balance):
+            if balance > drawdown['peak']:
+                drawdown['peak'] = balance
+            elif drawdown['peak'] - balance > drawdown['max']:
+                drawdown['max'] = drawdown['peak'] - balance
+            if equity_row:
+                equity_row((epoch, round(balance, 2)))
+
+        for summary in run_backtest(engine, RULES[rule](read_bars(path), **params), on_trade):
+            totals['days'] += 1
+            totals['trades'] += summary['trades']
+            totals['wins'] += summary['wins']
+            totals['losses'] += summary['losses']
+            totals['target_days'] += summary['outcome'] == 'TARGET_HIT'
+            totals['stop_days'] += summary['outcome'] in ('STOP_HIT', 'STOP_BREACHED')
+            if days_writer:
+                days_writer.writerow(summary)
+    finally:
+        for f in (equity_file, days_file):
+            if f:
+                f.close()
+    totals.update(start_balance=start_balance, end_balance=engine.current_balance,
+                  max_drawdown=drawdown['max'], elapsed=time.perf_counter() - started)
+    return totals
+
+
+def format_totals(totals):
+    """Plain-text summary for the command line."""
+    trades = totals['trades']
+    return (
+        f"DAYS: {totals['days']}  TARGET: {totals['target_days']}  STOP: {totals['stop_days']}\n"
+        f"TRADES: {trades}  WINS: {totals['wins']}  LOSSES: {totals['losses']}  "
+        f"WIN RATE: {totals['wins'] / trades if trades else 0:.1%}\n"
+        f"BALANCE: ${totals['start_balance']:.2f} -> ${totals['end_balance']:.2f}  "
+        f"MAX DRAWDOWN: ${totals['max_drawdown']:.2f}\n"
+        f"ELAPSED: {totals['elapsed']:.2f}s"
+    )
+
+
+def _parse_param(text):
+    name, _, value = text.partition('=')
+    if not value:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got {text!r}")
+    return name.strip(), float(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the trading manager rules on an OHLC CSV.")
+    parser.add_argument('path')
+    parser.add_argument('--rule', choices=sorted(RULES), default='candle')
+    parser.add_argument('--param', type=_parse_param, action='append', default=[], metavar='NAME=VALUE',
+                        help="Rule parameter, e.g. lookback=50 (repeatable)")
+    parser.add_argument('--capital', type=float, default=DEFAULT_INITIAL_CAPITAL)
+    parser.add_argument('--growth', type=float, default=DEFAULT_DAILY_GROWTH_TARGET, help="Daily growth target (%%)")
+    parser.add_argument('--stop', type=float, default=DEFAULT_STOP_LOSS_LIMIT, help="Stop loss limit (%%)")
+    parser.add_argument('--multiplier', type=float, default=DEFAULT_TRADE_MULTIPLIER)
+    parser.add_argument('--equity', help="Write the equity curve (timestamp,balance) to this CSV")
+    parser.add_argument('--days', help="Write per-day summaries to this CSV")
+    args = parser.parse_args()
+    engine = TradingEngine(args.capital, args.growth, args.stop, args.multiplier)
+    totals = backtest_file(args.path, args.rule, engine, args.equity, args.days, **dict(args.param))
+    print(format_totals(totals))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""Reproducible benchmarks for the engine, persistence and rendering hot paths.
+
+Runs without a display: the engine is driven headlessly and the history view /
+display scheduler are exercised against stub widgets. Results are written as
+JSON and compared with a stored baseline; anything slower than the baseline by
+more than the tolerance is flagged and the exit status is 1.
+
+    python benchmark.py                      # full run, compare with benchmarks_baseline.json
+    python benchmark.py --quick              # smaller history sizes
+    python benchmark.py --update-baseline    # store this run as the new baseline
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import types
+
+from session_stats import SessionStats
+from trade_journal import TradeJournal
+from trading_engine import TradingEngine
+
+RESULTS_FILE = 'benchmark_results.json'
+BASELINE_FILE = 'benchmarks_baseline.json'
+FULL_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+QUICK_SIZES = (1_000, 10_000, 100_000)
+
+
+def _unbounded_engine():
+    """Engine whose target/stop are out of reach, so benchmarks never lock."""
+    return TradingEngine(initial_capital=1e12, daily_growth_target=1e9, stop_loss_limit=99.0)
+
+
+def _outcomes(count, seed=7):
+    rng = random.Random(seed)
+    return [rng.random() < 0.5 for _ in range(count)]
+
+
+def _best_of(repeat, func):
+    """Smallest wall time of `repeat` runs of func()."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+# ===================================================================
+# STUB WIDGETS
+# ===================================================================
+
+class _StubWidget:
+    def config(self, **options):
+        pass
+
+    itemconfig = coords = delete = lambda self, *args, **options: None
+    set = lambda self, *args: None
+
+    def create_text(self, *args, **options):
+        return 0
+
+    create_rectangle = create_text
+
+    def winfo_height(self):
+        return 600
+
+    def winfo_width(self):
+        return 500
+
+
+class _StubVar:
+    def __init__(self, value=''):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class _StubRoot:
+    def after_idle(self, func):
+        pass
+
+
+def _stub_window(engine):
+    """ProfessionalTradingManager.headless() on stub widgets, enough for update_display()/flush()."""
+    from history_view import VirtualHistoryView
+    from Tradingmanager import ProfessionalTradingManager
+    widgets = {name: _StubWidget() for name in ProfessionalTradingManager.DISPLAY_WIDGETS}
+    widgets.update((name, _StubVar()) for name in ProfessionalTradingManager.DISPLAY_VARS)
+    widgets['history_view'] = VirtualHistoryView.headless(
+        lambda: engine.trades_history, {'win': '#0f0', 'loss': '#f0f', 'select': '#333'},
+        _StubWidget(), _StubWidget(), _StubVar('ALL'), _StubVar()
+    )
+    account = types.SimpleNamespace(engine=engine, stats=SessionStats(engine.daily_start_balance))
+    return ProfessionalTradingManager.headless(_StubRoot(), account, widgets)
+
+
+# ===================================================================
+# BENCHMARKS
+# ===================================================================
+
+def bench_engine(results):
+    outcomes = _outcomes(1_000_000)
+
+    def per_call():
+        engine = _unbounded_engine()
+        win, loss = engine.win, engine.loss
+        for outcome in outcomes[:300_000]:
+            win() if outcome else loss()
+    results['engine.call_trades_per_sec'] = (300_000 / _best_of(3, per_call), 'trades/s', True)
+
+    def replay():
+        _unbounded_engine().replay(outcomes)
+    results['engine.replay_trades_per_sec'] = (len(outcomes) / _best_of(3, replay), 'trades/s', True)
+
+
+def bench_persistence(results, sizes, workdir):
+    for size in sizes:
+        engine = _unbounded_engine()
+        engine.replay(_outcomes(size))
+        snapshot = os.path.join(workdir, f'session_{size}.json')
+        journal_path = os.path.join(workdir, f'journal_{size}.jsonl')
+        journal = TradeJournal(snapshot, journal_path, fsync_every=0)
+        repeat = 3 if size <= 100_000 else 1
+        results[f'save.{size}'] = (_best_of(repeat, lambda: journal.compact(engine.to_session_dict())), 's', False)
+        journal.close()
+
+        def load():
+            TradeJournal(snapshot, journal_path).load(TradingEngine())
+        results[f'load.{size}'] = (_best_of(repeat, load), 's', False)
+
+        binary_snapshot = os.path.join(workdir, f'session_{size}.tmsb')
+        binary_journal = TradeJournal(binary_snapshot, os.path.join(workdir, f'journal_{size}.bin.jsonl'), fsync_every=0)
+        results[f'save_binary.{size}'] = (_best_of(repeat, lambda: binary_journal.compact(dict(engine.to_state_dict(), trades_history=engine.trades_history))), 's', False)
+        binary_journal.close()
+        results[f'load_binary.{size}'] = (_best_of(repeat, lambda: TradeJournal(binary_snapshot, binary_journal.journal_path).load(TradingEngine())), 's', False)
+
+    engine = _unbounded_engine()
+    journal = TradeJournal(os.path.join(workdir, 'append.json'), os.path.join(workdir, 'append.jsonl'), fsync_every=0)
+    journal.load(engine)
+    count = 20_000
+
+    def append():
+        for outcome in _outcomes(count):
+            engine.win() if outcome else engine.loss()
+            journal.append(engine.trades_history.record(-1), engine.current_trade_value)
+    results['journal.append_per_trade'] = (_best_of(1, append) / count, 's', False)
+    journal.close()
+
+
+def bench_rendering(results, sizes):
+    for size in sizes:
+        engine = _unbounded_engine()
+        engine.replay(_outcomes(size))
+        window = _stub_window(engine)
+        window.display.flush()
+        count = 2_000
+
+        def trade_and_repaint():
+            for outcome in _outcomes(count, seed=size):
+                engine.win() if outcome else engine.loss()
+                window.stats.add_last(engine.trades_history)
+                window.update_display()
+                window.display.flush()
+        results[f'render.per_trade.{size}'] = (_best_of(3, trade_and_repaint) / count, 's', False)
+
+
+def run(quick=False):
+    sizes = QUICK_SIZES if quick else FULL_SIZES
+    results = {}
+    workdir = tempfile.mkdtemp(prefix='tm_bench_')
+    try:
+        bench_engine(results)
+        bench_persistence(results, sizes, workdir)
+        bench_rendering(results, sizes)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        'python': sys.version.split()[0], 'platform': platform.platform(), 'quick': quick,
+        'timestamp': int(time.time()),
+        'results': {name: {'value': value, 'unit': unit, 'higher_is_better': higher} for name, (value, unit, higher) in results.items()}
+    }
+
+
+def compare(report, baseline, tolerance):
+    """Returns [(name, baseline_value, value, change)] for results worse than baseline by more than `tolerance`."""
+    regressions = []
+    for name, current in report['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous or not previous['value']:
+            continue
+        ratio = current['value'] / previous['value']
+        change = (1 - ratio) if current['higher_is_better'] else (ratio - 1)
+        if change > tolerance:
+            regressions.append((name, previous['value'], current['value'], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the trading manager hot paths.")
+    parser.add_argument('--quick', action='store_true', help="Skip the 1M-trade history size")
+    parser.add_argument('--out', default=RESULTS_FILE)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.20, help="Allowed slowdown before flagging (0.20 = 20%%)")
+    args = parser.parse_args()
+
+    report = run(args.quick)
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    for name, result in report['results'].items():
+        print(f"{name:<32} {result['value']:>14.6g} {result['unit']}")
+
+    if args.update_baseline:
+        shutil.copyfile(args.out, args.baseline)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(report, json.load(f), args.tolerance)
+    for name, before, after, change in regressions:
+        print(f"REGRESSION {name}: {before:.6g} -> {after:.6g} ({change:+.0%} worse)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""Compact binary session file with a memory-mapped trade table.
+
+Layout (little-endian):
+
+    magic       4s   b'TMSB'
+    version     H    1
+    reserved    H
+    header_len  I    bytes of the JSON header that follows
+    count       Q    number of trades
+    header      JSON to_state_dict() payload (+ journal_generation), space-padded to 8 bytes
+    timestamps  q[count]  epoch seconds
+    amounts     d[count]
+    balances    d[count]
+    types       B[count]  1 = WIN, 0 = LOSE
+
+Each column is one fixed-width block, so opening a file only parses the small
+header: the mmap pages a column in when it is read, the last N trades are read
+without touching the rest, and loading into a TradeHistory is four buffer
+copies. A million-trade file opens in well under a millisecond and loads in
+tens of them.
+
+    python binary_session.py to-binary trading_manager_session.json trading_manager_session.tmsb
+    python binary_session.py to-json trading_manager_session.tmsb trading_manager_session.json
+    python binary_session.py info trading_manager_session.tmsb --tail 10
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+from array import array
+
+from trade_history import TYPE_NAMES, TradeHistory
+
+MAGIC = b'TMSB'
+VERSION = 1
+PREFIX = struct.Struct('<4sHHIQ')
+BINARY_SUFFIX = '.tmsb'
+# (TradeHistory column, array typecode) in file order: 8-byte columns first keeps every block aligned
+FILE_COLUMNS = (('timestamps', 'q'), ('amounts', 'd'), ('balances', 'd'), ('types', 'B'))
+
+
+def is_binary_path(path):
+    return path.endswith(BINARY_SUFFIX)
+
+
+def write_session(path, state, history, generation=None):
+    """Atomically writes `state` (to_state_dict() layout) and a TradeHistory (temp file + fsync + os.replace)."""
+    header = dict(state)
+    header.pop('trades_history', None)
+    if generation is not None:
+        header['journal_generation'] = generation
+    header_bytes = json.dumps(header, separators=(',', ':')).encode()
+    header_bytes += b' ' * (-(PREFIX.size + len(header_bytes)) % 8)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(PREFIX.pack(MAGIC, VERSION, 0, len(header_bytes), len(history)))
+        f.write(header_bytes)
+        for name, _ in FILE_COLUMNS:
+            getattr(history, name).tofile(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+class BinarySession:
+    """Read-only, memory-mapped view of a binary session file."""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size < PREFIX.size:
+            self._file.close()
+            raise ValueError(f"{path}: truncated binary session")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, header_len, self.count = PREFIX.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path}: not a version {VERSION} binary session")
+        self.header = json.loads(self._map[PREFIX.size:PREFIX.size + header_len])
+        self._offsets = {}
+        offset = PREFIX.size + header_len
+        for name, typecode in FILE_COLUMNS:
+            self._offsets[name] = (offset, typecode)
+            offset += self.count * array(typecode).itemsize
+        if offset > size:
+            self.close()
+            raise ValueError(f"{path}: trade table shorter than its header says")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def column(self, name, start=0, stop=None):
+        """Zero-copy typed memoryview of column rows [start:stop]; pages are read only when touched.
+
+        Release views before close(): an mmap cannot be closed while they are alive.
+        """
+        offset, typecode = self._offsets[name]
+        itemsize = array(typecode).itemsize
+        stop = self.count if stop is None else min(stop, self.count)
+        view = memoryview(self._map)[offset + start * itemsize:offset + stop * itemsize]
+        return view.cast(typecode)
+
+    def record(self, index):
+        """One trade as a session-file row (epoch timestamp)."""
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        values = {name: self.column(name, index, index + 1)[0] for name, _ in FILE_COLUMNS}
+        return {
+            'type': TYPE_NAMES[values['types']], 'amount': values['amounts'],
+            'balance': values['balances'], 'timestamp': values['timestamps']
+        }
+
+    def tail(self, count):
+        """The last `count` trades, oldest first, reading only their pages."""
+        return [self.record(i) for i in range(max(0, self.count - count), self.count)]
+
+    def to_history(self):
+        """Copies the columns into a TradeHistory (one buffer copy per column)."""
+        history = TradeHistory()
+        for name, _ in FILE_COLUMNS:
+            getattr(history, name).frombytes(self.column(name).cast('B'))
+        return history
+
+    def to_session_dict(self):
+        """The trading_manager_session.json payload (materializes every trade)."""
+        return dict(self.header, trades_history=self.to_history().to_records())
+
+    def close(self):
+        if getattr(self, '_map', None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+def load_into(engine, path):
+    """Restores `engine` from a binary session. Returns the header (for journal_generation)."""
+    with BinarySession(path) as session:
+        engine.load_state_dict(session.header)
+        engine.trades_history = session.to_history()
+        return session.header
+
+
+def json_to_binary(json_path, binary_path):
+    with open(json_path, 'r') as f:
+        session_data = json.load(f)
+    history = TradeHistory.from_records(session_data.get('trades_history', []), session_data.get('session_date'))
+    write_session(binary_path, session_data, history)
+
+
+def binary_to_json(binary_path, json_path):
+    with BinarySession(binary_path) as session:
+        session_data = session.to_session_dict()
+    temp_path = json_path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(session_data, f, separators=(',', ':'))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, json_path)
+
+
+def sync_formats(path, other_path):
+    """Makes `path` current when `other_path` (same session, the other format) is missing it or is newer."""
+    if not os.path.exists(other_path):
+        return
+    if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(other_path):
+        return
+    if is_binary_path(path):
+        json_to_binary(other_path, path)
+    else:
+        binary_to_json(other_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert and inspect binary trading sessions.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    for name in ('to-binary', 'to-json'):
+        command = commands.add_parser(name)
+        command.add_argument('source')
+        command.add_argument('target')
+    info = commands.add_parser('info')
+    info.add_argument('path')
+    info.add_argument('--tail', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.command == 'to-binary':
+        json_to_binary(args.source, args.target)
+    elif args.command == 'to-json':
+        binary_to_json(args.source, args.target)
+    else:
+        with BinarySession(args.path) as session:
+            header = session.header
+            print(f"TRADES {session.count}  BALANCE ${header.get('current_balance', 0):.2f}  "
+                  f"DATE {header.get('session_date')}  GENERATION {header.get('journal_generation', 0)}")
+            for trade in session.tail(args.tail):
+                print(f"  {trade['timestamp']:>12} {trade['type']:<5} ${trade['amount']:<10.2f} ${trade['balance']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
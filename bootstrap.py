@@ -0,0 +1,232 @@
+"""Block-bootstrap confidence bands from the recorded trade log.
+
+A single trades_history is one path; this resamples its WIN/LOSE sequence
+into many synthetic sessions and replays each one through the current sizing
+policy and daily target / stop loss locks (sizing.simulate_paths). Outcomes
+are drawn in blocks of consecutive trades from a circular copy of the log, so
+winning and losing streaks - and whatever dependence there is between trades -
+survive the resampling; a block length of 1 is the plain i.i.d. bootstrap.
+
+Resamples are split into chunks and run on a process pool. Each chunk draws
+its own blocks from a seed derived from the run seed and the chunk index, so
+results are reproducible regardless of worker count. The report gives
+percentile bands for the end balance and the worst drawdown, and the
+probability that a session locks (target, stop or insufficient balance)
+with its 95% interval.
+
+    python bootstrap.py --resamples 100000 --policy martingale
+    python bootstrap.py --archive --account MAIN --resamples 100000 --block 5
+"""
+import argparse
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+try:
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+except ImportError: # Optional dependency, only the bootstrap itself needs it
+    np = None
+
+import sizing
+from risk_simulator import OPEN, TARGET, STOP, INSUFFICIENT, session_levels
+from trade_history import WIN
+from trading_engine import (
+    DEFAULT_INITIAL_CAPITAL, DEFAULT_DAILY_GROWTH_TARGET, DEFAULT_STOP_LOSS_LIMIT,
+    DEFAULT_TRADE_MULTIPLIER, DEFAULT_STARTING_TRADE_VALUE
+)
+
+BANDS = (5, 25, 50, 75, 95)
+MIN_LOG_TRADES = 10
+DEFAULT_SESSION_TRADES = 1000 # Trades per synthetic session before it counts as still open
+CHUNK_CELLS = 2_000_000 # Outcome cells (paths x trades) generated per chunk; bounds worker memory
+CHUNKS_PER_WORKER = 4
+
+
+def outcome_log(types):
+    """Recorded type codes (trades_history.types or any iterable of codes) as a bool array, True = WIN."""
+    if np is None:
+        raise RuntimeError("NumPy is required for the bootstrap (pip install numpy)")
+    if hasattr(types, 'typecode'):
+        codes = np.frombuffer(types, dtype=np.uint8) if types.itemsize == 1 else np.asarray(types)
+    else:
+        codes = np.fromiter(types, dtype=np.uint8)
+    return codes == WIN
+
+
+def default_block(trades):
+    """Block length ~ n^(1/3), the usual rate for block bootstraps of a mean."""
+    return max(1, round(trades ** (1 / 3)))
+
+
+def resample(log, paths, trades, block, rng):
+    """(paths, trades) bool matrix of circular blocks of `log` starting at uniform random positions."""
+    # Every block of the wrapped log as a strided view: one gather per block instead of per outcome
+    windows = sliding_window_view(np.concatenate((log, log[:block - 1])), block)
+    blocks = -(-trades // block)
+    starts = rng.integers(0, len(log), (paths, blocks), dtype=np.int32)
+    return windows[starts].reshape(paths, blocks * block)[:, :trades]
+
+
+def _bootstrap_chunk(log, paths, trades, block, policy, initial_capital, target, stop,
+                     starting_trade_value, trade_multiplier, seed, index):
+    """Worker entry point: one chunk of resampled sessions replayed through the rules."""
+    rng = np.random.default_rng(None if seed is None else [seed, index])
+    outcomes = resample(log, paths, trades, block, rng)
+    outcome, final_balance, trade_count, drawdown = sizing.simulate_paths(
+        outcomes, policy, initial_capital, target, stop, starting_trade_value, trade_multiplier
+    )
+    return outcome, final_balance, trade_count, drawdown
+
+
+def iter_bootstrap(log, resamples, policy, initial_capital, target, stop, starting_trade_value, trade_multiplier,
+                   trades=DEFAULT_SESSION_TRADES, block=None, workers=None, seed=None, cancel_event=None):
+    """Yields the simulate_paths() arrays of each chunk as it finishes (completion order).
+
+    `cancel_event` (a threading.Event) stops the run between chunks, like
+    parameter_sweep.iter_sweep().
+    """
+    workers = workers or os.cpu_count() or 1
+    block = block or default_block(len(log))
+    chunk = max(1, min(-(-resamples // (workers * CHUNKS_PER_WORKER)), CHUNK_CELLS // trades))
+    sizes = [min(chunk, resamples - start) for start in range(0, resamples, chunk)]
+
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        pending = {
+            executor.submit(_bootstrap_chunk, log, size, trades, block, policy, initial_capital, target, stop,
+                            starting_trade_value, trade_multiplier, seed, index)
+            for index, size in enumerate(sizes)
+        }
+        while pending:
+            done, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+            if cancel_event is not None and cancel_event.is_set():
+                return
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_bootstrap(log, resamples=100_000, policy=None, initial_capital=DEFAULT_INITIAL_CAPITAL,
+                  daily_growth_target=DEFAULT_DAILY_GROWTH_TARGET, stop_loss_limit=DEFAULT_STOP_LOSS_LIMIT,
+                  trade_multiplier=DEFAULT_TRADE_MULTIPLIER, starting_trade_value=DEFAULT_STARTING_TRADE_VALUE,
+                  trades=DEFAULT_SESSION_TRADES, block=None, workers=None, seed=None, cancel_event=None,
+                  progress=None):
+    """Bootstrap summary of `log` (outcome_log()) under the given rules.
+
+    `progress(done, total)` is called as chunks finish. A cancelled run
+    summarizes the chunks that did finish and sets 'cancelled'.
+    """
+    if np is None:
+        raise RuntimeError("NumPy is required for the bootstrap (pip install numpy)")
+    log = np.asarray(log, dtype=bool)
+    if len(log) < MIN_LOG_TRADES:
+        raise ValueError(f"Need at least {MIN_LOG_TRADES} recorded trades to resample")
+    if resamples <= 0 or trades <= 0 or (block is not None and block <= 0):
+        raise ValueError("Resamples, session trades and block length must be positive")
+    if block is not None and block > len(log):
+        raise ValueError(f"Block length {block} is longer than the {len(log)}-trade log")
+    started = time.perf_counter()
+    policy = policy or sizing.make_policy()
+    block = block or default_block(len(log))
+    target, stop = session_levels(initial_capital, daily_growth_target, stop_loss_limit)
+
+    parts = []
+    done = 0
+    for part in iter_bootstrap(log, resamples, policy, initial_capital, target, stop, starting_trade_value,
+                               trade_multiplier, trades, block, workers, seed, cancel_event):
+        parts.append(part)
+        done += len(part[0])
+        if progress is not None:
+            progress(done, resamples)
+    if not parts:
+        raise RuntimeError("Bootstrap cancelled before any resamples finished")
+    outcome, final_balance, trade_count, drawdown = (np.concatenate(column) for column in zip(*parts))
+
+    paths = len(outcome)
+    counts = np.bincount(outcome, minlength=4)
+    p_lock = 1 - int(counts[OPEN]) / paths
+    margin = 1.96 * math.sqrt(p_lock * (1 - p_lock) / paths)
+    return {
+        'resamples': paths, 'cancelled': paths < resamples, 'log_trades': len(log),
+        'log_win_rate': float(log.mean()), 'block': block, 'session_trades': trades, 'policy': policy.name,
+        'target': target, 'stop': stop,
+        'p_lock': p_lock, 'p_lock_interval': (max(0.0, p_lock - margin), min(1.0, p_lock + margin)),
+        'p_target': int(counts[TARGET]) / paths, 'p_stop': int(counts[STOP]) / paths,
+        'p_insufficient': int(counts[INSUFFICIENT]) / paths,
+        'expected_trades': float(trade_count.mean()),
+        'balance_bands': dict(zip(BANDS, np.percentile(final_balance, BANDS).tolist())),
+        'drawdown_bands': dict(zip(BANDS, np.percentile(drawdown, BANDS).tolist())),
+        'elapsed': time.perf_counter() - started
+    }
+
+
+def format_report(result):
+    """Plain-text summary used by the RISK ANALYTICS tab and the command line."""
+    low, high = result['p_lock_interval']
+    bands = '/'.join(f"P{p}" for p in BANDS)
+    balance = ' / '.join(f"${v:.2f}" for v in result['balance_bands'].values())
+    drawdown = ' / '.join(f"${v:.2f}" for v in result['drawdown_bands'].values())
+    return (
+        f"RESAMPLES: {result['resamples']:,}{' (CANCELLED)' if result['cancelled'] else ''}  "
+        f"LOG: {result['log_trades']:,} TRADES @ {result['log_win_rate']:.1%}  BLOCK: {result['block']}\n"
+        f"P(LOCK): {result['p_lock']:.2%} [{low:.2%} - {high:.2%}]  "
+        f"TARGET ${result['target']:.2f} {result['p_target']:.2%}  STOP ${result['stop']:.2f} {result['p_stop']:.2%}  "
+        f"INSUFF {result['p_insufficient']:.2%}\n"
+        f"END BALANCE {bands}: {balance}\n"
+        f"DRAWDOWN {bands}: {drawdown}\n"
+        f"EXPECTED TRADES: {result['expected_trades']:.1f}   POLICY: {result['policy'].upper()}   "
+        f"ELAPSED: {result['elapsed']:.2f}s"
+    )
+
+
+def _parse_param(text):
+    name, _, value = text.partition('=')
+    if not value:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got {text!r}")
+    return name.strip(), float(value)
+
+
+def main():
+    import trade_export
+    parser = argparse.ArgumentParser(description="Block-bootstrap confidence bands from the recorded trade log.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--session', default=trade_export.SESSION_FILE, help="Saved session (JSON or binary snapshot)")
+    source.add_argument('--archive', action='store_true', help="Resample the SQLite trade archive instead")
+    parser.add_argument('--account', help="Archive account")
+    parser.add_argument('--capital', type=float, default=DEFAULT_INITIAL_CAPITAL)
+    parser.add_argument('--growth', type=float, default=DEFAULT_DAILY_GROWTH_TARGET, help="Daily growth target (%%)")
+    parser.add_argument('--stop', type=float, default=DEFAULT_STOP_LOSS_LIMIT, help="Stop loss limit (%%)")
+    parser.add_argument('--multiplier', type=float, default=DEFAULT_TRADE_MULTIPLIER)
+    parser.add_argument('--policy', default=sizing.DEFAULT_POLICY, choices=sorted(sizing.POLICIES))
+    parser.add_argument('--param', type=_parse_param, action='append', default=[], metavar='NAME=VALUE',
+                        help="Sizing policy parameter, e.g. cap=0.05 (repeatable)")
+    parser.add_argument('--resamples', type=int, default=100_000)
+    parser.add_argument('--trades', type=int, default=DEFAULT_SESSION_TRADES, help="Trades per synthetic session")
+    parser.add_argument('--block', type=int, help="Block length (default: log length ** 1/3)")
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+
+    if args.archive:
+        trades = trade_export.archive_trades(account=args.account)
+    else:
+        trades = trade_export.saved_trades(args.session)
+    try:
+        log = outcome_log(kind for _, kind, _, _ in trades)
+        result = run_bootstrap(
+            log, args.resamples, sizing.make_policy(args.policy, **dict(args.param)), args.capital, args.growth,
+            args.stop, args.multiplier, trades=args.trades, block=args.block, workers=args.workers, seed=args.seed,
+            progress=lambda done, total: print(f"\r{done:,}/{total:,} resamples", end='', flush=True)
+        )
+    except ValueError as e: # Unknown account, too short a log, bad block length...
+        parser.error(str(e))
+    print()
+    print(format_report(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""Local HTTP/WebSocket API for bots posting trade results into a running session.
+
+An asyncio server runs on its own thread and never touches the engine. Each
+posted result is put on a thread-safe queue together with a reply callback; the
+owner of the engine (the Tk thread, or serve_headless below) drains the queue
+in batches, applies the trades and answers every request with the resulting
+state. Subscribers on the WebSocket get a JSON state message whenever the owner
+publishes one, which the GUI does once per coalesced repaint.
+
+    POST /trade      {"result": "WIN"}                -> {"event": ..., "current_trade_value": ..., ...}
+    POST /trades     {"results": ["WIN", "LOSE", ...]} -> {"replies": [...]}
+    GET  /state                                        -> latest published state
+    GET  /ws         WebSocket: pushes state messages; accepts {"result": "WIN"} text frames
+
+    python Tradingmanager.py --bot-port 8765     # serve the live session
+    python bot_api.py --port 8765                # headless in-memory engine, for testing bots
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import queue
+import struct
+import threading
+
+from trading_engine import TRADE_APPLIED, TradingEngine
+
+RESULTS = {'WIN': True, 'LOSE': False, 'LOSS': False}
+WS_GUID = b'258EAFA5-E914-47DA-95CA-C5AB0DC11B65'
+MAX_BODY = 1 << 20
+SUBSCRIBER_BUFFER_LIMIT = 1 << 20 # Bytes queued for a slow WebSocket client before it is dropped
+START_TIMEOUT = 5.0 # Seconds start() waits for the server to bind
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 413: 'Payload Too Large'}
+
+
+def parse_result(value):
+    """True for a win, False for a loss; ValueError otherwise."""
+    try:
+        return RESULTS[str(value).strip().upper()]
+    except KeyError:
+        raise ValueError(f"result must be WIN or LOSE, got {value!r}") from None
+
+
+def engine_state(engine):
+    """JSON-ready snapshot of what bots and subscribers see."""
+    return {
+        'balance': engine.current_balance, 'current_trade_value': engine.current_trade_value,
+        'target': engine.calculate_daily_target(), 'stop': engine.calculate_stop_loss(),
+        'daily_start_balance': engine.daily_start_balance, 'wins': engine.wins_count,
+        'losses': engine.losses_count, 'locked': engine.locked, 'session_date': engine.session_date
+    }
+
+
+def apply_result(engine, is_win):
+    """Runs one trade. Returns (engine event, reply payload)."""
+    event = engine.win() if is_win else engine.loss()
+    return event, dict(engine_state(engine), event=event, applied=event in TRADE_APPLIED)
+
+
+def _ws_frame(payload, opcode=0x1):
+    """Unmasked server-to-client frame."""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack('!BB', 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack('!BBH', 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+    return header + payload
+
+
+class BotServer:
+    """asyncio HTTP/WebSocket front end feeding a thread-safe inbox of (is_win, reply) pairs."""
+
+    def __init__(self, host='127.0.0.1', port=8765):
+        self.host = host
+        self.port = port
+        self.inbox = queue.SimpleQueue()
+        self.state = {}
+        self.requests = 0
+        self._subscribers = set()
+        self._loop = None
+        self._server = None
+        self._ready = threading.Event()
+        self._error = None # Set by the server thread when binding fails; raised by start()
+        self._thread = None
+
+    # ===================================================================
+    # OWNER SIDE (engine thread)
+    # ===================================================================
+
+    def start(self):
+        """Starts the server thread. Returns the bound port (useful with port 0).
+
+        Raises the bind error (e.g. OSError for a port in use), or TimeoutError
+        if the server is not listening within START_TIMEOUT seconds.
+        """
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._serve()), name='bot-api', daemon=True)
+        self._thread.start()
+        if not self._ready.wait(START_TIMEOUT):
+            raise TimeoutError(f"Bot API did not start listening on {self.host}:{self.port} within {START_TIMEOUT}s")
+        if self._error is not None:
+            self._loop = None # Nothing to stop
+            raise self._error
+        return self.port
+
+    def drain(self, limit=10000):
+        """Up to `limit` pending (is_win, reply) pairs, in arrival order. Call reply(payload) for each."""
+        batch = []
+        get = self.inbox.get_nowait
+        try:
+            while len(batch) < limit:
+                batch.append(get())
+        except queue.Empty:
+            pass
+        return batch
+
+    def publish(self, state):
+        """Records the newest state and pushes it to every WebSocket subscriber. Thread-safe."""
+        self.state = state
+        if self._loop is not None and self._subscribers:
+            self._loop.call_soon_threadsafe(self._broadcast, _ws_frame(json.dumps(state).encode()))
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+            self._thread.join(5)
+
+    # ===================================================================
+    # SERVER SIDE (asyncio thread)
+    # ===================================================================
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        try:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+        except Exception as e:
+            self._error = e
+            return
+        finally:
+            self._ready.set() # start() must never wait on a server that will not come up
+        try:
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+    def _submit(self, is_win):
+        """Queues one trade for the owner; the future resolves with its reply payload."""
+        loop = self._loop
+        future = loop.create_future()
+
+        def reply(payload):
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(payload))
+        self.requests += 1
+        self.inbox.put((is_win, reply))
+        return future
+
+    async def _handle(self, reader, writer):
+        try:
+            while True: # HTTP/1.1 keep-alive: one request per iteration
+                request_line = await reader.readline()
+                if not request_line:
+                    return
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                if headers.get('upgrade', '').lower() == 'websocket':
+                    await self._websocket(reader, writer, headers)
+                    return
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, {'error': 'body too large'})
+                    return
+                body = await reader.readexactly(length) if length else b''
+                status, payload = await self._route(method, path.split('?')[0], body)
+                await self._respond(writer, status, payload)
+                if headers.get('connection', '').lower() == 'close':
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError, asyncio.CancelledError):
+            pass # Client went away, sent garbage, or the server is shutting down
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body):
+        try:
+            if method == 'GET' and path == '/state':
+                return 200, self.state
+            if method == 'POST' and path == '/trade':
+                return 200, await self._submit(parse_result(json.loads(body)['result']))
+            if method == 'POST' and path == '/trades':
+                futures = [self._submit(parse_result(result)) for result in json.loads(body)['results']]
+                return 200, {'replies': list(await asyncio.gather(*futures))}
+        except (ValueError, KeyError, TypeError) as e:
+            return 400, {'error': str(e)}
+        return 404, {'error': f'no route {method} {path}'}
+
+    @staticmethod
+    async def _respond(writer, status, payload):
+        body = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+
+    async def _websocket(self, reader, writer, headers):
+        accept = base64.b64encode(hashlib.sha1(headers['sec-websocket-key'].encode() + WS_GUID).digest()).decode()
+        writer.write(
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n".encode()
+        )
+        writer.write(_ws_frame(json.dumps(self.state).encode()))
+        self._subscribers.add(writer)
+        try:
+            while True:
+                first, second = await reader.readexactly(2)
+                opcode, length = first & 0x0F, second & 0x7F
+                if length == 126:
+                    length = struct.unpack('!H', await reader.readexactly(2))[0]
+                elif length == 127:
+                    length = struct.unpack('!Q', await reader.readexactly(8))[0]
+                if length > MAX_BODY:
+                    return
+                mask = await reader.readexactly(4) if second & 0x80 else b'\0\0\0\0'
+                data = bytes(b ^ mask[i % 4] for i, b in enumerate(await reader.readexactly(length)))
+                if opcode == 0x8: # Close
+                    writer.write(_ws_frame(b'', 0x8))
+                    return
+                if opcode == 0x9: # Ping
+                    writer.write(_ws_frame(data, 0xA))
+                elif opcode == 0x1:
+                    try:
+                        reply = await self._submit(parse_result(json.loads(data)['result']))
+                    except (ValueError, KeyError, TypeError) as e:
+                        reply = {'error': str(e)}
+                    writer.write(_ws_frame(json.dumps(reply).encode()))
+        finally:
+            self._subscribers.discard(writer)
+
+    def _broadcast(self, frame):
+        for writer in list(self._subscribers):
+            if writer.transport.get_write_buffer_size() > SUBSCRIBER_BUFFER_LIMIT:
+                self._subscribers.discard(writer) # Not reading: drop it instead of buffering without bound
+                writer.close()
+            else:
+                writer.write(frame)
+
+
+def serve_headless(engine, server):
+    """Owner loop without a GUI: drains batches into `engine` and publishes after each one. Runs forever."""
+    server.publish(engine_state(engine))
+    while True:
+        try:
+            first = server.inbox.get(timeout=0.5) # Block for the first event, then take whatever else is queued
+        except queue.Empty:
+            continue
+        for is_win, reply in [first] + server.drain():
+            reply(apply_result(engine, is_win)[1])
+        server.publish(engine_state(engine))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless bot API over an in-memory trading session.")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--capital', type=float, default=50.0)
+    args = parser.parse_args()
+    server = BotServer(port=args.port)
+    print(f"BOT API listening on http://127.0.0.1:{server.start()}")
+    try:
+        serve_headless(TradingEngine(initial_capital=args.capital), server)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Coalesced, dirty-tracked widget updates.
+
+Each display element registers a `compute` callable (reads model state and
+returns the value to show) and an `apply` callable (pushes that value into the
+widget). Marking elements dirty schedules a single root.after_idle flush no
+matter how many trades arrive before Tk gets idle, and the flush only touches
+widgets whose computed value differs from the one last applied.
+"""
+
+
+class DisplayScheduler:
+    """Per-widget dirty flags plus one pending after_idle repaint."""
+
+    def __init__(self, root):
+        self.root = root
+        self.elements = {} # key -> (compute, apply), in registration order
+        self.applied = {} # key -> value last pushed to the widget
+        self.dirty = set()
+        self.pending = False
+        self.flushes = 0 # Repaints actually run (coalescing diagnostics)
+
+    def register(self, key, compute, apply):
+        self.elements[key] = (compute, apply)
+        self.dirty.add(key)
+
+    def mark(self, *keys):
+        """Flags `keys` (all elements when none given) and schedules a repaint if one isn't queued."""
+        self.dirty.update(keys or self.elements)
+        if not self.pending:
+            self.pending = True
+            self.root.after_idle(self.flush)
+
+    def forget(self, key):
+        """Drops the cached value so the next flush re-applies `key` even if unchanged."""
+        self.applied.pop(key, None)
+        self.dirty.add(key)
+
+    def flush(self):
+        """Applies every dirty element whose value changed. Safe to call directly."""
+        self.pending = False
+        if not self.dirty:
+            return
+        dirty, self.dirty = self.dirty, set()
+        self.flushes += 1
+        applied = self.applied
+        for key, (compute, apply) in self.elements.items():
+            if key not in dirty:
+                continue
+            value = compute()
+            if key in applied and applied[key] == value:
+                continue
+            applied[key] = value
+            apply(value)
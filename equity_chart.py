@@ -0,0 +1,179 @@
+"""Equity-curve chart for the current cycle.
+
+Balance after every trade is plotted against trade number, with the daily
+target, stop loss and starting balance as horizontal lines. A new trade adds a
+single line segment; the whole chart is only redrawn when the cycle, the
+levels, the window size or the axis range changes. The x axis is laid out for
+twice the trades seen so far, so those redraws become rarer as the history
+grows. Long histories are reduced with Largest-Triangle-Three-Buckets to about
+two points per pixel before drawing, so a redraw costs the same for ten
+thousand trades as for a million.
+"""
+import tkinter as tk
+
+try:
+    import numpy as np
+except ImportError: # Optional: LTTB falls back to a pure-Python loop
+    np = None
+
+DOWNSAMPLE_ABOVE = 4000 # Points drawn as-is up to this many
+POINTS_PER_PIXEL = 2
+MIN_CAPACITY = 50 # Trades the x axis is first laid out for
+MARGIN = {'left': 70, 'right': 15, 'top': 15, 'bottom': 25}
+
+
+def lttb(values, threshold):
+    """Indices of `threshold` points of `values` (y over x = index) that keep the curve's shape.
+
+    Largest-Triangle-Three-Buckets: the first and last points are kept, and from
+    each bucket in between the point forming the largest triangle with the
+    previously kept point and the next bucket's average.
+    """
+    count = len(values)
+    if threshold >= count or threshold < 3:
+        return list(range(count))
+    every = (count - 2) / (threshold - 2)
+    edges = [int(i * every) + 1 for i in range(threshold - 1)]
+    edges[-1] = count - 1
+    edges.append(count)
+    kept = [0]
+    a = 0
+    if np is not None:
+        ys = np.frombuffer(values, dtype=np.float64) if hasattr(values, 'typecode') else np.asarray(values, dtype=np.float64)
+        for i in range(threshold - 2):
+            start, end, next_end = edges[i], edges[i + 1], edges[i + 2]
+            avg_x = (end + next_end - 1) / 2
+            avg_y = ys[end:next_end].mean()
+            ay = ys[a]
+            area = np.abs((a - avg_x) * (ys[start:end] - ay) - (a - np.arange(start, end)) * (avg_y - ay))
+            a = start + int(area.argmax())
+            kept.append(a)
+    else:
+        for i in range(threshold - 2):
+            start, end, next_end = edges[i], edges[i + 1], edges[i + 2]
+            avg_x = (end + next_end - 1) / 2
+            avg_y = sum(values[end:next_end]) / (next_end - end)
+            ay = values[a]
+            best, best_area = start, -1.0
+            for j in range(start, end):
+                area = abs((a - avg_x) * (values[j] - ay) - (a - j) * (avg_y - ay))
+                if area > best_area:
+                    best, best_area = j, area
+            a = best
+            kept.append(a)
+    kept.append(count - 1)
+    return kept
+
+
+class EquityChart(tk.Frame):
+    """Canvas plot of balance per trade; `source` returns the live trades_history."""
+
+    def __init__(self, parent, source, levels, colors, font=('Consolas', 9)):
+        """`levels` returns (start balance, target, stop); `colors` maps bg/panel/grid/line/target/stop/text."""
+        super().__init__(parent, bg=colors['panel'])
+        self.source = source
+        self.levels = levels
+        self.colors = colors
+        self.font = font
+        self.canvas = tk.Canvas(self, bg=colors['bg'], highlightthickness=0, bd=0)
+        self.canvas.pack(fill='both', expand=True)
+        self.canvas.bind('<Configure>', lambda e: self.redraw())
+
+        self._key = None # (history id, levels) the chart was drawn for
+        self._drawn = 0 # Trades covered by the drawing
+        self._appended = 0 # Segments added since the last full redraw
+        self._capacity = MIN_CAPACITY
+        self._low = self._high = 0.0
+        self._last_xy = None
+
+    # ===================================================================
+    # COORDINATES
+    # ===================================================================
+
+    def _plot_box(self):
+        width = max(self.canvas.winfo_width(), 2 * (MARGIN['left'] + MARGIN['right']))
+        height = max(self.canvas.winfo_height(), 2 * (MARGIN['top'] + MARGIN['bottom']))
+        return MARGIN['left'], MARGIN['top'], width - MARGIN['right'], height - MARGIN['bottom']
+
+    def _xy(self, index, balance):
+        left, top, right, bottom = self._box
+        x = left + (right - left) * index / self._capacity
+        y = bottom - (bottom - top) * (balance - self._low) / (self._high - self._low)
+        return x, y
+
+    # ===================================================================
+    # DRAWING
+    # ===================================================================
+
+    def refresh(self):
+        """Brings the chart up to date: new trades are appended, anything else redraws."""
+        history = self.source()
+        count = len(history)
+        if (id(history), self.levels()) != self._key or count < self._drawn:
+            self.redraw()
+            return
+        if count == self._drawn:
+            return
+        if count > self._capacity or self._appended + count - self._drawn > self._box[2] - self._box[0]:
+            self.redraw() # Out of x room, or enough single segments that one downsampled line is cheaper
+            return
+        balances = history.balances
+        new = balances[self._drawn:count]
+        if min(new) < self._low or max(new) > self._high:
+            self.redraw()
+            return
+        line = self.colors['line']
+        create = self.canvas.create_line
+        x0, y0 = self._last_xy
+        for index in range(self._drawn, count):
+            x1, y1 = self._xy(index + 1, balances[index])
+            create(x0, y0, x1, y1, fill=line, width=2, tags='curve')
+            x0, y0 = x1, y1
+        self._last_xy = (x0, y0)
+        self._appended += count - self._drawn
+        self._drawn = count
+        self.canvas.itemconfigure('count', text=f"{count:,} TRADES")
+
+    def redraw(self):
+        """Full repaint: axes, level lines and the (downsampled) curve."""
+        canvas = self.canvas
+        canvas.delete('all')
+        history = self.source()
+        start, target, stop = levels = self.levels()
+        count = len(history)
+        self._key = (id(history), levels)
+        self._drawn = count
+        self._appended = 0
+        self._capacity = max(MIN_CAPACITY, 2 * count)
+        self._box = left, top, right, bottom = self._plot_box()
+
+        balances = history.balances
+        low, high = min(stop, start), max(target, start)
+        if count:
+            low, high = min(low, min(balances)), max(high, max(balances))
+        pad = (high - low) * 0.1 or 1.0
+        self._low, self._high = low - pad, high + pad
+
+        colors = self.colors
+        canvas.create_rectangle(left, top, right, bottom, outline=colors['grid'])
+        for value, color, label in ((target, colors['target'], 'TARGET'), (stop, colors['stop'], 'STOP'),
+                                    (start, colors['grid'], 'START')):
+            y = self._xy(0, value)[1]
+            canvas.create_line(left, y, right, y, fill=color, dash=(4, 3))
+            canvas.create_text(left - 6, y, text=f"${value:.2f}", anchor='e', fill=color, font=self.font)
+            canvas.create_text(right - 4, y - 2, text=label, anchor='se', fill=color, font=self.font)
+        canvas.create_text(right, bottom + 4, text=f"{count:,} TRADES", anchor='ne', fill=colors['text'], font=self.font,
+                           tags='count')
+
+        # Point 0 is the cycle's starting balance, point i the balance after trade i
+        if count + 1 > DOWNSAMPLE_ABOVE:
+            kept = lttb(balances, max(3, POINTS_PER_PIXEL * int(right - left)))
+            points = [(0, start)] + [(index + 1, balances[index]) for index in kept]
+        else:
+            points = [(0, start)] + [(index + 1, balances[index]) for index in range(count)]
+        coordinates = []
+        for index, balance in points:
+            coordinates.extend(self._xy(index, balance))
+        if len(coordinates) >= 4:
+            canvas.create_line(*coordinates, fill=colors['line'], width=2, tags='curve')
+        self._last_xy = tuple(coordinates[-2:])
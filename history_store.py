@@ -0,0 +1,223 @@
+"""Multi-day trade history in a local SQLite database.
+
+new_day, continue_with_current_balance and the resets clear the in-memory
+trades_history; every cycle's trades are also kept here so they survive it.
+Trades are buffered and written with executemany inside one transaction per
+flush. Aggregates (per-day P&L, win rate by week, max drawdown) run as SQL over
+indexed columns, never by loading trades into Python lists.
+
+    python history_store.py --daily --weekly --drawdown 2026-10-01 2026-10-31
+"""
+import argparse
+import sqlite3
+import time
+
+HISTORY_DB = 'trading_manager_history.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    account TEXT NOT NULL DEFAULT 'MAIN',
+    day TEXT NOT NULL,
+    started_at INTEGER NOT NULL,
+    start_balance REAL NOT NULL,
+    initial_capital REAL NOT NULL,
+    daily_growth_target REAL NOT NULL,
+    stop_loss_limit REAL NOT NULL,
+    trade_multiplier REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    day TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    type INTEGER NOT NULL,
+    amount REAL NOT NULL,
+    balance REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS trades_day ON trades(day, type, amount); -- covers the per-day aggregates
+CREATE INDEX IF NOT EXISTS trades_session ON trades(session_id);
+CREATE INDEX IF NOT EXISTS trades_type_day ON trades(type, day);
+CREATE INDEX IF NOT EXISTS sessions_day ON sessions(day);
+"""
+ACCOUNT_INDEX = "CREATE INDEX IF NOT EXISTS sessions_account ON sessions(account, id)"
+
+# Signed P&L of one trade row: type 1 = WIN, 0 = LOSE
+SIGNED_AMOUNT = "CASE type WHEN 1 THEN amount ELSE -amount END"
+
+
+class HistoryStore:
+    """Append-only SQLite archive of every cycle's trades."""
+
+    def __init__(self, path=HISTORY_DB, batch_size=500, account='MAIN'):
+        """`account`: whose cycles this store writes and resumes (reports can span all accounts)."""
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        if 'account' not in {row[1] for row in self.conn.execute("PRAGMA table_info(sessions)")}:
+            with self.conn: # Archive written before accounts existed: all of it belongs to MAIN
+                self.conn.execute("ALTER TABLE sessions ADD COLUMN account TEXT NOT NULL DEFAULT 'MAIN'")
+        self.conn.execute(ACCOUNT_INDEX)
+        self.account = account
+        self.batch_size = batch_size
+        self.session_id = None
+        self.day = None
+        self._buffer = []
+
+    # ===================================================================
+    # WRITING
+    # ===================================================================
+
+    def begin_session(self, engine):
+        """Opens a new cycle row for `engine`'s current settings and start balance."""
+        self.flush()
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO sessions (account, day, started_at, start_balance, initial_capital, daily_growth_target,"
+                " stop_loss_limit, trade_multiplier) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.account, engine.session_date, int(time.time()), engine.daily_start_balance, engine.initial_capital,
+                 engine.daily_growth_target, engine.stop_loss_limit, engine.trade_multiplier)
+            )
+        self.session_id = cursor.lastrowid
+        self.day = engine.session_date
+        self.record_history(engine.trades_history)
+
+    def resume_session(self, engine):
+        """Reattaches to the latest cycle if it matches `engine`, back-filling trades the archive missed.
+
+        Starts a new cycle row otherwise (first run, or the session file belongs to another cycle).
+        """
+        row = self.conn.execute(
+            "SELECT id, day, start_balance FROM sessions WHERE account = ? ORDER BY id DESC LIMIT 1", (self.account,)
+        ).fetchone()
+        if row is None or row[1] != engine.session_date or row[2] != engine.daily_start_balance:
+            self.begin_session(engine)
+            return
+        self.session_id, self.day = row[0], row[1]
+        archived = self.conn.execute("SELECT COUNT(*) FROM trades WHERE session_id = ?", (self.session_id,)).fetchone()[0]
+        if archived > len(engine.trades_history):
+            self.begin_session(engine) # History was replaced under the same day/balance: treat as a new cycle
+            return
+        self.record_history(engine.trades_history, archived)
+
+    def record(self, code, amount, balance, epoch):
+        """Buffers one trade of the current cycle; flushed in batches."""
+        self._buffer.append((self.session_id, self.day, epoch, code, amount, balance))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def record_last(self, history):
+        """Buffers the newest trade of a TradeHistory (called per applied trade)."""
+        self.record(history.types[-1], history.amounts[-1], history.balances[-1], history.timestamps[-1])
+
+    def record_history(self, history, start=0):
+        """Buffers trades `start:` of a TradeHistory (bulk import, back-fill)."""
+        session_id, day = self.session_id, self.day
+        self._buffer.extend(
+            (session_id, day, history.timestamps[i], history.types[i], history.amounts[i], history.balances[i])
+            for i in range(start, len(history))
+        )
+        self.flush()
+
+    def flush(self):
+        """Writes buffered trades in one transaction."""
+        if not self._buffer:
+            return
+        rows, self._buffer = self._buffer, []
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO trades (session_id, day, ts, type, amount, balance) VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+    @property
+    def pending(self):
+        return len(self._buffer)
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    # ===================================================================
+    # AGGREGATES
+    # ===================================================================
+
+    @staticmethod
+    def _range(start_day, end_day, account):
+        """WHERE clause + parameters selecting trades in a day range, optionally of one account."""
+        where = "day BETWEEN ?1 AND ?2"
+        if account is not None:
+            where += " AND session_id IN (SELECT id FROM sessions WHERE account = ?3)"
+            return where, (start_day or '0000-00-00', end_day or '9999-99-99', account)
+        return where, (start_day or '0000-00-00', end_day or '9999-99-99')
+
+    def daily_pnl(self, start_day=None, end_day=None, account=None):
+        """[(day, trades, wins, pnl)] per day in the range (inclusive, YYYY-MM-DD); all accounts unless given."""
+        where, params = self._range(start_day, end_day, account)
+        return self.conn.execute(
+            f"SELECT day, COUNT(*), SUM(type), SUM({SIGNED_AMOUNT}) FROM trades WHERE {where} GROUP BY day ORDER BY day",
+            params
+        ).fetchall()
+
+    def win_rate_by_week(self, start_day=None, end_day=None, account=None):
+        """[(year-week, trades, win_rate)] using ISO-like %Y-%W weeks."""
+        where, params = self._range(start_day, end_day, account)
+        return self.conn.execute(
+            "SELECT strftime('%Y-%W', day) AS week, SUM(trades), 1.0 * SUM(wins) / SUM(trades) FROM ("
+            f" SELECT day, COUNT(*) AS trades, SUM(type) AS wins FROM trades WHERE {where} GROUP BY day"
+            ") GROUP BY week ORDER BY week",
+            params
+        ).fetchall()
+
+    def max_drawdown(self, start_day=None, end_day=None, account=None):
+        """Largest peak-to-trough balance drop within a cycle over the range, in dollars (0.0 without trades).
+
+        Each cycle's running peak starts at its start balance: a new cycle or a
+        reset rebases the balance, so peaks never carry across cycles.
+        """
+        # Trades are appended in time order, so the range is a contiguous rowid span scanned in primary-key order
+        where, params = self._range(start_day, end_day, account)
+        row = self.conn.execute(
+            "SELECT MAX(MAX(peak, s.start_balance) - t.balance) FROM ("
+            " SELECT session_id, balance,"
+            " MAX(balance) OVER (PARTITION BY session_id ORDER BY id ROWS UNBOUNDED PRECEDING) AS peak FROM trades"
+            f" WHERE id BETWEEN (SELECT MIN(id) FROM trades WHERE {where})"
+            f" AND (SELECT MAX(id) FROM trades WHERE {where}) AND {where}"
+            ") t JOIN sessions s ON s.id = t.session_id",
+            params
+        ).fetchone()
+        return row[0] or 0.0
+
+    def session_summary(self, day):
+        """[(session_id, account, start_balance, trades, pnl)] for the cycles of one day."""
+        return self.conn.execute(
+            f"SELECT s.id, s.account, s.start_balance, COUNT(t.id), COALESCE(SUM({SIGNED_AMOUNT}), 0.0)"
+            " FROM sessions s LEFT JOIN trades t ON t.session_id = s.id"
+            " WHERE s.day = ? GROUP BY s.id ORDER BY s.id", (day,)
+        ).fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reports over the multi-day trade archive.")
+    parser.add_argument('range', nargs='*', help="Optional START_DAY END_DAY (YYYY-MM-DD)")
+    parser.add_argument('--db', default=HISTORY_DB)
+    parser.add_argument('--account', help="Only this account's trades (default: all accounts)")
+    parser.add_argument('--daily', action='store_true')
+    parser.add_argument('--weekly', action='store_true')
+    parser.add_argument('--drawdown', action='store_true')
+    args = parser.parse_args()
+    start, end = (args.range + [None, None])[:2]
+    store = HistoryStore(args.db)
+    if args.daily:
+        for day, trades, wins, pnl in store.daily_pnl(start, end, args.account):
+            print(f"{day}  TRADES {trades:>6}  WINS {wins:>6}  P&L ${pnl:>10.2f}")
+    if args.weekly:
+        for week, trades, win_rate in store.win_rate_by_week(start, end, args.account):
+            print(f"{week}  TRADES {trades:>6}  WIN RATE {win_rate:.1%}")
+    if args.drawdown:
+        print(f"MAX DRAWDOWN ${store.max_drawdown(start, end, args.account):.2f}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Virtualized DATA LOG view.
+
+Only the rows that fit in the viewport exist as canvas items; their text is
+pulled from trades_history on every scroll, so memory and repaint cost depend
+on the window height, not on the number of trades.
+"""
+import tkinter as tk
+import tkinter.font as tkfont
+from array import array
+from bisect import bisect_right
+
+FILTERS = ('ALL', 'WIN', 'LOSE')
+
+
+class VirtualHistoryView(tk.Frame):
+    """Newest-first trade log backed directly by a TradeHistory."""
+
+    def __init__(self, parent, source, colors, font=('Consolas', 10)):
+        """`source` returns the live trades_history; `colors` maps bg/text/header/win/loss/select."""
+        super().__init__(parent, bg=colors['panel'])
+        self.font = tkfont.Font(font=font)
+        self._init_state(source, colors, self.font.metrics('linespace') + 2, tk.StringVar(value='ALL'), tk.StringVar())
+
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(2, weight=1)
+        self._create_toolbar()
+        tk.Label(
+            self, text=f"{'#':<8}{'TIME':<10} {'TYPE':<6} {'AMOUNT':<10} {'BALANCE':<10}", anchor='w',
+            font=(font[0], font[1], 'bold'), fg=colors['header'], bg=colors['bg'], padx=10
+        ).grid(row=1, column=0, columnspan=2, sticky='ew')
+        self.canvas = tk.Canvas(self, bg=colors['bg'], highlightthickness=0, bd=0)
+        self.canvas.grid(row=2, column=0, sticky='nsew')
+        self.scrollbar = tk.Scrollbar(self, orient='vertical', command=self.yview)
+        self.scrollbar.grid(row=2, column=1, sticky='ns')
+        self.selection_box = self.canvas.create_rectangle(0, 0, 0, 0, fill=colors['select'], width=0, state='hidden')
+
+        self.canvas.bind('<Configure>', self._on_resize)
+        self.canvas.bind('<MouseWheel>', lambda e: self.yview('scroll', -1 if e.delta > 0 else 1, 'units'))
+        self.canvas.bind('<Button-4>', lambda e: self.yview('scroll', -1, 'units'))
+        self.canvas.bind('<Button-5>', lambda e: self.yview('scroll', 1, 'units'))
+
+    @classmethod
+    def headless(cls, source, colors, canvas, scrollbar, filter_var, jump_var, row_height=16, height=600):
+        """A view painting into stand-in `canvas` / `scrollbar` objects, without creating any Tk widget.
+
+        The stand-ins need the Canvas / Scrollbar calls the view makes (create_text,
+        itemconfig, coords, winfo_height, set...) and the vars get()/set(); rows for
+        `height` pixels are created up front. Used to benchmark rendering without a display.
+        """
+        view = cls.__new__(cls)
+        view.font = None
+        view._init_state(source, colors, row_height, filter_var, jump_var)
+        view.canvas, view.scrollbar = canvas, scrollbar
+        view.selection_box = canvas.create_rectangle(0, 0, 0, 0, fill=colors['select'], width=0, state='hidden')
+        view._fit_rows(height)
+        return view
+
+    def _init_state(self, source, colors, row_height, filter_var, jump_var):
+        self.source = source
+        self.colors = colors
+        self.row_height = row_height
+
+        self.history = None
+        self.offset = 0 # Display row shown at the top of the viewport
+        self.filter_var = filter_var
+        self.jump_var = jump_var
+        self.selected = None # Trade index highlighted by jump_to_trade
+        self._last_count = 0 # Row count at the previous render
+        self._indexed = 0 # Trades scanned into the WIN/LOSE position indexes
+        self._positions = {'WIN': array('q'), 'LOSE': array('q')}
+        self._row_items = []
+
+    def _create_toolbar(self):
+        bar = tk.Frame(self, bg=self.colors['panel'])
+        bar.grid(row=0, column=0, columnspan=2, sticky='ew', pady=(0, 6))
+        for value in FILTERS:
+            tk.Radiobutton(
+                bar, text=value, value=value, variable=self.filter_var, command=self._on_filter,
+                indicatoron=False, bg=self.colors['bg'], fg=self.colors['text'], selectcolor=self.colors['select'],
+                font=('Arial', 9, 'bold'), relief=tk.FLAT, padx=8
+            ).pack(side='left', padx=(0, 4))
+        tk.Button(
+            bar, text="JUMP", command=self._on_jump, bg=self.colors['bg'], fg=self.colors['header'],
+            font=('Arial', 9, 'bold'), relief=tk.FLAT, padx=8
+        ).pack(side='right')
+        entry = tk.Entry(
+            bar, textvariable=self.jump_var, width=8, bg=self.colors['bg'], fg=self.colors['text'],
+            insertbackground=self.colors['text'], font=('Consolas', 10), relief=tk.FLAT
+        )
+        entry.pack(side='right', padx=4)
+        entry.bind('<Return>', lambda e: self._on_jump())
+        tk.Label(bar, text="TRADE #", fg=self.colors['text'], bg=self.colors['panel'], font=('Arial', 9)).pack(side='right')
+
+    # ===================================================================
+    # DATA ACCESS: display rows -> trade indexes, no copies of the history
+    # ===================================================================
+
+    def _sync_index(self):
+        """Extends the WIN/LOSE position indexes with trades appended since the last scan."""
+        types = self.history.types
+        wins, losses = self._positions['WIN'], self._positions['LOSE']
+        for i in range(self._indexed, len(types)):
+            (wins if types[i] else losses).append(i)
+        self._indexed = len(types)
+
+    def row_count(self):
+        mode = self.filter_var.get()
+        if mode == 'ALL':
+            return len(self.history)
+        self._sync_index()
+        return len(self._positions[mode])
+
+    def trade_index(self, row):
+        """Trade index shown on display row `row` (row 0 is the newest matching trade)."""
+        mode = self.filter_var.get()
+        if mode == 'ALL':
+            return len(self.history) - 1 - row
+        positions = self._positions[mode]
+        return positions[len(positions) - 1 - row]
+
+    def display_row(self, trade_index):
+        """Display row of the nearest matching trade at or before `trade_index`, or None."""
+        mode = self.filter_var.get()
+        if mode == 'ALL':
+            return len(self.history) - 1 - trade_index
+        self._sync_index()
+        positions = self._positions[mode]
+        k = bisect_right(positions, trade_index)
+        return len(positions) - k if k else None
+
+    # ===================================================================
+    # PUBLIC API
+    # ===================================================================
+
+    def set_history(self, history):
+        """Points the view at a new trades_history (reset / new cycle / load) and repaints from the top."""
+        self.history = history
+        self.offset = 0
+        self.selected = None
+        self._indexed = 0
+        self._positions = {'WIN': array('q'), 'LOSE': array('q')}
+        self.render()
+
+    def refresh(self):
+        """Repaints after trades were appended, keeping the rows under the user's eyes steady."""
+        history = self.source()
+        if history is not self.history:
+            self.set_history(history)
+            return
+        if self.offset:
+            self.offset += self.row_count() - self._last_count
+        self.render()
+
+    def jump_to_trade(self, number):
+        """Scrolls so that 1-based trade `number` (or the closest earlier match) is at the top, highlighted."""
+        if not self.history:
+            return
+        index = max(0, min(len(self.history), number) - 1)
+        row = self.display_row(index)
+        if row is None:
+            return
+        self.selected = self.trade_index(row)
+        self.offset = row
+        self.render()
+
+    def yview(self, *args):
+        """Scrollbar protocol: 'moveto fraction' or 'scroll n units|pages'."""
+        count = self.row_count()
+        if args[0] == 'moveto':
+            self.offset = int(float(args[1]) * count)
+        elif args[0] == 'scroll':
+            step = int(args[1]) * (self._visible_rows() if args[2] == 'pages' else 1)
+            self.offset += step
+        self.render()
+
+    # ===================================================================
+    # RENDERING
+    # ===================================================================
+
+    def _visible_rows(self):
+        return max(1, self.canvas.winfo_height() // self.row_height)
+
+    def _on_resize(self, event):
+        self._fit_rows(event.height)
+        self.render()
+
+    def _fit_rows(self, height):
+        """Creates or deletes row text items so that `height` pixels are covered."""
+        needed = height // self.row_height + 1
+        while len(self._row_items) < needed:
+            y = len(self._row_items) * self.row_height + 2
+            self._row_items.append(self.canvas.create_text(10, y, anchor='nw', font=self.font, text=''))
+        while len(self._row_items) > needed:
+            self.canvas.delete(self._row_items.pop())
+
+    def _on_filter(self):
+        self.offset = 0
+        self.render()
+
+    def _on_jump(self):
+        try:
+            self.jump_to_trade(int(self.jump_var.get()))
+        except ValueError:
+            self.jump_var.set('')
+
+    def render(self):
+        if self.history is None:
+            return
+        count = self.row_count()
+        visible = self._visible_rows()
+        self.offset = max(0, min(self.offset, count - visible))
+        self._last_count = count
+        history = self.history
+        colors = self.colors
+        self.canvas.itemconfig(self.selection_box, state='hidden')
+        for slot, item in enumerate(self._row_items):
+            row = self.offset + slot
+            if row >= count:
+                self.canvas.itemconfig(item, text='')
+                continue
+            index = self.trade_index(row)
+            trade = history[index]
+            self.canvas.itemconfig(
+                item, fill=colors['win'] if trade['type'] == 'WIN' else colors['loss'],
+                text=f"{index + 1:<8}{trade['timestamp']:<10} {trade['type']:<6} ${trade['amount']:<8.2f} ${trade['balance']:<8.2f}"
+            )
+            if index == self.selected:
+                y = slot * self.row_height + 1
+                self.canvas.coords(self.selection_box, 0, y, self.canvas.winfo_width(), y + self.row_height)
+                self.canvas.itemconfig(self.selection_box, state='normal')
+        if count:
+            self.scrollbar.set(self.offset / count, min(1.0, (self.offset + visible) / count))
+        else:
+            self.scrollbar.set(0.0, 1.0)
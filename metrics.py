@@ -0,0 +1,177 @@
+"""Opt-in latency histograms, counters and a local Prometheus endpoint.
+
+Nothing is timed unless MetricsRegistry.instrument() wraps a method, and the
+GUI only does that when started with --metrics, so a normal run pays nothing
+beyond a few dict increments for the counters. Each histogram is a fixed set
+of geometric buckets (2**(1/4) apart, 1 us to ~70 s): recording is one bisect
+and one increment, memory is constant, and percentiles are read off the
+cumulative counts with under 19% relative error.
+
+    python Tradingmanager.py --metrics                    # histograms + F12 debug overlay
+    python Tradingmanager.py --metrics-port 9464          # ... plus http://127.0.0.1:9464/metrics
+"""
+import functools
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BUCKET_BOUNDS = tuple(1e-6 * 2 ** (i / 4) for i in range(105)) # Seconds; the last bucket is open-ended
+QUANTILES = (0.5, 0.95, 0.99)
+PREFIX = 'trading_manager'
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (seconds), safe to record from any thread."""
+
+    __slots__ = ('counts', 'count', 'total', 'max', '_lock')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self.counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.counts), self.count, self.total, self.max
+
+    def quantile(self, q, snapshot=None):
+        """Upper bound of the bucket holding the q-th sample (0.0 when empty)."""
+        counts, count, _, largest = snapshot or self.snapshot()
+        if not count:
+            return 0.0
+        rank = q * count
+        seen = 0
+        for i, bucket in enumerate(counts):
+            seen += bucket
+            if seen >= rank:
+                return min(BUCKET_BOUNDS[i], largest) if i < len(BUCKET_BOUNDS) else largest
+        return largest
+
+
+class MetricsRegistry:
+    """Named histograms and counters plus the helpers that feed and expose them."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.histograms = {}
+        self.counters = {}
+        self.counter_sources = {} # name -> callable returning a count owned elsewhere
+        self._server = None
+
+    def histogram(self, name):
+        if name not in self.histograms:
+            self.histograms[name] = Histogram()
+        return self.histograms[name]
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def count_from(self, name, source):
+        """Exposes a counter maintained by another object (read at scrape time)."""
+        self.counter_sources[name] = source
+
+    def instrument(self, obj, attribute, name=None):
+        """Replaces obj.<attribute> with a timed wrapper when enabled; a no-op otherwise.
+
+        Call before the bound method is handed out (e.g. as a button command).
+        """
+        if not self.enabled:
+            return
+        method = getattr(obj, attribute)
+        histogram = self.histogram(name or attribute)
+        clock = time.perf_counter
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            started = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                histogram.record(clock() - started)
+        setattr(obj, attribute, timed)
+
+    # ===================================================================
+    # EXPOSITION
+    # ===================================================================
+
+    def all_counters(self):
+        counters = dict(self.counters)
+        for name, source in self.counter_sources.items():
+            counters[name] = source()
+        return counters
+
+    def summary_rows(self):
+        """[(name, count, p50, p95, p99, max)] in seconds, for the debug overlay."""
+        rows = []
+        for name, histogram in sorted(self.histograms.items()):
+            snapshot = histogram.snapshot()
+            rows.append((name, snapshot[1], *(histogram.quantile(q, snapshot) for q in QUANTILES), snapshot[3]))
+        return rows
+
+    def prometheus_text(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for name, histogram in sorted(self.histograms.items()):
+            metric = f"{PREFIX}_{name}_seconds"
+            snapshot = histogram.snapshot()
+            lines.append(f"# TYPE {metric} summary")
+            for q in QUANTILES:
+                lines.append(f'{metric}{{quantile="{q}"}} {histogram.quantile(q, snapshot):.9f}')
+            lines.append(f"{metric}_sum {snapshot[2]:.9f}")
+            lines.append(f"{metric}_count {snapshot[1]}")
+        for name, value in sorted(self.all_counters().items()):
+            metric = f"{PREFIX}_{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def serve(self, port, host='127.0.0.1'):
+        """Starts the /metrics endpoint on a daemon thread. Returns the bound port."""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = registry.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass # Keep scrapes out of the console
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='metrics-http', daemon=True).start()
+        return self._server.server_address[1]
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def format_overlay(registry):
+    """Fixed-width text table for the in-app debug overlay."""
+    lines = [f"{'HANDLER':<16}{'N':>8}{'P50':>9}{'P95':>9}{'P99':>9}{'MAX':>9}  (ms)"]
+    for name, count, p50, p95, p99, largest in registry.summary_rows():
+        lines.append(f"{name:<16}{count:>8}" + ''.join(f"{value * 1000:>9.3f}" for value in (p50, p95, p99, largest)))
+    counters = registry.all_counters()
+    lines.append('  '.join(f"{name.upper()} {value}" for name, value in sorted(counters.items())))
+    return '\n'.join(lines)
@@ -0,0 +1,176 @@
+"""Exact outcome odds for one trading cycle by dynamic programming.
+
+The session rules are a Markov chain over (balance, current trade value): a win
+adds the trade value and resets it to the starting value, a loss subtracts it
+and multiplies it (1.0 floor), and the daily target / stop loss are absorbing.
+Because a win always resets the trade value, the chain is solved on the
+balances seen right after a reset: from each of those, a "round" is a losing
+streak of length j followed by a win (probability q**j * p), unless the stop,
+the target or an unaffordable trade value absorbs it first. Balances live on a
+grid between the stop and the target (cents, or coarser for very wide bands);
+a landing point between two grid balances is split between them in proportion
+to its distance, which keeps the expected balance exact. One dense linear solve
+then gives P(target), P(stop), P(insufficient) and the expected trade count for
+every starting balance at once - no sampling noise in the tails.
+
+This is the martingale rule; fixed sizing is the same chain with a multiplier
+of 1. Results are memoized on the settings, so the PARAMETER GRID panel can
+refresh its odds on every keystroke.
+
+    python outcome_solver.py --win-rate 0.55
+    python outcome_solver.py --check    # cross-check against risk_simulator
+"""
+import argparse
+import time
+from collections import namedtuple
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError: # Optional dependency, only the solver and the simulator need it
+    np = None
+
+from risk_simulator import session_levels
+from trading_engine import (
+    DEFAULT_INITIAL_CAPITAL, DEFAULT_DAILY_GROWTH_TARGET, DEFAULT_STOP_LOSS_LIMIT,
+    DEFAULT_TRADE_MULTIPLIER, DEFAULT_STARTING_TRADE_VALUE
+)
+
+MIN_TICK = 0.01      # Grid resolution when the target/stop band is narrow enough
+MAX_STATES = 1000    # Beyond this the grid coarsens; keeps the dense solve well under 100 ms
+CACHE_SIZE = 256
+STREAK_EPSILON = 1e-15 # Losing streaks less likely than this are dropped (mass counted as insufficient)
+
+Odds = namedtuple('Odds', 'p_target p_stop p_insufficient expected_trades target stop tick states elapsed')
+
+
+def _round_table(balances, target, stop, start_value, multiplier, win_rate):
+    """Transition matrix between grid balances plus the per-round absorption and trade-count vectors."""
+    states = len(balances)
+    origin, tick = balances[0], balances[1] - balances[0] if states > 1 else MIN_TICK
+    lose_rate = 1 - win_rate
+    transitions = np.zeros((states, states))
+    to_target = np.zeros(states)
+    to_stop = np.zeros(states)
+    trades = np.zeros(states)
+    for row, start_balance in enumerate(balances):
+        balance, value, mass = start_balance, start_value, 1.0
+        while mass > STREAK_EPSILON:
+            if balance < value or balance <= stop: # check_can_trade(): refused, the cycle ends here
+                if balance >= value:
+                    to_stop[row] += mass
+                break
+            trades[row] += mass
+            landed = balance + value
+            if landed >= target:
+                to_target[row] += mass * win_rate
+            else:
+                position = (landed - origin) / tick
+                low = int(position)
+                fraction = position - low
+                if low + 1 < states and fraction > 1e-9:
+                    transitions[row, low] += mass * win_rate * (1 - fraction)
+                    transitions[row, low + 1] += mass * win_rate * fraction
+                elif low >= states - 1 and landed > balances[-1] + 1e-9:
+                    # Between the top grid balance and the target: split with the target by distance
+                    # (on a coarse grid this gap can exceed the trade value)
+                    beyond = (landed - balances[-1]) / (target - balances[-1])
+                    transitions[row, states - 1] += mass * win_rate * (1 - beyond)
+                    to_target[row] += mass * win_rate * beyond
+                else:
+                    transitions[row, min(low, states - 1)] += mass * win_rate
+            mass *= lose_rate
+            balance -= value
+            if balance <= stop:
+                to_stop[row] += mass
+                break
+            value = max(1.0, value * multiplier)
+    return transitions, to_target, to_stop, trades
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def solve(initial_capital=DEFAULT_INITIAL_CAPITAL, daily_growth_target=DEFAULT_DAILY_GROWTH_TARGET,
+          stop_loss_limit=DEFAULT_STOP_LOSS_LIMIT, trade_multiplier=DEFAULT_TRADE_MULTIPLIER, win_rate=0.5,
+          starting_trade_value=DEFAULT_STARTING_TRADE_VALUE):
+    """Odds for a fresh cycle starting at `initial_capital`. Memoized on the arguments."""
+    if np is None:
+        raise RuntimeError("NumPy is required for the outcome solver (pip install numpy)")
+    if not 0 <= win_rate <= 1:
+        raise ValueError("Win rate must be between 0 and 1")
+    if initial_capital <= 0 or daily_growth_target <= 0 or stop_loss_limit <= 0 or trade_multiplier < 1:
+        raise ValueError("Capital, target and stop must be positive and the multiplier at least 1")
+    started = time.perf_counter()
+    target, stop = session_levels(initial_capital, daily_growth_target, stop_loss_limit)
+    tick = max(MIN_TICK, (target - stop) / MAX_STATES)
+    # Grid anchored on the starting balance so the cycle starts exactly on a state
+    below = int((initial_capital - stop) / tick - 1e-9)
+    above = int((target - initial_capital) / tick - 1e-9)
+    balances = [initial_capital + step * tick for step in range(-below, above + 1)]
+    balances = [b for b in balances if stop < b < target]
+
+    transitions, to_target, to_stop, trades = _round_table(
+        balances, target, stop, starting_trade_value, trade_multiplier, win_rate
+    )
+    system = np.eye(len(balances)) - transitions
+    solution = np.linalg.solve(system, np.column_stack((to_target, to_stop, trades)))
+    p_target, p_stop, expected_trades = (float(v) for v in solution[balances.index(initial_capital)])
+    return Odds(
+        p_target, p_stop, max(0.0, 1 - p_target - p_stop), expected_trades, target, stop, tick, len(balances),
+        time.perf_counter() - started
+    )
+
+
+def format_odds(odds):
+    """One-line summary for the PARAMETER GRID panel."""
+    return (f"P(TARGET) {odds.p_target:.2%}   P(STOP) {odds.p_stop:.2%}   "
+            f"P(INSUFF) {odds.p_insufficient:.2%}   E[TRADES] {odds.expected_trades:.1f}")
+
+
+# (capital, growth %, stop %, multiplier, win rate): narrow cent grids and wide coarse grids
+CHECK_CASES = (
+    (50.0, 5.0, 5.0, 1.5, 0.5), (100.0, 10.0, 20.0, 2.0, 0.45),
+    (20000.0, 5.0, 5.0, 1.5, 0.55), (5000.0, 30.0, 30.0, 1.5, 0.55), (1000.0, 20.0, 10.0, 1.5, 0.48),
+)
+
+
+def check_against_simulator(cases=CHECK_CASES, sessions=20_000, tolerance=0.02, seed=1):
+    """Compares P(target) with a risk_simulator Monte Carlo run per case. Returns the mismatching rows.
+
+    Each row is (case, solved P(target), simulated P(target)); cases whose
+    simulation leaves sessions open are skipped since the two would not agree.
+    """
+    from risk_simulator import simulate_sessions
+    mismatches = []
+    for case in cases:
+        capital, growth, stop, multiplier, win_rate = case
+        odds = solve(capital, growth, stop, multiplier, win_rate)
+        simulated = simulate_sessions(capital, growth, stop, multiplier, win_rate, sessions=sessions,
+                                      max_trades=100_000, seed=seed)
+        if simulated['p_open'] == 0 and abs(odds.p_target - simulated['p_target']) > tolerance:
+            mismatches.append((case, odds.p_target, simulated['p_target']))
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact cycle odds for the trading manager rules.")
+    parser.add_argument('--capital', type=float, default=DEFAULT_INITIAL_CAPITAL)
+    parser.add_argument('--growth', type=float, default=DEFAULT_DAILY_GROWTH_TARGET, help="Daily growth target (%%)")
+    parser.add_argument('--stop', type=float, default=DEFAULT_STOP_LOSS_LIMIT, help="Stop loss limit (%%)")
+    parser.add_argument('--multiplier', type=float, default=DEFAULT_TRADE_MULTIPLIER)
+    parser.add_argument('--win-rate', type=float, default=0.5)
+    parser.add_argument('--check', action='store_true', help="Cross-check the solver against the Monte Carlo simulator")
+    args = parser.parse_args()
+    if args.check:
+        mismatches = check_against_simulator()
+        for case, solved, simulated in mismatches:
+            print(f"MISMATCH {case}: SOLVED {solved:.4f}  SIMULATED {simulated:.4f}")
+        print(f"{len(CHECK_CASES) - len(mismatches)}/{len(CHECK_CASES)} CASES AGREE")
+        raise SystemExit(1 if mismatches else 0)
+    odds = solve(args.capital, args.growth, args.stop, args.multiplier, args.win_rate)
+    print(format_odds(odds))
+    print(f"TARGET ${odds.target:.2f}  STOP ${odds.stop:.2f}  GRID {odds.states} x ${odds.tick:.2f}  "
+          f"SOLVED IN {odds.elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
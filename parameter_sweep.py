@@ -0,0 +1,171 @@
+"""Multi-core parameter sweep over growth target, stop loss, multiplier and win rate.
+
+Each grid cell is one Monte Carlo run of the session rules under one sizing
+policy (risk_simulator when NumPy is available, TradingEngine.replay
+otherwise). Cells are grouped into
+chunks and farmed out to a process pool; rows stream back as each chunk
+finishes, so results can be written while the sweep is still running and a
+cancel request stops it between chunks.
+
+    python parameter_sweep.py --growth 2:10:1 --stop 2:10:1 --multiplier 1.5,2,2.5 \\
+        --win-rate 0.45,0.5,0.55 --out sweep.csv
+"""
+import argparse
+import csv
+import itertools
+import math
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import risk_simulator
+import sizing
+from trading_engine import (
+    TradingEngine, TRADE_RECORDED, TARGET_HIT, STOP_HIT, STOP_BREACHED, INSUFFICIENT_BALANCE,
+    DEFAULT_INITIAL_CAPITAL, DEFAULT_DAILY_GROWTH_TARGET, DEFAULT_STOP_LOSS_LIMIT, DEFAULT_TRADE_MULTIPLIER
+)
+
+FIELDS = (
+    'daily_growth_target', 'stop_loss_limit', 'trade_multiplier', 'win_rate',
+    'p_target', 'p_stop', 'p_insufficient', 'p_open', 'expected_trades', 'mean_balance'
+)
+
+
+def parse_range(text):
+    """'5' -> [5.0]; '1.5,2,3' -> list; 'start:stop:step' -> inclusive arithmetic range."""
+    text = text.strip()
+    if ':' in text:
+        start, stop, step = (float(part) for part in text.split(':'))
+        if step <= 0: raise ValueError("Range step must be positive")
+        count = int(math.floor((stop - start) / step + 1e-9)) + 1
+        return [round(start + i * step, 10) for i in range(count)]
+    return [float(part) for part in text.split(',') if part.strip()]
+
+
+def build_grid(growth_targets, stop_limits, multipliers, win_rates):
+    """Cartesian product of the four axes as (growth, stop, multiplier, win_rate) tuples."""
+    return list(itertools.product(growth_targets, stop_limits, multipliers, win_rates))
+
+
+def _evaluate_scalar(cell, initial_capital, sessions, max_trades, seed, policy=None):
+    """Pure-Python fallback: drives TradingEngine itself, one cycle per session."""
+    growth, stop_limit, multiplier, win_rate = cell
+    rng = random.Random(seed)
+    counts = {TARGET_HIT: 0, STOP_HIT: 0, STOP_BREACHED: 0, INSUFFICIENT_BALANCE: 0, TRADE_RECORDED: 0}
+    trades = 0
+    balance_total = 0.0
+    draw = rng.random
+    for _ in range(sessions):
+        engine = TradingEngine(initial_capital, growth, stop_limit, multiplier, sizing=policy)
+        applied, event = engine.replay(draw() < win_rate for _ in range(max_trades))
+        counts[event] += 1
+        trades += applied
+        balance_total += engine.current_balance
+    return {
+        'p_target': counts[TARGET_HIT] / sessions,
+        'p_stop': (counts[STOP_HIT] + counts[STOP_BREACHED]) / sessions,
+        'p_insufficient': counts[INSUFFICIENT_BALANCE] / sessions,
+        'p_open': counts[TRADE_RECORDED] / sessions,
+        'expected_trades': trades / sessions, 'mean_balance': balance_total / sessions
+    }
+
+
+def evaluate_cell(cell, initial_capital=DEFAULT_INITIAL_CAPITAL, sessions=10_000, max_trades=10_000, seed=None,
+                  policy=None):
+    """One sweep row for a (growth, stop, multiplier, win_rate) cell under sizing `policy` (None = martingale)."""
+    growth, stop_limit, multiplier, win_rate = cell
+    if risk_simulator.np is not None:
+        stats = risk_simulator.simulate_sessions(
+            initial_capital, growth, stop_limit, multiplier, win_rate,
+            sessions=sessions, max_trades=max_trades, seed=seed, policy=policy
+        )
+    else:
+        stats = _evaluate_scalar(cell, initial_capital, sessions, max_trades, seed, policy)
+    row = dict(zip(FIELDS[:4], cell))
+    row.update((field, stats[field]) for field in FIELDS[4:])
+    return row
+
+
+def _evaluate_chunk(chunk, initial_capital, sessions, max_trades, seed, policy=None):
+    """Worker entry point: evaluates (index, cell) pairs, seeding each cell reproducibly."""
+    return [
+        evaluate_cell(cell, initial_capital, sessions, max_trades, None if seed is None else seed + index, policy)
+        for index, cell in chunk
+    ]
+
+
+def iter_sweep(cells, initial_capital=DEFAULT_INITIAL_CAPITAL, sessions=10_000, max_trades=10_000,
+               workers=None, chunk_size=None, cancel_event=None, seed=None, policy=None):
+    """Yields result rows as chunks finish (completion order, not grid order).
+
+    `cancel_event` (a threading.Event) stops the sweep between chunks; queued
+    chunks are dropped and the generator returns.
+    """
+    workers = workers or os.cpu_count() or 1
+    indexed = list(enumerate(cells))
+    if chunk_size is None:
+        chunk_size = max(1, len(indexed) // (workers * 8)) # ~8 chunks per worker balances uneven cells
+    chunks = [indexed[i:i + chunk_size] for i in range(0, len(indexed), chunk_size)]
+
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        pending = {
+            executor.submit(_evaluate_chunk, chunk, initial_capital, sessions, max_trades, seed, policy)
+            for chunk in chunks
+        }
+        while pending:
+            done, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+            if cancel_event is not None and cancel_event.is_set():
+                return
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_sweep_to_csv(path, cells, progress=None, **sweep_options):
+    """Streams sweep rows into a CSV as they arrive. Returns the number of rows written.
+
+    `progress(done, total)` is called after each row.
+    """
+    written = 0
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in iter_sweep(cells, **sweep_options):
+            writer.writerow(row)
+            written += 1
+            if written % 64 == 0:
+                f.flush()
+            if progress is not None:
+                progress(written, len(cells))
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel sweep of the trading manager parameter grid.")
+    parser.add_argument('--capital', type=float, default=DEFAULT_INITIAL_CAPITAL)
+    parser.add_argument('--growth', default=str(DEFAULT_DAILY_GROWTH_TARGET), help="Growth targets (%%): list or start:stop:step")
+    parser.add_argument('--stop', default=str(DEFAULT_STOP_LOSS_LIMIT), help="Stop loss limits (%%): list or start:stop:step")
+    parser.add_argument('--multiplier', default=str(DEFAULT_TRADE_MULTIPLIER), help="Loss multipliers: list or start:stop:step")
+    parser.add_argument('--win-rate', default='0.5', help="Win rates (0-1): list or start:stop:step")
+    parser.add_argument('--sessions', type=int, default=10_000, help="Monte Carlo sessions per cell")
+    parser.add_argument('--max-trades', type=int, default=10_000)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--policy', default=sizing.DEFAULT_POLICY, choices=sorted(sizing.POLICIES), help="Sizing policy")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--out', default='sweep.csv')
+    args = parser.parse_args()
+
+    cells = build_grid(parse_range(args.growth), parse_range(args.stop), parse_range(args.multiplier), parse_range(args.win_rate))
+    written = run_sweep_to_csv(
+        args.out, cells, progress=lambda done, total: print(f"\r{done}/{total} cells", end='', flush=True),
+        initial_capital=args.capital, sessions=args.sessions, max_trades=args.max_trades,
+        workers=args.workers, seed=args.seed, policy=sizing.make_policy(args.policy)
+    )
+    print(f"\n{written} rows written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Vectorized Monte Carlo risk-of-ruin simulator.
+
+Runs many independent trading cycles under the TradingEngine rules - fixed
+starting trade value, loss multiplier with a 1.0 floor, reset on a win, and the
+daily target / stop loss locks - for an assumed win rate, or under any other
+sizing policy. The session loop itself is sizing.simulate_paths(), shared with
+the policy comparison and the bootstrap; this module draws the outcomes and
+summarizes the results.
+
+Usable headlessly:
+
+    python risk_simulator.py --win-rate 0.55 --sessions 1000000
+"""
+import argparse
+import time
+
+try:
+    import numpy as np
+except ImportError: # Optional dependency, only the simulator needs it
+    np = None
+
+import sizing
+from sizing import OPEN, TARGET, STOP, INSUFFICIENT, session_levels # Re-exported: the simulator's outcome codes
+from trading_engine import (
+    DEFAULT_INITIAL_CAPITAL, DEFAULT_DAILY_GROWTH_TARGET, DEFAULT_STOP_LOSS_LIMIT,
+    DEFAULT_TRADE_MULTIPLIER, DEFAULT_STARTING_TRADE_VALUE
+)
+
+PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+
+
+def simulate_batch(rng, sessions, initial_capital, target, stop, trade_multiplier, win_rate,
+                   starting_trade_value, max_trades, policy=None):
+    """Simulates `sessions` cycles. Returns (outcome codes, final balances, trade counts) arrays.
+
+    Outcomes are drawn per step for the sessions still trading and run through
+    sizing.simulate_paths(); `policy` is a sizing.SizingPolicy, None = martingale.
+    """
+    outcome, final_balance, trades, _ = sizing.simulate_paths(
+        lambda step, ids: rng.random(ids.size) < win_rate, policy, initial_capital, target, stop,
+        starting_trade_value, trade_multiplier, paths=sessions, max_trades=max_trades, track_drawdown=False
+    )
+    return outcome, final_balance, trades
+
+
+def simulate_sessions(initial_capital=DEFAULT_INITIAL_CAPITAL, daily_growth_target=DEFAULT_DAILY_GROWTH_TARGET,
+                      stop_loss_limit=DEFAULT_STOP_LOSS_LIMIT, trade_multiplier=DEFAULT_TRADE_MULTIPLIER,
+                      win_rate=0.5, sessions=1_000_000, starting_trade_value=DEFAULT_STARTING_TRADE_VALUE,
+                      max_trades=10_000, batch_size=250_000, seed=None, bins=50, policy=None):
+    """Monte Carlo summary of one trading cycle under the current parameter grid.
+
+    `policy` is the sizing.SizingPolicy in force; None means martingale.
+
+    Returns a dict with p_target, p_stop, p_insufficient, p_open, expected_trades,
+    mean_balance, balance_percentiles, a balance histogram and the elapsed time.
+    """
+    if np is None:
+        raise RuntimeError("NumPy is required for the risk simulator (pip install numpy)")
+    if not 0 <= win_rate <= 1:
+        raise ValueError("Win rate must be between 0 and 1")
+    started = time.perf_counter()
+    target, stop = session_levels(initial_capital, daily_growth_target, stop_loss_limit)
+    rng = np.random.default_rng(seed)
+
+    outcomes, balances, trades = [], [], []
+    remaining = sessions
+    while remaining > 0:
+        n = min(batch_size, remaining)
+        o, b, t = simulate_batch(rng, n, initial_capital, target, stop, trade_multiplier, win_rate,
+                                 starting_trade_value, max_trades, policy)
+        outcomes.append(o)
+        balances.append(b)
+        trades.append(t)
+        remaining -= n
+    outcome = np.concatenate(outcomes)
+    balance = np.concatenate(balances)
+    trade_count = np.concatenate(trades)
+
+    counts = np.bincount(outcome, minlength=4)
+    histogram, edges = np.histogram(balance, bins=bins)
+    return {
+        'sessions': sessions, 'win_rate': win_rate, 'policy': 'martingale' if policy is None else policy.name, 'target': target, 'stop': stop,
+        'p_target': int(counts[TARGET]) / sessions, 'p_stop': int(counts[STOP]) / sessions,
+        'p_insufficient': int(counts[INSUFFICIENT]) / sessions, 'p_open': int(counts[OPEN]) / sessions,
+        'expected_trades': float(trade_count.mean()), 'mean_balance': float(balance.mean()),
+        'balance_percentiles': dict(zip(PERCENTILES, np.percentile(balance, PERCENTILES).tolist())),
+        'histogram': (histogram.tolist(), edges.tolist()),
+        'elapsed': time.perf_counter() - started
+    }
+
+
+def format_report(result):
+    """Plain-text summary used by the RISK ANALYTICS tab and the command line."""
+    p = result['balance_percentiles']
+    return (
+        f"SESSIONS: {result['sessions']:,}  WIN RATE: {result['win_rate']:.1%}  SIZING: {result['policy'].upper()}\n"
+        f"P(TARGET ${result['target']:.2f}): {result['p_target']:.2%}\n"
+        f"P(STOP ${result['stop']:.2f}): {result['p_stop']:.2%}\n"
+        f"P(INSUFFICIENT): {result['p_insufficient']:.2%}   P(OPEN): {result['p_open']:.2%}\n"
+        f"EXPECTED TRADES: {result['expected_trades']:.1f}   MEAN BALANCE: ${result['mean_balance']:.2f}\n"
+        f"BALANCE P5/P50/P95: ${p[5]:.2f} / ${p[50]:.2f} / ${p[95]:.2f}\n"
+        f"ELAPSED: {result['elapsed']:.2f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo risk-of-ruin for the trading manager rules.")
+    parser.add_argument('--capital', type=float, default=DEFAULT_INITIAL_CAPITAL)
+    parser.add_argument('--growth', type=float, default=DEFAULT_DAILY_GROWTH_TARGET, help="Daily growth target (%%)")
+    parser.add_argument('--stop', type=float, default=DEFAULT_STOP_LOSS_LIMIT, help="Stop loss limit (%%)")
+    parser.add_argument('--multiplier', type=float, default=DEFAULT_TRADE_MULTIPLIER)
+    parser.add_argument('--win-rate', type=float, default=0.5)
+    parser.add_argument('--sessions', type=int, default=1_000_000)
+    parser.add_argument('--max-trades', type=int, default=10_000)
+    parser.add_argument('--policy', default=sizing.DEFAULT_POLICY, choices=sorted(sizing.POLICIES), help="Sizing policy")
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+    result = simulate_sessions(
+        args.capital, args.growth, args.stop, args.multiplier, args.win_rate,
+        sessions=args.sessions, max_trades=args.max_trades, seed=args.seed, policy=sizing.make_policy(args.policy)
+    )
+    print(format_report(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Running session analytics with constant per-trade cost.
+
+SessionStats is fed one trade at a time (add) as trades are executed and keeps
+only running sums and extremes, so nothing ever rescans trades_history. After
+a load or an import it is rebuilt in a single pass over the history columns.
+"""
+from trade_history import WIN
+
+
+class SessionStats:
+    """Accumulators for win rate, streaks, drawdown, averages, expectancy and largest stake."""
+
+    __slots__ = ('start_balance', 'trades', 'wins', 'win_total', 'loss_total', 'streak',
+                 'max_win_streak', 'max_loss_streak', 'peak_balance', 'max_drawdown',
+                 'max_drawdown_pct', 'largest_stake')
+
+    def __init__(self, start_balance=0.0):
+        self.reset(start_balance)
+
+    def reset(self, start_balance):
+        """Starts a new cycle at `start_balance` (the drawdown peak starts there)."""
+        self.start_balance = start_balance
+        self.trades = 0
+        self.wins = 0
+        self.win_total = 0.0
+        self.loss_total = 0.0
+        self.streak = 0 # >0: consecutive wins, <0: consecutive losses
+        self.max_win_streak = 0
+        self.max_loss_streak = 0
+        self.peak_balance = start_balance
+        self.max_drawdown = 0.0
+        self.max_drawdown_pct = 0.0
+        self.largest_stake = 0.0
+
+    def add(self, code, amount, balance):
+        """Folds in one trade (type code, stake, balance after it). O(1)."""
+        self.trades += 1
+        if code == WIN:
+            self.wins += 1
+            self.win_total += amount
+            self.streak = self.streak + 1 if self.streak > 0 else 1
+            if self.streak > self.max_win_streak:
+                self.max_win_streak = self.streak
+        else:
+            self.loss_total += amount
+            self.streak = self.streak - 1 if self.streak < 0 else -1
+            if -self.streak > self.max_loss_streak:
+                self.max_loss_streak = -self.streak
+        if amount > self.largest_stake:
+            self.largest_stake = amount
+        if balance > self.peak_balance:
+            self.peak_balance = balance
+        else:
+            drawdown = self.peak_balance - balance
+            if drawdown > self.max_drawdown:
+                self.max_drawdown = drawdown
+                self.max_drawdown_pct = drawdown / self.peak_balance * 100 if self.peak_balance > 0 else 0.0
+
+    def add_last(self, history):
+        """Folds in the newest trade of a TradeHistory."""
+        self.add(history.types[-1], history.amounts[-1], history.balances[-1])
+
+    def extend(self, history, start=0):
+        """Folds in trades `start:` of a TradeHistory in one pass."""
+        add = self.add
+        for code, amount, balance in zip(history.types[start:], history.amounts[start:], history.balances[start:]):
+            add(code, amount, balance)
+
+    def rebuild(self, history, start_balance):
+        """Recomputes everything from a whole cycle's history."""
+        self.reset(start_balance)
+        self.extend(history)
+
+    # ===================================================================
+    # DERIVED
+    # ===================================================================
+
+    @property
+    def losses(self):
+        return self.trades - self.wins
+
+    @property
+    def win_rate(self):
+        return self.wins / self.trades if self.trades else 0.0
+
+    @property
+    def avg_win(self):
+        return self.win_total / self.wins if self.wins else 0.0
+
+    @property
+    def avg_loss(self):
+        return self.loss_total / self.losses if self.losses else 0.0
+
+    @property
+    def expectancy(self):
+        """Mean P&L per trade: P(win) * avg win - P(loss) * avg loss."""
+        return (self.win_total - self.loss_total) / self.trades if self.trades else 0.0
+
+
+def format_stats(stats):
+    """Multi-line summary for the RISK ANALYTICS tab."""
+    if stats.streak > 0:
+        streak = f"{stats.streak}W"
+    elif stats.streak < 0:
+        streak = f"{-stats.streak}L"
+    else:
+        streak = "-"
+    return (
+        f"TRADES {stats.trades:<7} WIN RATE {stats.win_rate:6.1%}   STREAK {streak:<5} "
+        f"MAX W/L {stats.max_win_streak}/{stats.max_loss_streak}\n"
+        f"PEAK ${stats.peak_balance:<10.2f} MAX DRAWDOWN ${stats.max_drawdown:.2f} ({stats.max_drawdown_pct:.1f}%)\n"
+        f"AVG WIN ${stats.avg_win:<8.2f} AVG LOSS ${stats.avg_loss:<8.2f} EXPECTANCY ${stats.expectancy:+.2f}\n"
+        f"LARGEST STAKE ${stats.largest_stake:.2f}"
+    )
@@ -0,0 +1,349 @@
+"""Position-sizing policies: how the next trade value follows from the last result.
+
+Each policy implements the same rule twice: step() for one trade, used by
+TradingEngine in the live app, and step_batch() over NumPy arrays, used to run
+thousands of outcome paths through every policy at once. Policies only hold
+their own parameters; the engine's starting trade value and loss multiplier
+are passed in, so changing those settings needs no new policy object.
+
+    martingale       loss: value x multiplier (1.0 floor); win: back to the starting value  (the original rule)
+    anti_martingale  win: value x multiplier, for up to `max_steps` wins; loss: back to the starting value
+    fixed_fractional `fraction` of the current balance
+    kelly_capped     Kelly fraction for an even-money bet at `win_rate`, capped at `cap` of the balance
+    fixed            always the starting value
+
+    python sizing.py --win-rate 0.55 --paths 20000 --trades 500
+"""
+import argparse
+import time
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError: # Optional dependency, only batch evaluation needs it
+    np = None
+
+DEFAULT_POLICY = 'martingale'
+MIN_FRACTIONAL_VALUE = 0.01
+
+# Path outcome codes (also risk_simulator's session outcome codes)
+OPEN = 0          # Still trading after max_trades
+TARGET = 1        # Daily target reached
+STOP = 2          # Stop loss reached
+INSUFFICIENT = 3  # Balance can no longer cover the next trade value
+
+
+def session_levels(initial_capital, daily_growth_target, stop_loss_limit):
+    """Target and stop for a cycle starting at `initial_capital` (calculate_daily_target / calculate_stop_loss)."""
+    target = initial_capital * (1 + daily_growth_target / 100)
+    stop = max(0.01, initial_capital * (1 - stop_loss_limit / 100))
+    return target, stop
+
+
+class SizingPolicy:
+    """Base class; subclasses set `name`, `defaults` and the three rules."""
+
+    name = None
+    defaults = {}
+
+    def __init__(self, **params):
+        unknown = set(params) - set(self.defaults)
+        if unknown:
+            raise ValueError(f"{self.name} has no parameter(s) {', '.join(sorted(unknown))}")
+        self.params = dict(self.defaults, **params)
+        self.validate()
+
+    def validate(self):
+        pass
+
+    def first(self, balance, start):
+        """Trade value at the start of a cycle."""
+        return start
+
+    def step(self, won, value, balance, start, multiplier):
+        """Value of the next trade after one result; `balance` is already updated."""
+        raise NotImplementedError
+
+    def step_batch(self, won, value, balance, start, multiplier):
+        """step() over arrays: `won` bool, `value` and `balance` float, one entry per path."""
+        raise NotImplementedError
+
+    def first_batch(self, balance, start):
+        return np.full(balance.shape, float(start))
+
+    def to_dict(self):
+        """{'name', params...}: the form stored in session settings."""
+        return dict(self.params, name=self.name)
+
+    def __eq__(self, other):
+        return isinstance(other, SizingPolicy) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        params = ', '.join(f"{key}={value!r}" for key, value in self.params.items())
+        return f"{type(self).__name__}({params})"
+
+
+class Martingale(SizingPolicy):
+    name = 'martingale'
+
+    def step(self, won, value, balance, start, multiplier):
+        return start if won else max(1.0, value * multiplier)
+
+    def step_batch(self, won, value, balance, start, multiplier):
+        return np.where(won, start, np.maximum(1.0, value * multiplier))
+
+
+class AntiMartingale(SizingPolicy):
+    name = 'anti_martingale'
+    defaults = {'max_steps': 3}
+
+    def validate(self):
+        if int(self.params['max_steps']) < 1: raise ValueError("max_steps must be at least 1")
+
+    def _ceiling(self, start, multiplier):
+        return start * multiplier ** int(self.params['max_steps']) * (1 + 1e-9)
+
+    def step(self, won, value, balance, start, multiplier):
+        if not won:
+            return start
+        value *= multiplier
+        return start if value > self._ceiling(start, multiplier) else value
+
+    def step_batch(self, won, value, balance, start, multiplier):
+        pressed = value * multiplier
+        return np.where(won & (pressed <= self._ceiling(start, multiplier)), pressed, start)
+
+
+class FixedFractional(SizingPolicy):
+    name = 'fixed_fractional'
+    defaults = {'fraction': 0.02}
+
+    def validate(self):
+        if not 0 < self.params['fraction'] <= 1: raise ValueError("fraction must be in (0, 1]")
+
+    def first(self, balance, start):
+        return max(MIN_FRACTIONAL_VALUE, balance * self.params['fraction'])
+
+    def step(self, won, value, balance, start, multiplier):
+        return max(MIN_FRACTIONAL_VALUE, balance * self.params['fraction'])
+
+    def first_batch(self, balance, start):
+        return np.maximum(MIN_FRACTIONAL_VALUE, balance * self.params['fraction'])
+
+    def step_batch(self, won, value, balance, start, multiplier):
+        return np.maximum(MIN_FRACTIONAL_VALUE, balance * self.params['fraction'])
+
+
+class KellyCapped(SizingPolicy):
+    """Even-money Kelly (2p - 1) at the assumed win rate, never above `cap`; the starting value without an edge."""
+
+    name = 'kelly_capped'
+    defaults = {'win_rate': 0.55, 'cap': 0.05}
+
+    def validate(self):
+        if not 0 <= self.params['win_rate'] <= 1: raise ValueError("win_rate must be between 0 and 1")
+        if not 0 < self.params['cap'] <= 1: raise ValueError("cap must be in (0, 1]")
+
+    @property
+    def fraction(self):
+        return min(self.params['cap'], max(0.0, 2 * self.params['win_rate'] - 1))
+
+    def first(self, balance, start):
+        fraction = self.fraction
+        return max(MIN_FRACTIONAL_VALUE, balance * fraction) if fraction else start
+
+    def step(self, won, value, balance, start, multiplier):
+        return self.first(balance, start)
+
+    def first_batch(self, balance, start):
+        fraction = self.fraction
+        if not fraction:
+            return np.full(balance.shape, float(start))
+        return np.maximum(MIN_FRACTIONAL_VALUE, balance * fraction)
+
+    def step_batch(self, won, value, balance, start, multiplier):
+        return self.first_batch(balance, start)
+
+
+class Fixed(SizingPolicy):
+    name = 'fixed'
+
+    def step(self, won, value, balance, start, multiplier):
+        return start
+
+    def step_batch(self, won, value, balance, start, multiplier):
+        return np.full(value.shape, float(start))
+
+
+POLICIES = {cls.name: cls for cls in (Martingale, AntiMartingale, FixedFractional, KellyCapped, Fixed)}
+
+
+def make_policy(name=DEFAULT_POLICY, **params):
+    try:
+        return POLICIES[name](**params)
+    except KeyError:
+        raise ValueError(f"Unknown sizing policy {name!r} (choose from {', '.join(POLICIES)})") from None
+
+
+def policy_from_dict(data):
+    """Inverse of SizingPolicy.to_dict(); None or {} gives the default policy."""
+    data = dict(data or {})
+    return make_policy(data.pop('name', DEFAULT_POLICY), **data)
+
+
+# ===================================================================
+# BATCH EVALUATION
+# ===================================================================
+
+def simulate_paths(outcomes, policy, initial_capital, target, stop, starting_trade_value, trade_multiplier,
+                   paths=None, max_trades=None, track_drawdown=True):
+    """Runs paths of WIN/LOSE outcomes as one cycle each under `policy` (None = martingale).
+
+    `outcomes` is a bool array (paths x trades; True = WIN), or a callable
+    draw(step, ids) returning the outcomes of the still-trading paths `ids` at
+    `step`, in which case `paths` and `max_trades` give the batch shape.
+    Same rules as TradingEngine.win()/loss(): refusals and target/stop end a
+    path. Finished paths are compacted out, so each step only touches paths
+    still trading. Returns (outcome codes, final balances, trade counts, max
+    drawdowns); drawdowns are None when `track_drawdown` is off.
+    """
+    if np is None:
+        raise RuntimeError("NumPy is required for batch sizing evaluation (pip install numpy)")
+    if callable(outcomes):
+        draw = outcomes
+    else:
+        outcomes = np.asarray(outcomes, dtype=bool)
+        paths, max_trades = outcomes.shape
+        draw = lambda step, ids: outcomes[ids, step]
+    policy = policy or Martingale()
+    outcome = np.full(paths, OPEN, dtype=np.int8)
+    final_balance = np.full(paths, float(initial_capital))
+    trades = np.full(paths, max_trades, dtype=np.int32)
+    drawdown = np.zeros(paths) if track_drawdown else None
+
+    ids = np.arange(paths)
+    balance = final_balance.copy()
+    value = policy.first_batch(balance, starting_trade_value)
+    peak = balance.copy() if track_drawdown else None
+    worst = drawdown.copy() if track_drawdown else None
+
+    def finish(done):
+        """Records the paths flagged in `done` and compacts them out."""
+        nonlocal ids, balance, value, peak, worst
+        final_balance[ids[done]] = balance[done]
+        if track_drawdown:
+            drawdown[ids[done]] = worst[done]
+        keep = ~done
+        ids, balance, value = ids[keep], balance[keep], value[keep]
+        if track_drawdown:
+            peak, worst = peak[keep], worst[keep]
+
+    for step in range(max_trades):
+        # check_can_trade(): refusals end the path without a trade
+        refused = balance < value
+        breached = balance <= stop
+        done = refused | breached
+        if done.any():
+            outcome[ids[refused]] = INSUFFICIENT
+            outcome[ids[breached & ~refused]] = STOP
+            trades[ids[done]] = step
+            finish(done)
+            if not ids.size:
+                break
+
+        win = draw(step, ids)
+        balance = np.where(win, balance + value, balance - value)
+        value = policy.step_batch(win, value, balance, starting_trade_value, trade_multiplier)
+        if track_drawdown:
+            np.maximum(peak, balance, out=peak)
+            np.maximum(worst, peak - balance, out=worst)
+
+        hit_target = win & (balance >= target)
+        hit_stop = ~win & (balance <= stop)
+        done = hit_target | hit_stop
+        if done.any():
+            outcome[ids[hit_target]] = TARGET
+            outcome[ids[hit_stop]] = STOP
+            trades[ids[done]] = step + 1
+            finish(done)
+            if not ids.size:
+                break
+    final_balance[ids] = balance
+    if track_drawdown:
+        drawdown[ids] = worst
+    return outcome, final_balance, trades, drawdown
+
+
+def summarize(outcome, final_balance, trades, drawdown):
+    """The simulate_paths() arrays reduced to the probabilities and means the reports show."""
+    paths = len(outcome)
+    counts = np.bincount(outcome, minlength=4)
+    return {
+        'paths': paths, 'p_target': int(counts[TARGET]) / paths, 'p_stop': int(counts[STOP]) / paths,
+        'p_insufficient': int(counts[INSUFFICIENT]) / paths, 'p_open': int(counts[OPEN]) / paths,
+        'expected_trades': float(trades.mean()), 'mean_balance': float(final_balance.mean()),
+        'mean_drawdown': float(drawdown.mean())
+    }
+
+
+def compare_policies(outcomes, policies, initial_capital, daily_growth_target, stop_loss_limit,
+                     trade_multiplier, starting_trade_value):
+    """{policy name: summarize()} for the same outcome paths under each policy."""
+    target, stop = session_levels(initial_capital, daily_growth_target, stop_loss_limit)
+    return {
+        policy.name: summarize(*simulate_paths(outcomes, policy, initial_capital, target, stop,
+                                               starting_trade_value, trade_multiplier))
+        for policy in policies
+    }
+
+
+@lru_cache(maxsize=256)
+def estimate_odds(policy_items, initial_capital, daily_growth_target, stop_loss_limit, trade_multiplier,
+                  starting_trade_value, win_rate, paths=4000, trades=400):
+    """summarize() over a fixed-seed synthetic batch, memoized on the settings.
+
+    `policy_items` is tuple(sorted(policy.to_dict().items())) so the key is hashable. Quick
+    enough to refresh as settings are typed; the exact solver covers martingale and fixed sizing.
+    """
+    policy = policy_from_dict(dict(policy_items))
+    outcomes = synthetic_paths(paths, trades, win_rate, seed=0)
+    return compare_policies(outcomes, [policy], initial_capital, daily_growth_target, stop_loss_limit,
+                            trade_multiplier, starting_trade_value)[policy.name]
+
+
+def synthetic_paths(paths, trades, win_rate, seed=None):
+    """Independent WIN/LOSE paths at a fixed win rate."""
+    if np is None:
+        raise RuntimeError("NumPy is required for batch sizing evaluation (pip install numpy)")
+    return np.random.default_rng(seed).random((paths, trades)) < win_rate
+
+
+def main():
+    from trading_engine import (
+        DEFAULT_INITIAL_CAPITAL, DEFAULT_DAILY_GROWTH_TARGET, DEFAULT_STOP_LOSS_LIMIT,
+        DEFAULT_TRADE_MULTIPLIER, DEFAULT_STARTING_TRADE_VALUE
+    )
+    parser = argparse.ArgumentParser(description="Compare sizing policies over the same outcome paths.")
+    parser.add_argument('--capital', type=float, default=DEFAULT_INITIAL_CAPITAL)
+    parser.add_argument('--growth', type=float, default=DEFAULT_DAILY_GROWTH_TARGET, help="Daily growth target (%%)")
+    parser.add_argument('--stop', type=float, default=DEFAULT_STOP_LOSS_LIMIT, help="Stop loss limit (%%)")
+    parser.add_argument('--multiplier', type=float, default=DEFAULT_TRADE_MULTIPLIER)
+    parser.add_argument('--win-rate', type=float, default=0.5)
+    parser.add_argument('--paths', type=int, default=20000)
+    parser.add_argument('--trades', type=int, default=500, help="Trades per path")
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+    started = time.perf_counter()
+    outcomes = synthetic_paths(args.paths, args.trades, args.win_rate, args.seed)
+    results = compare_policies(outcomes, [cls() for cls in POLICIES.values()], args.capital, args.growth, args.stop,
+                               args.multiplier, DEFAULT_STARTING_TRADE_VALUE)
+    print(f"{'POLICY':<18}{'P(TARGET)':>10}{'P(STOP)':>10}{'P(INSUFF)':>10}{'P(OPEN)':>9}{'E[TRADES]':>11}"
+          f"{'MEAN BAL':>11}{'MEAN DD':>9}")
+    for name, r in results.items():
+        print(f"{name:<18}{r['p_target']:>10.2%}{r['p_stop']:>10.2%}{r['p_insufficient']:>10.2%}{r['p_open']:>9.2%}"
+              f"{r['expected_trades']:>11.1f}{r['mean_balance']:>11.2f}{r['mean_drawdown']:>9.2f}")
+    print(f"ELAPSED: {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import pytest
+
+from history_store import HistoryStore
+from trade_history import WIN, LOSE
+from trading_engine import TradingEngine
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.db'))
+    yield store
+    store.close()
+
+
+def archive_cycle(store, day, start_balance, trades):
+    """Archives one cycle of (code, amount) trades starting at `start_balance` on `day`."""
+    engine = TradingEngine(start_balance)
+    engine.session_date = day
+    store.begin_session(engine)
+    balance = start_balance
+    for code, amount in trades:
+        balance += amount if code == WIN else -amount
+        store.record(code, amount, balance, 0)
+    store.flush()
+
+
+def test_daily_pnl(store):
+    archive_cycle(store, '2026-10-01', 100.0, [(WIN, 1.0), (LOSE, 1.0), (LOSE, 1.5), (WIN, 2.25)])
+    archive_cycle(store, '2026-10-01', 100.75, [(LOSE, 1.0)])
+    archive_cycle(store, '2026-10-02', 99.75, [(WIN, 1.0), (WIN, 1.0)])
+    assert store.daily_pnl() == [('2026-10-01', 5, 2, -0.25), ('2026-10-02', 2, 2, 2.0)]
+    assert store.daily_pnl('2026-10-02', '2026-10-31') == [('2026-10-02', 2, 2, 2.0)]
+
+
+def test_max_drawdown(store):
+    # Cycle 1: 100 -> 101, 100, 98.5, 100.75 (peak 101, trough 98.5); cycle 2: 100.75 -> 99.75, 98.75, 102
+    archive_cycle(store, '2026-10-01', 100.0, [(WIN, 1.0), (LOSE, 1.0), (LOSE, 1.5), (WIN, 2.25)])
+    archive_cycle(store, '2026-10-02', 100.75, [(LOSE, 1.0), (LOSE, 1.0), (WIN, 3.25)])
+    assert store.max_drawdown() == pytest.approx(2.5)
+    assert store.max_drawdown('2026-10-02', '2026-10-02') == pytest.approx(2.0) # From the start balance
+    assert store.max_drawdown('2026-11-01', '2026-11-30') == 0.0
+
+
+def test_max_drawdown_does_not_span_cycles(store):
+    archive_cycle(store, '2026-10-01', 100.0, [(WIN, 5.0), (WIN, 5.0)])
+    archive_cycle(store, '2026-10-01', 50.0, [(LOSE, 1.0), (WIN, 1.0)]) # Reset to a lower capital
+    assert store.max_drawdown() == pytest.approx(1.0)
+
+
+def test_aggregates_by_account(tmp_path):
+    path = str(tmp_path / 'history.db')
+    main, side = HistoryStore(path), HistoryStore(path, account='SIDE')
+    archive_cycle(main, '2026-10-01', 100.0, [(WIN, 1.0)])
+    archive_cycle(side, '2026-10-01', 10.0, [(LOSE, 3.0)])
+    assert main.daily_pnl(account='SIDE') == [('2026-10-01', 1, 0, -3.0)]
+    assert main.daily_pnl() == [('2026-10-01', 2, 1, -2.0)]
+    main.close()
+    side.close()
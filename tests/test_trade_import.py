@@ -0,0 +1,63 @@
+import pytest
+
+import trade_import
+from trading_engine import TradingEngine, TRADE_RECORDED, TARGET_HIT, STOP_BREACHED, INSUFFICIENT_BALANCE
+
+
+def test_parse_type():
+    assert trade_import.parse_type(' gain ') is True
+    assert trade_import.parse_type('L') is False
+    with pytest.raises(ValueError):
+        trade_import.parse_type('DRAW')
+
+
+def test_applies_rows_in_order():
+    engine = TradingEngine(100.0, 50.0, 50.0, 2.0)
+    report = trade_import.import_trades(engine, [(False, 1.0, 10), (False, 2.0, 20), (True, 4.0, 30)])
+    assert report == {'rows_applied': 3, 'last_event': TRADE_RECORDED, 'locked_at_row': None, 'size_mismatches': 0}
+    assert list(engine.trades_history.timestamps) == [10, 20, 30]
+
+
+def test_stops_at_the_row_that_locks():
+    engine = TradingEngine(50.0, 5.0, 5.0)
+    rows = [(True, None, 0)] * 5
+    report = trade_import.import_trades(engine, rows)
+    assert report['rows_applied'] == 3
+    assert report['last_event'] == TARGET_HIT
+    assert report['locked_at_row'] == 3
+    assert len(engine.trades_history) == 3
+
+
+def test_refused_row_is_not_applied():
+    engine = TradingEngine(2.0, 500.0, 99.0, 2.0)
+    report = trade_import.import_trades(engine, [(False, None, 0), (False, None, 0)])
+    assert report['rows_applied'] == 1
+    assert report['last_event'] == INSUFFICIENT_BALANCE
+    assert report['locked_at_row'] == 2
+
+
+def test_locked_session_refuses_import():
+    engine = TradingEngine(50.0, 5.0, 5.0, 1.5)
+    engine.current_balance = engine.calculate_stop_loss()
+    report = trade_import.import_trades(engine, [(True, None, 0)])
+    assert report['rows_applied'] == 0
+    assert report['last_event'] == STOP_BREACHED
+    assert engine.locked
+
+
+def test_counts_size_mismatches():
+    engine = TradingEngine(100.0, 50.0, 50.0, 2.0)
+    report = trade_import.import_trades(engine, [(False, 1.0, 0), (True, 3.0, 0), (True, 1.004, 0)])
+    assert report['size_mismatches'] == 1
+
+
+def test_reads_csv_and_jsonl(tmp_path):
+    csv_path = tmp_path / 'fills.csv'
+    csv_path.write_text("Type,Amount,Timestamp\nWIN,1,100\nloss,,2026-10-01T12:00:00\n")
+    rows = list(trade_import.read_trades(str(csv_path)))
+    assert rows[0] == (True, 1.0, 100)
+    assert rows[1][:2] == (False, None)
+
+    jsonl_path = tmp_path / 'fills.jsonl'
+    jsonl_path.write_text('{"type": "W", "amount": 2, "timestamp": 5}\n\n{"type": "L", "timestamp": 6}\n')
+    assert list(trade_import.read_trades(str(jsonl_path))) == [(True, 2.0, 5), (False, None, 6)]
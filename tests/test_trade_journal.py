@@ -0,0 +1,147 @@
+import json
+import os
+
+import binary_session
+from trade_journal import TradeJournal
+from trading_engine import TradingEngine, TRADE_APPLIED
+
+STAMP = 1_700_000_000
+
+
+def make_journal(tmp_path, suffix='.json'):
+    return TradeJournal(str(tmp_path / ('session' + suffix)), str(tmp_path / 'journal.jsonl'), fsync_every=1)
+
+
+def trade(engine, journal, outcome):
+    """What the window does per click: apply, then journal the new row."""
+    assert (engine.win if outcome else engine.loss)(STAMP) in TRADE_APPLIED
+    history = engine.trades_history
+    journal.append(history.record(len(history) - 1), engine.current_trade_value)
+
+
+def new_engine():
+    return TradingEngine(1000.0, 20.0, 20.0)
+
+
+def recovered(tmp_path, suffix='.json'):
+    """A restarted process: default settings until the snapshot or a state record says otherwise."""
+    engine = new_engine()
+    journal = make_journal(tmp_path, suffix)
+    assert journal.load(engine)
+    journal.close()
+    return engine
+
+
+def test_recovers_journal_without_snapshot(tmp_path):
+    engine, journal = new_engine(), make_journal(tmp_path)
+    journal.load(engine)
+    for outcome in (True, False, False, True):
+        trade(engine, journal, outcome)
+    journal.close() # No checkpoint: the "process" dies here
+    assert recovered(tmp_path).to_session_dict() == engine.to_session_dict()
+
+
+def test_kill_between_rotate_and_snapshot(tmp_path):
+    engine, journal = new_engine(), make_journal(tmp_path)
+    journal.load(engine)
+    for outcome in (False, False, True):
+        trade(engine, journal, outcome)
+    journal.rotate(len(engine.trades_history)) # Snapshot captured, never written
+    trade(engine, journal, False)
+    journal.close()
+    assert os.path.exists(journal.prev_path)
+    assert not os.path.exists(journal.snapshot_path)
+
+    assert recovered(tmp_path).to_session_dict() == engine.to_session_dict()
+    assert not os.path.exists(journal.prev_path) # Folded into a fresh snapshot on load
+
+
+def test_second_rotation_keeps_unwritten_generation(tmp_path):
+    engine, journal = new_engine(), make_journal(tmp_path)
+    journal.load(engine)
+    trade(engine, journal, False)
+    journal.compact(engine.to_session_dict())
+    trade(engine, journal, True)
+    journal.rotate(len(engine.trades_history))
+    trade(engine, journal, False)
+    journal.rotate(len(engine.trades_history)) # The first pending snapshot still never landed
+    trade(engine, journal, False)
+    journal.close()
+    assert recovered(tmp_path).to_session_dict() == engine.to_session_dict()
+
+
+def test_torn_tail_is_dropped(tmp_path):
+    engine, journal = new_engine(), make_journal(tmp_path)
+    journal.load(engine)
+    trade(engine, journal, True)
+    expected = engine.to_session_dict()
+    journal.close()
+    with open(journal.journal_path, 'a') as f:
+        f.write('{"type":"LOSE","amou') # Crash mid-write
+    assert recovered(tmp_path).to_session_dict() == expected
+
+
+def test_state_record_clears_history(tmp_path):
+    engine, journal = new_engine(), make_journal(tmp_path)
+    journal.load(engine)
+    trade(engine, journal, True)
+    engine.new_day()
+    journal.append_state(engine.to_state_dict(), clear_history=True)
+    trade(engine, journal, False)
+    journal.close()
+    restored = recovered(tmp_path)
+    assert len(restored.trades_history) == 1
+    assert restored.to_session_dict() == engine.to_session_dict()
+
+
+def test_batch_record(tmp_path):
+    engine, journal = new_engine(), make_journal(tmp_path)
+    journal.load(engine)
+    engine.replay([False, True, False], timestamp=STAMP)
+    history = engine.trades_history
+    journal.append_batch([history.record(i) for i in range(len(history))], engine.to_state_dict())
+    journal.close()
+    assert recovered(tmp_path).to_session_dict() == engine.to_session_dict()
+
+
+def test_unreadable_snapshot_is_quarantined(tmp_path):
+    journal = make_journal(tmp_path)
+    with open(journal.snapshot_path, 'w') as f:
+        f.write('{not json')
+    try:
+        journal.load(TradingEngine())
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a corrupt snapshot must not load")
+    assert os.path.exists(journal.snapshot_path + '.corrupt')
+    assert not os.path.exists(journal.snapshot_path)
+
+
+def test_binary_snapshot_round_trip(tmp_path):
+    engine, journal = TradingEngine(500.0, 10.0, 10.0, 2.0), make_journal(tmp_path, binary_session.BINARY_SUFFIX)
+    journal.load(engine)
+    for outcome in (False, True, False, False, True):
+        trade(engine, journal, outcome)
+    journal.compact(engine.to_session_dict())
+    trade(engine, journal, True) # One trade past the snapshot, in the journal only
+    journal.close()
+
+    restored = recovered(tmp_path, binary_session.BINARY_SUFFIX)
+    assert restored.to_session_dict() == engine.to_session_dict()
+    with binary_session.BinarySession(journal.snapshot_path) as session:
+        assert len(session) == 5
+        assert session.header['journal_generation'] == journal.generation
+
+
+def test_binary_json_conversion(tmp_path):
+    engine = TradingEngine()
+    engine.replay([True, False, False, True], timestamp=STAMP)
+    json_path, binary_path = str(tmp_path / 'a.json'), str(tmp_path / 'a.tmsb')
+    with open(json_path, 'w') as f:
+        json.dump(engine.to_session_dict(), f)
+    binary_session.json_to_binary(json_path, binary_path)
+    os.remove(json_path)
+    binary_session.binary_to_json(binary_path, json_path)
+    with open(json_path) as f:
+        assert json.load(f) == engine.to_session_dict()
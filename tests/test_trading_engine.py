@@ -0,0 +1,109 @@
+import random
+
+import pytest
+
+from trading_engine import (
+    TradingEngine, TRADE_RECORDED, TARGET_HIT, STOP_HIT, STOP_BREACHED, INSUFFICIENT_BALANCE, TRADING_LOCKED
+)
+
+
+def baseline_levels(daily_start_balance, growth, stop_loss):
+    """calculate_daily_target() / calculate_stop_loss() of the original Tk window."""
+    return daily_start_balance * (1 + growth / 100), max(0.01, daily_start_balance * (1 - stop_loss / 100))
+
+
+def baseline_session(outcomes, capital, growth, stop_loss, multiplier, start_value=1.0):
+    """The original execute_win() / execute_loss() / check_can_trade() rules. Returns (balances, amounts, event)."""
+    target, stop = baseline_levels(capital, growth, stop_loss)
+    balance, value = capital, start_value
+    balances, amounts = [], []
+    for outcome in outcomes:
+        if balance < value:
+            return balances, amounts, INSUFFICIENT_BALANCE
+        if balance <= stop:
+            return balances, amounts, STOP_BREACHED
+        amounts.append(value)
+        if outcome:
+            balance += value
+            value = start_value
+        else:
+            balance -= value
+            value = max(1.0, value * multiplier)
+        balances.append(balance)
+        if balance >= target:
+            return balances, amounts, TARGET_HIT
+        if balance <= stop:
+            return balances, amounts, STOP_HIT
+    return balances, amounts, TRADE_RECORDED
+
+
+@pytest.mark.parametrize('capital, growth, stop_loss', [(50.0, 5.0, 5.0), (1000.0, 20.0, 10.0), (0.5, 5.0, 99.9)])
+def test_levels_match_baseline(capital, growth, stop_loss):
+    engine = TradingEngine(capital, growth, stop_loss)
+    target, stop = baseline_levels(capital, growth, stop_loss)
+    assert engine.calculate_daily_target() == target
+    assert engine.calculate_stop_loss() == stop
+
+
+def test_martingale_sizing():
+    engine = TradingEngine(100.0, 50.0, 50.0, trade_multiplier=2.0)
+    engine.loss()
+    engine.loss()
+    assert engine.current_trade_value == 4.0
+    engine.win()
+    assert engine.current_trade_value == 1.0
+    assert list(engine.trades_history.amounts) == [1.0, 2.0, 4.0]
+    assert engine.current_balance == 101.0
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_random_sessions_match_baseline(seed):
+    rng = random.Random(seed)
+    capital = rng.choice((20.0, 50.0, 500.0))
+    growth, stop_loss, multiplier = rng.choice((2.0, 5.0, 10.0)), rng.choice((5.0, 10.0, 30.0)), rng.choice((1.5, 2.0))
+    outcomes = [rng.random() < 0.5 for _ in range(500)]
+    balances, amounts, event = baseline_session(outcomes, capital, growth, stop_loss, multiplier)
+
+    engine = TradingEngine(capital, growth, stop_loss, multiplier)
+    last = TRADE_RECORDED
+    for outcome in outcomes:
+        last = engine.win() if outcome else engine.loss()
+        if last != TRADE_RECORDED:
+            break
+    assert last == event
+    assert list(engine.trades_history.balances) == balances
+    assert list(engine.trades_history.amounts) == amounts
+
+    replayed = TradingEngine(capital, growth, stop_loss, multiplier)
+    applied, replay_event = replayed.replay(outcomes)
+    assert (applied, replay_event) == (len(balances), event)
+    assert list(replayed.trades_history.balances) == balances
+
+
+def test_locked_session_refuses_trades():
+    engine = TradingEngine(50.0, 5.0, 5.0)
+    while engine.win() == TRADE_RECORDED:
+        pass
+    assert engine.locked
+    assert engine.win() == TRADING_LOCKED
+    assert engine.loss() == TRADING_LOCKED
+    assert engine.replay([True]) == (0, TRADING_LOCKED)
+    engine.new_day()
+    assert engine.win() == TRADE_RECORDED
+
+
+def test_explicit_timestamps_are_kept():
+    engine = TradingEngine()
+    engine.win(timestamp=0)
+    engine.replay([False, True], timestamps=[10, 20])
+    engine.replay([True], timestamp=30)
+    assert list(engine.trades_history.timestamps) == [0, 10, 20, 30]
+
+
+def test_state_dict_round_trip():
+    engine = TradingEngine(200.0, 10.0, 20.0, 2.0)
+    engine.replay([False, False, True, False], timestamp=1_700_000_000)
+    restored = TradingEngine()
+    restored.load_session_dict(engine.to_session_dict())
+    assert restored.to_session_dict() == engine.to_session_dict()
+    assert restored.calculate_daily_target() == engine.calculate_daily_target()
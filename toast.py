@@ -0,0 +1,59 @@
+"""Non-modal toast notifications.
+
+Toasts are plain labels placed over the bottom-right corner of the main
+window. They never grab input or start a nested event loop, so rapid trade
+entry keeps flowing while they are shown. A toast repeating the newest one
+bumps a counter instead of stacking, which keeps bursts of refused trades to a
+single line.
+"""
+import tkinter as tk
+
+LEVELS = ('info', 'success', 'warning', 'error')
+
+
+class ToastManager:
+    """Stack of self-dismissing labels anchored to the bottom-right of `root`."""
+
+    def __init__(self, root, colors, font=('Consolas', 10, 'bold'), max_visible=4, duration_ms=4000):
+        """`colors` maps each of LEVELS to a foreground colour, plus 'bg'."""
+        self.root = root
+        self.colors = colors
+        self.font = font
+        self.max_visible = max_visible
+        self.duration_ms = duration_ms
+        self._toasts = [] # [label, text, repeats, after id], newest last
+
+    def show(self, text, level='info', duration_ms=None):
+        if self._toasts and self._toasts[-1][1] == text:
+            toast = self._toasts[-1]
+            toast[2] += 1
+            toast[0].config(text=f"{text}  ×{toast[2]}")
+            self.root.after_cancel(toast[3])
+            toast[3] = self.root.after(duration_ms or self.duration_ms, self._dismiss, toast)
+            return
+        label = tk.Label(
+            self.root, text=text, fg=self.colors[level], bg=self.colors['bg'], font=self.font, justify='left',
+            wraplength=420, padx=12, pady=8, relief=tk.SOLID, bd=1, highlightthickness=0
+        )
+        label.bind('<Button-1>', lambda e: self._dismiss(toast))
+        toast = [label, text, 1, None]
+        toast[3] = self.root.after(duration_ms or self.duration_ms, self._dismiss, toast)
+        self._toasts.append(toast)
+        while len(self._toasts) > self.max_visible:
+            self._dismiss(self._toasts[0])
+        self._layout()
+
+    def _dismiss(self, toast):
+        if toast not in self._toasts:
+            return
+        self._toasts.remove(toast)
+        self.root.after_cancel(toast[3])
+        toast[0].destroy()
+        self._layout()
+
+    def _layout(self):
+        y = -20
+        for label, *_ in reversed(self._toasts):
+            label.place(relx=1.0, rely=1.0, x=-20, y=y, anchor='se')
+            label.lift()
+            y -= label.winfo_reqheight() + 6
@@ -0,0 +1,432 @@
+"""Streaming export of trade history to CSV, JSONL or a compact columnar file.
+
+Trades flow through a generator pipeline as (epoch, type code, amount,
+balance) tuples:
+
+    source -> filter_trades(date range, type, amount) -> writer
+
+Sources never materialize the history: the live TradeHistory is read by index,
+a binary snapshot through its memory map, a JSON snapshot by decoding one
+trades_history element at a time, journals line by line and the multi-day
+archive through an SQLite cursor with the filters pushed into the query.
+Writers use large buffered files, so exports of any size run in constant
+memory.
+
+The columnar format (.tmcx) stores row groups of ROW_GROUP trades, each column
+as one zlib-compressed block (timestamps delta-encoded, types one byte each),
+followed by a JSON footer indexing the groups:
+
+    magic 'TMCX' | version H | reserved H | row groups ... | footer JSON | footer_len Q | magic 'TMCX'
+
+    python trade_export.py trades.csv --from 2026-10-01 --to 2026-10-31 --type WIN
+    python trade_export.py archive.tmcx --source archive --account MAIN --min-amount 5
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import re
+import sqlite3
+import struct
+import time
+import zlib
+from array import array
+from datetime import date, timedelta
+
+import binary_session
+from history_store import HISTORY_DB
+from trade_history import TYPE_CODES, TYPE_NAMES, parse_timestamp
+from trade_journal import JOURNAL_FILE, SESSION_FILE
+
+WRITE_BUFFER = 1 << 20
+READ_CHUNK = 1 << 16 # Characters read per step when scanning a JSON snapshot
+ROW_GROUP = 32768 # Trades per columnar row group
+READ_ROWS = 8192 # Trades copied out of a binary snapshot per step
+COLUMNAR_MAGIC = b'TMCX'
+COLUMNAR_VERSION = 1
+COLUMNAR_PREFIX = struct.Struct('<4sHH')
+COLUMNAR_TRAILER = struct.Struct('<Q4s')
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.tmcx': 'columnar'}
+FIELDS = ('timestamp', 'type', 'amount', 'balance')
+_SKIP = re.compile(r'[\s,]*') # Between trades_history elements
+_SESSION_DATE = re.compile(r'"session_date"\s*:\s*"([^"]*)"')
+_JOURNAL_GENERATION = re.compile(r'"journal_generation"\s*:\s*(\d+)')
+
+
+# ===================================================================
+# SOURCES: each yields (epoch, type code, amount, balance)
+# ===================================================================
+
+def live_trades(history, count=None):
+    """The first `count` trades of a TradeHistory (default: its length at this call), read by index.
+
+    Not a generator itself, so the bound is fixed by the caller's thread even
+    when the rows are consumed later on a worker while trades keep arriving.
+    """
+    count = len(history.types) if count is None else count
+    return _live_rows(history, count)
+
+
+def _live_rows(history, count):
+    timestamps, types, amounts, balances = history.timestamps, history.types, history.amounts, history.balances
+    for i in range(count):
+        yield timestamps[i], types[i], amounts[i], balances[i]
+
+
+def _binary_trades(path, header):
+    with binary_session.BinarySession(path) as session:
+        header.update(session.header)
+        for start in range(0, session.count, READ_ROWS):
+            stop = start + READ_ROWS
+            # tolist() copies one chunk, so no view outlives the mmap
+            columns = [session.column(name, start, stop).tolist() for name in ('timestamps', 'types', 'amounts', 'balances')]
+            yield from zip(*columns)
+
+
+def _scan_value(path, pattern):
+    """First match of `pattern`'s group 1 anywhere in a JSON snapshot, read in chunks; None if absent."""
+    overlap = 64 # Longer than any top-level key/value matched here, so a match split across chunks is still seen
+    with open(path, 'r') as f:
+        tail = ''
+        while True:
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                return None
+            window = tail + chunk
+            found = pattern.search(window)
+            if found:
+                return found.group(1)
+            tail = window[-overlap:]
+
+
+def _json_trades(path, header):
+    """Decodes trades_history one element at a time; everything else in the file fills `header`."""
+    decoder = json.JSONDecoder()
+    key = '"trades_history"'
+    with open(path, 'r') as f:
+        buffer = ''
+        while key not in buffer:
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                header.update(json.loads(buffer))
+                return
+            buffer += chunk
+        head, _, buffer = buffer.partition(key)
+        prefix = head + key
+        found = _SESSION_DATE.search(prefix)
+        # Older save_session() wrote session_date after the trades: H:M:S stamps need it before the first one
+        session_date = found.group(1) if found else _scan_value(path, _SESSION_DATE)
+        pos = 0
+        opened = False
+        while True:
+            pos = _SKIP.match(buffer, pos).end()
+            if pos < len(buffer):
+                if not opened: # Expecting ':' then '['
+                    if buffer[pos] not in ':[':
+                        raise ValueError(f"{path}: trades_history is not a list")
+                    opened = buffer[pos] == '['
+                    pos += 1
+                    continue
+                if buffer[pos] == ']':
+                    break
+                try:
+                    trade, pos = decoder.raw_decode(buffer, pos)
+                except ValueError:
+                    pass # Element cut by the chunk boundary: read more below
+                else:
+                    yield (parse_timestamp(trade['timestamp'], session_date), TYPE_CODES[trade['type']],
+                           trade['amount'], trade['balance'])
+                    continue
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                raise ValueError(f"{path}: truncated trades_history")
+            buffer = buffer[pos:] + chunk
+            pos = 0
+        header.update(json.loads(prefix + ':[]' + buffer[pos + 1:] + f.read()))
+
+
+def _journal_header(f):
+    """Generation from a journal's first line, or None if it is unreadable."""
+    try:
+        return json.loads(f.readline()).get('generation', -1)
+    except ValueError:
+        return None
+
+
+def _records_to_skip(path):
+    """(generation, records up to and including the last clear_history state record), or None without one."""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        generation = _journal_header(f)
+        if generation is None:
+            return None
+        last_clear = None
+        for index, line in enumerate(f):
+            if not line.endswith(b'\n'):
+                break
+            if b'"op":"state"' in line and json.loads(line).get('clear_history'):
+                last_clear = index + 1
+    return None if last_clear is None else (generation, last_clear)
+
+
+def _journal_trades(path, snapshot_generation, skip=0):
+    """Trades journaled in `path` after its first `skip` records."""
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb') as f:
+        generation = _journal_header(f)
+        if generation is None or generation < snapshot_generation:
+            return # Unreadable, or stale: already folded into the snapshot
+        for index, line in enumerate(f):
+            if not line.endswith(b'\n'):
+                break # Torn tail of a crashed session
+            if index < skip:
+                continue
+            record = json.loads(line)
+            op = record.get('op')
+            if op is None:
+                yield parse_timestamp(record['timestamp']), TYPE_CODES[record['type']], record['amount'], record['balance']
+            elif op == 'batch': # Imported fills
+                for trade in record['trades']:
+                    yield parse_timestamp(trade['timestamp']), TYPE_CODES[trade['type']], trade['amount'], trade['balance']
+
+
+def _snapshot_generation(path):
+    if not os.path.exists(path):
+        return 0
+    if binary_session.is_binary_path(path):
+        with binary_session.BinarySession(path) as session:
+            return session.header.get('journal_generation', 0)
+    found = _scan_value(path, _JOURNAL_GENERATION)
+    return int(found) if found else 0
+
+
+def saved_trades(snapshot_path=SESSION_FILE, journal_path=JOURNAL_FILE):
+    """Trades of a saved session: the snapshot (JSON or .tmsb), then any journaled trades not yet in it.
+
+    As in TradeJournal recovery, a journaled new cycle / reset (a state record
+    with clear_history) drops everything before it: the snapshot and any
+    earlier journal records are then skipped.
+    """
+    journals = (journal_path + '.prev', journal_path) if journal_path else ()
+    cleared = {path: _records_to_skip(path) for path in journals}
+    if any(cleared.values()):
+        generation = _snapshot_generation(snapshot_path)
+        live = [path for path in journals if cleared[path] and cleared[path][0] >= generation]
+        if live: # The last clear wins: start right after it
+            start = journals.index(live[-1])
+            for index, path in enumerate(journals[start:]):
+                yield from _journal_trades(path, generation, cleared[path][1] if index == 0 else 0)
+            return
+    header = {}
+    if os.path.exists(snapshot_path):
+        reader = _binary_trades if binary_session.is_binary_path(snapshot_path) else _json_trades
+        yield from reader(snapshot_path, header)
+    generation = header.get('journal_generation', 0)
+    for path in journals:
+        yield from _journal_trades(path, generation)
+
+
+def archive_trades(db_path=HISTORY_DB, account=None, start_day=None, end_day=None, kind=None,
+                   min_amount=None, max_amount=None):
+    """Trades from the multi-day archive in recording order, filtered by SQLite (read-only connection).
+
+    `account` is matched case-insensitively (names are stored upper-case, see
+    accounts.validate_name); ValueError if the archive has no cycles for it.
+    """
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    try:
+        if account is not None:
+            account = account.strip().upper()
+            if conn.execute("SELECT 1 FROM sessions WHERE account = ? LIMIT 1", (account,)).fetchone() is None:
+                raise ValueError(f"No archived cycles for account {account}")
+        clauses, params = [], []
+        if start_day or end_day:
+            clauses.append("day BETWEEN ? AND ?")
+            params += [start_day or '0000-00-00', end_day or '9999-99-99']
+        if kind is not None:
+            clauses.append("type = ?")
+            params.append(TYPE_CODES[kind])
+        if min_amount is not None:
+            clauses.append("amount >= ?")
+            params.append(min_amount)
+        if max_amount is not None:
+            clauses.append("amount <= ?")
+            params.append(max_amount)
+        if account is not None:
+            clauses.append("session_id IN (SELECT id FROM sessions WHERE account = ?)")
+            params.append(account)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        cursor = conn.execute(f"SELECT ts, type, amount, balance FROM trades{where} ORDER BY id", params)
+        cursor.arraysize = 4096
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            yield from rows
+    finally:
+        conn.close()
+
+
+def columnar_trades(path):
+    """Reads a .tmcx file back, one row group in memory at a time."""
+    with open(path, 'rb') as f:
+        magic, version, _ = COLUMNAR_PREFIX.unpack(f.read(COLUMNAR_PREFIX.size))
+        if magic != COLUMNAR_MAGIC or version != COLUMNAR_VERSION:
+            raise ValueError(f"{path}: not a version {COLUMNAR_VERSION} columnar export")
+        f.seek(-COLUMNAR_TRAILER.size, os.SEEK_END)
+        footer_len, magic = COLUMNAR_TRAILER.unpack(f.read(COLUMNAR_TRAILER.size))
+        if magic != COLUMNAR_MAGIC:
+            raise ValueError(f"{path}: missing footer (incomplete export?)")
+        f.seek(-COLUMNAR_TRAILER.size - footer_len, os.SEEK_END)
+        footer = json.loads(f.read(footer_len))
+        previous = 0
+        for group in footer['row_groups']:
+            f.seek(group['offset'])
+            columns = []
+            for (name, typecode), size in zip(footer['columns'], group['sizes']):
+                column = array(typecode)
+                column.frombytes(zlib.decompress(f.read(size)))
+                if name == 'timestamps': # Stored as deltas running on from the previous group
+                    column = list(itertools.accumulate(column, initial=previous))[1:]
+                    previous = column[-1]
+                columns.append(column)
+            yield from zip(*columns)
+
+
+# ===================================================================
+# FILTERS
+# ===================================================================
+
+def _day_start(day):
+    return int(time.mktime(date.fromisoformat(day).timetuple()))
+
+
+def filter_trades(trades, start_day=None, end_day=None, kind=None, min_amount=None, max_amount=None):
+    """Keeps trades whose local date is within [start_day, end_day] (YYYY-MM-DD, inclusive), of `kind`
+    ('WIN'/'LOSE') and with an amount inside the bounds. Unset filters cost nothing."""
+    if start_day is not None:
+        low = _day_start(start_day)
+        trades = (t for t in trades if t[0] >= low)
+    if end_day is not None:
+        high = _day_start((date.fromisoformat(end_day) + timedelta(days=1)).isoformat())
+        trades = (t for t in trades if t[0] < high)
+    if kind is not None:
+        code = TYPE_CODES[kind]
+        trades = (t for t in trades if t[1] == code)
+    if min_amount is not None:
+        trades = (t for t in trades if t[2] >= min_amount)
+    if max_amount is not None:
+        trades = (t for t in trades if t[2] <= max_amount)
+    return trades
+
+
+# ===================================================================
+# WRITERS: each returns the number of trades written
+# ===================================================================
+
+def _counted(trades, counter):
+    for counter[0], trade in enumerate(trades, 1):
+        yield trade
+
+
+def write_csv(trades, f):
+    counter = [0]
+    writer = csv.writer(f)
+    writer.writerow(FIELDS)
+    writer.writerows((ts, TYPE_NAMES[code], amount, balance) for ts, code, amount, balance in _counted(trades, counter))
+    return counter[0]
+
+
+def write_jsonl(trades, f):
+    written = 0
+    write = f.write
+    for ts, code, amount, balance in trades:
+        write(f'{{"timestamp":{ts},"type":"{TYPE_NAMES[code]}","amount":{amount!r},"balance":{balance!r}}}\n')
+        written += 1
+    return written
+
+
+def write_columnar(trades, f):
+    columns = (('timestamps', 'q'), ('types', 'B'), ('amounts', 'd'), ('balances', 'd'))
+    f.write(COLUMNAR_PREFIX.pack(COLUMNAR_MAGIC, COLUMNAR_VERSION, 0))
+    offset = COLUMNAR_PREFIX.size
+    groups = []
+    written = 0
+    previous = 0 # Last timestamp of the previous group: deltas run across groups
+    iterator = iter(trades)
+    while True:
+        rows = list(itertools.islice(iterator, ROW_GROUP))
+        if not rows:
+            break
+        timestamps, types, amounts, balances = zip(*rows)
+        deltas = array('q', [timestamps[0] - previous])
+        deltas.extend(b - a for a, b in zip(timestamps, timestamps[1:]))
+        previous = timestamps[-1]
+        sizes = []
+        for block in (deltas, array('B', types), array('d', amounts), array('d', balances)):
+            packed = zlib.compress(block.tobytes(), 1)
+            f.write(packed)
+            sizes.append(len(packed))
+        groups.append({'offset': offset, 'rows': len(rows), 'sizes': sizes})
+        offset += sum(sizes)
+        written += len(rows)
+    footer = json.dumps({'columns': columns, 'rows': written, 'row_groups': groups}, separators=(',', ':')).encode()
+    f.write(footer)
+    f.write(COLUMNAR_TRAILER.pack(len(footer), COLUMNAR_MAGIC))
+    return written
+
+
+WRITERS = {'csv': (write_csv, 'w'), 'jsonl': (write_jsonl, 'w'), 'columnar': (write_columnar, 'wb')}
+
+
+def format_for(path):
+    """Export format implied by a file name."""
+    try:
+        return FORMATS[os.path.splitext(path)[1].lower()]
+    except KeyError:
+        raise ValueError(f"Unknown export format for {path} (use .csv, .jsonl or .tmcx)") from None
+
+
+def export(trades, path, fmt=None):
+    """Streams `trades` into `path` (written to a temp file and renamed on success). Returns the row count."""
+    writer, mode = WRITERS[fmt or format_for(path)]
+    temp_path = path + '.tmp'
+    with open(temp_path, mode, buffering=WRITE_BUFFER, **({'newline': ''} if mode == 'w' else {})) as f:
+        written = writer(trades, f)
+    os.replace(temp_path, path)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream trade history out as CSV, JSONL or columnar (.tmcx).")
+    parser.add_argument('output', help="Target file; the extension picks the format")
+    parser.add_argument('--source', choices=('session', 'archive', 'columnar'), default='session')
+    parser.add_argument('--session-file', default=SESSION_FILE, help="Snapshot (.json or .tmsb) for --source session")
+    parser.add_argument('--journal', default=JOURNAL_FILE, help="Journal replayed after the snapshot")
+    parser.add_argument('--db', default=HISTORY_DB, help="Archive database for --source archive")
+    parser.add_argument('--input', help="Columnar file for --source columnar")
+    parser.add_argument('--account', help="Only this account's trades (archive)")
+    parser.add_argument('--from', dest='start_day', help="First day, YYYY-MM-DD")
+    parser.add_argument('--to', dest='end_day', help="Last day, YYYY-MM-DD")
+    parser.add_argument('--type', dest='kind', choices=('WIN', 'LOSE'))
+    parser.add_argument('--min-amount', type=float)
+    parser.add_argument('--max-amount', type=float)
+    args = parser.parse_args()
+
+    filters = dict(start_day=args.start_day, end_day=args.end_day, kind=args.kind,
+                   min_amount=args.min_amount, max_amount=args.max_amount)
+    started = time.perf_counter()
+    if args.source == 'archive':
+        trades = archive_trades(args.db, args.account, **filters) # Filtered by the query itself
+    else:
+        source = columnar_trades(args.input) if args.source == 'columnar' else saved_trades(args.session_file, args.journal)
+        trades = filter_trades(source, **filters)
+    written = export(trades, args.output)
+    print(f"EXPORTED {written:,} TRADES TO {args.output} IN {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
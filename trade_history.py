@@ -0,0 +1,214 @@
+"""Columnar, array-backed trade history.
+
+TradeHistory stores each trade across four typed arrays instead of one dict:
+
+    types       array('B')  1 = WIN, 0 = LOSE
+    amounts     array('d')  trade value (float64)
+    balances    array('d')  balance after the trade (float64)
+    timestamps  array('q')  epoch seconds (int64)
+
+That is 25 bytes per trade against roughly 400 for the old dict rows. Indexing
+still returns {'type', 'amount', 'balance', 'timestamp'} dicts (timestamp as
+H:M:S) so display code written against the list of dicts keeps working.
+"""
+import time
+from array import array
+from datetime import datetime
+
+try:
+    import numpy
+except ImportError: # Optional: only needed for to_numpy()
+    numpy = None
+
+LOSE = 0
+WIN = 1
+TYPE_NAMES = ('LOSE', 'WIN')
+TYPE_CODES = {'LOSE': LOSE, 'WIN': WIN}
+COLUMNS = ('types', 'amounts', 'balances', 'timestamps')
+
+_hms_second = None
+_hms_text = ''
+
+
+def format_hms(epoch):
+    """Formats epoch seconds as local H:M:S, reusing the last result for repeated seconds."""
+    global _hms_second, _hms_text
+    if epoch != _hms_second:
+        _hms_second = epoch
+        _hms_text = time.strftime("%H:%M:%S", time.localtime(epoch))
+    return _hms_text
+
+
+def parse_timestamp(value, session_date=None):
+    """Epoch seconds for a timestamp: an int/float epoch (or its string form), an ISO datetime,
+    or a legacy H:M:S string on `session_date`."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        if '-' in value:
+            return int(datetime.fromisoformat(value).timestamp())
+        date = session_date or time.strftime("%Y-%m-%d")
+        return int(time.mktime(time.strptime(f"{date} {value}", "%Y-%m-%d %H:%M:%S")))
+    except (TypeError, ValueError):
+        return int(time.time())
+
+
+class TradeSlice:
+    """Zero-copy window onto a TradeHistory; rows are materialized only when read."""
+
+    __slots__ = ('history', 'rows')
+
+    def __init__(self, history, rows):
+        self.history = history
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TradeSlice(self.history, self.rows[index])
+        return self.history[self.rows[index]]
+
+    def __iter__(self):
+        history = self.history
+        for i in self.rows:
+            yield history[i]
+
+    def column(self, name):
+        """memoryview of one column over this window (contiguous slices only)."""
+        if self.rows.step != 1:
+            raise ValueError("column() needs a contiguous slice")
+        return memoryview(getattr(self.history, name))[self.rows.start:self.rows.stop]
+
+
+class TradeHistory:
+    """Sequence of trades stored as parallel typed arrays."""
+
+    __slots__ = COLUMNS
+
+    def __init__(self):
+        self.types = array('B')
+        self.amounts = array('d')
+        self.balances = array('d')
+        self.timestamps = array('q')
+
+    @classmethod
+    def from_records(cls, records, session_date=None):
+        """Builds a history from session-file rows (epoch or legacy H:M:S timestamps)."""
+        history = cls()
+        for trade in records:
+            history.append(trade, session_date)
+        return history
+
+    # ===================================================================
+    # SEQUENCE API
+    # ===================================================================
+
+    def __len__(self):
+        return len(self.types)
+
+    def __bool__(self):
+        return len(self.types) > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TradeSlice(self, range(len(self.types))[index])
+        return {
+            'type': TYPE_NAMES[self.types[index]], 'amount': self.amounts[index],
+            'balance': self.balances[index], 'timestamp': format_hms(self.timestamps[index])
+        }
+
+    def __iter__(self):
+        for i in range(len(self.types)):
+            yield self[i]
+
+    def __reversed__(self):
+        for i in range(len(self.types) - 1, -1, -1):
+            yield self[i]
+
+    def add(self, code, amount, balance, epoch):
+        """Appends one trade from raw column values."""
+        self.types.append(code)
+        self.amounts.append(amount)
+        self.balances.append(balance)
+        self.timestamps.append(epoch)
+
+    def append(self, trade, session_date=None):
+        """list.append compatibility: accepts a {'type', 'amount', 'balance', 'timestamp'} dict."""
+        self.add(TYPE_CODES[trade['type']], trade['amount'], trade['balance'],
+                 parse_timestamp(trade['timestamp'], session_date))
+
+    def copy(self):
+        """Independent copy (four buffer copies, no per-trade objects)."""
+        history = TradeHistory()
+        for name in COLUMNS:
+            setattr(history, name, getattr(self, name)[:])
+        return history
+
+    def record(self, index):
+        """JSON-ready row with the timestamp as epoch seconds (what the session files store)."""
+        return {
+            'type': TYPE_NAMES[self.types[index]], 'amount': self.amounts[index],
+            'balance': self.balances[index], 'timestamp': self.timestamps[index]
+        }
+
+    def to_records(self):
+        return [self.record(i) for i in range(len(self.types))]
+
+    # ===================================================================
+    # EXPORT
+    # ===================================================================
+
+    def column(self, name):
+        """Zero-copy memoryview of a column.
+
+        While a view is alive the underlying array cannot grow (array raises
+        BufferError on append), so release it - e.g. `with history.column(...)`
+        - before the next trade is recorded.
+        """
+        if name not in COLUMNS:
+            raise KeyError(name)
+        return memoryview(getattr(self, name))
+
+    def to_numpy(self):
+        """Dict of NumPy arrays sharing memory with the columns (same growth caveat as column())."""
+        if numpy is None:
+            raise RuntimeError("NumPy is required for to_numpy()")
+        return {name: numpy.frombuffer(getattr(self, name), dtype=getattr(self, name).typecode) for name in COLUMNS}
+
+    def write_columns(self, f):
+        """Writes the raw column buffers to binary file `f`, one after another."""
+        for name in COLUMNS:
+            getattr(self, name).tofile(f)
+
+    @property
+    def nbytes(self):
+        return sum(len(getattr(self, name)) * getattr(self, name).itemsize for name in COLUMNS)
+
+    # ===================================================================
+    # AGGREGATES (C-level loops over the arrays, no per-trade dicts)
+    # ===================================================================
+
+    def count(self, kind):
+        return self.types.count(TYPE_CODES[kind])
+
+    def net_profit(self):
+        """Balance change over the history: last balance minus the balance before the first trade."""
+        if not self.types:
+            return 0.0
+        first_amount = self.amounts[0] if self.types[0] else -self.amounts[0]
+        return self.balances[-1] - (self.balances[0] - first_amount)
+
+    def peak_balance(self):
+        return max(self.balances) if self.balances else None
+
+    def lowest_balance(self):
+        return min(self.balances) if self.balances else None
+
+    def largest_trade(self):
+        return max(self.amounts) if self.amounts else None
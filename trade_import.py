@@ -0,0 +1,74 @@
+"""Bulk import of a broker's fills (CSV or JSONL) through the session rules.
+
+Each row carries a type (WIN/LOSE), an amount and a timestamp. Rows are fed to
+TradingEngine.win()/loss() in order, so the engine's own sizing decides the
+recorded trade value and the daily target / stop loss locks apply exactly as
+if the buttons had been clicked. Import stops at the first row the rules
+refuse or that locks the session; the report says where.
+"""
+import csv
+import json
+import os
+
+from trade_history import parse_timestamp
+from trading_engine import TRADE_APPLIED, TRADE_RECORDED
+
+WIN_WORDS = frozenset(('WIN', 'W', 'GAIN', 'PROFIT'))
+LOSE_WORDS = frozenset(('LOSE', 'LOSS', 'L'))
+
+
+def parse_type(value):
+    """True for a win, False for a loss."""
+    word = str(value).strip().upper()
+    if word in WIN_WORDS:
+        return True
+    if word in LOSE_WORDS:
+        return False
+    raise ValueError(f"Unknown trade type {value!r}")
+
+
+def read_trades(path):
+    """Yields (is_win, amount, epoch) per row of a .csv (header: type,amount,timestamp) or .jsonl file."""
+    if os.path.splitext(path)[1].lower() in ('.jsonl', '.ndjson', '.json'):
+        with open(path, 'r') as f:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    yield parse_type(row['type']), _amount(row.get('amount')), parse_timestamp(row.get('timestamp'))
+    else:
+        with open(path, 'r', newline='') as f:
+            for row in csv.DictReader(f):
+                row = {key.strip().lower(): value for key, value in row.items() if key}
+                yield parse_type(row['type']), _amount(row.get('amount')), parse_timestamp(row.get('timestamp'))
+
+
+def _amount(value):
+    return float(value) if value not in (None, '') else None
+
+
+def import_trades(engine, rows):
+    """Applies (is_win, amount, epoch) rows to `engine` until one is refused or locks the session.
+
+    Returns a report dict: rows_applied, last_event, locked_at_row (1-based row that
+    locked or was refused, else None) and size_mismatches - rows whose recorded
+    amount differs from what the sizing rules bet.
+    """
+    win, loss = engine.win, engine.loss
+    applied = mismatches = 0
+    event = TRADE_RECORDED
+    locked_at = None
+    for row_number, (is_win, amount, epoch) in enumerate(rows, 1):
+        event = win(epoch) if is_win else loss(epoch)
+        if event in TRADE_APPLIED:
+            applied += 1
+            if amount is not None and abs(amount - engine.trades_history.amounts[-1]) > 0.005:
+                mismatches += 1
+        if event != TRADE_RECORDED:
+            locked_at = row_number
+            break
+    return {'rows_applied': applied, 'last_event': event, 'locked_at_row': locked_at, 'size_mismatches': mismatches}
+
+
+def import_file(engine, path):
+    """import_trades() over a CSV/JSONL file."""
+    return import_trades(engine, read_trades(path))
@@ -0,0 +1,291 @@
+"""Append-only write-ahead trade journal.
+
+Every applied trade is appended as one JSON line next to the session snapshot
+(trading_manager_session.json), so a crash loses at most the trades written
+since the last fsync instead of the whole day. Lifecycle changes (new cycle,
+reset, settings) are journaled too, as 'state' records carrying the engine's
+scalars, and an import of fills as a single 'batch' record. The journal is
+folded back into the snapshot by a checkpoint, which happens on lifecycle
+changes, on SAVE MEMORY and once the journal outgrows the snapshot.
+
+Journals and snapshots carry a generation number: each journal's first line is
+{"generation": g} and the snapshot stores 'journal_generation'. A checkpoint is
+split so the snapshot can be written off the main thread:
+
+    rotate()          main thread: current journal -> .prev, start generation g+1
+    write_snapshot()  any thread:  write snapshot g+1 atomically, then drop .prev
+
+Snapshots are JSON, or the binary_session format when the snapshot path ends
+in .tmsb. Recovery loads the snapshot (generation S) and replays .prev then the current
+journal, skipping any journal older than S. Until snapshot g+1 is durable the
+records of generation g survive in .prev, so a crash at any point loses nothing
+that was already journaled.
+"""
+import json
+import os
+import shutil
+
+import binary_session
+from trade_history import TradeHistory
+
+SESSION_FILE = 'trading_manager_session.json'
+JOURNAL_FILE = 'trading_manager_journal.jsonl'
+
+
+class TradeJournal:
+    """Snapshot + JSONL journal persistence for one TradingEngine session."""
+
+    def __init__(self, snapshot_path=SESSION_FILE, journal_path=JOURNAL_FILE, fsync_every=16, compact_min=10000):
+        """`fsync_every`: trades per fsync (0 = leave it to the OS, 1 = every trade).
+
+        `compact_min`: journal length that may trigger automatic compaction; the
+        journal is compacted once it holds more trades than both this and the
+        snapshot, which keeps the amortized cost per trade constant.
+        """
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.prev_path = journal_path + '.prev'
+        self.fsync_every = fsync_every
+        self.compact_min = compact_min
+        self.generation = 0
+        self.snapshot_trades = 0 # Trades already folded into the snapshot
+        self.pending = 0 # Records appended to the journal since the last rotation
+        self.loaded = False # Set by a successful load(); until then the files on disk are never truncated
+        self._unsynced = 0
+        self._file = None
+
+    # ===================================================================
+    # RECOVERY
+    # ===================================================================
+
+    def load(self, engine):
+        """Rebuilds `engine` from snapshot + journal tail. Returns True when anything was found on disk.
+
+        If reading fails, the snapshot and journals are moved aside (see
+        quarantine()) before the error is re-raised, so the fresh session that
+        follows cannot overwrite them.
+        """
+        try:
+            found = self._load(engine)
+        except Exception:
+            self.quarantine()
+            raise
+        return found
+
+    def quarantine(self):
+        """Renames the snapshot and both journals to '<name>.corrupt' (or .corrupt.N) and starts from generation 0."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        for path in (self.snapshot_path, self.journal_path, self.prev_path):
+            if os.path.exists(path):
+                target, n = path + '.corrupt', 0
+                while os.path.exists(target):
+                    n += 1
+                    target = f"{path}.corrupt.{n}"
+                os.replace(path, target)
+        self.generation = 0
+        self.snapshot_trades = 0
+        self.pending = 0
+        self.loaded = True # Nothing left on disk to protect
+
+    def _load(self, engine):
+        found = False
+        snapshot_generation = 0
+        if os.path.exists(self.snapshot_path):
+            if binary_session.is_binary_path(self.snapshot_path):
+                session_data = binary_session.load_into(engine, self.snapshot_path)
+            else:
+                with open(self.snapshot_path, 'r') as f:
+                    session_data = json.load(f)
+                engine.load_session_dict(session_data)
+            snapshot_generation = session_data.get('journal_generation', 0)
+            found = True
+        self.generation = snapshot_generation
+        self.snapshot_trades = len(engine.trades_history)
+
+        replayed_prev = self._replay(self.prev_path, engine, snapshot_generation)
+        replayed = self._replay(self.journal_path, engine, snapshot_generation)
+        found = found or replayed_prev is not None or replayed is not None
+        self.pending = replayed or 0
+        self.loaded = True # Everything on disk is in `engine`; the journal may be rewritten from here
+        if replayed_prev is not None:
+            # The process died before the last snapshot landed: fold everything in now
+            self.compact(engine.to_session_dict())
+        else:
+            if os.path.exists(self.prev_path):
+                os.remove(self.prev_path) # Already covered by the snapshot
+            self._open()
+        return found
+
+    def _replay(self, path, engine, snapshot_generation):
+        """Applies one journal file. Returns the number of records applied, or None if it was absent/stale."""
+        if not os.path.exists(path):
+            return None
+        applied = 0
+        with open(path, 'rb') as f:
+            try:
+                header = json.loads(f.readline())
+            except ValueError:
+                return None
+            if header.get('generation', -1) < snapshot_generation:
+                return None # Stale journal, its records are already in the snapshot
+            self.generation = max(self.generation, header['generation'])
+            good_bytes = f.tell()
+            torn = False
+            for line in f:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError("unterminated record")
+                    record = json.loads(line)
+                except ValueError:
+                    torn = True # Torn write at the tail of a crashed session
+                    break
+                self._apply(record, engine)
+                good_bytes += len(line)
+                applied += 1
+        if torn:
+            with open(path, 'r+b') as f:
+                f.truncate(good_bytes)
+        return applied
+
+    @staticmethod
+    def _apply(record, engine):
+        if record.get('op') == 'batch': # An import: its rows, then the engine state they left behind
+            for trade in record['trades']:
+                engine.trades_history.append(trade, engine.session_date)
+            engine.load_state_dict(record['state'])
+            return
+        if record.get('op') == 'state':
+            engine.load_state_dict(record['state'])
+            if record.get('clear_history'):
+                engine.trades_history = TradeHistory()
+            return
+        next_value = record.pop('next')
+        engine.trades_history.append(record, engine.session_date)
+        engine.current_balance = record['balance']
+        engine.current_trade_value = next_value
+        if record['type'] == 'WIN':
+            engine.wins_count += 1
+        else:
+            engine.losses_count += 1
+
+    # ===================================================================
+    # WRITING
+    # ===================================================================
+
+    def _open(self):
+        """Opens the journal for appending, starting a fresh one when nothing is pending in it."""
+        if not self.loaded:
+            self.quarantine() # load() never ran or never finished: keep what is on disk
+        fresh = self.pending == 0
+        self._file = open(self.journal_path, 'w' if fresh else 'a')
+        if fresh:
+            self._file.write(json.dumps({'generation': self.generation}) + '\n')
+            self._file.flush()
+
+    def _write(self, record):
+        if self._file is None:
+            self._open()
+        self._file.write(json.dumps(record, separators=(',', ':')) + '\n')
+        self._file.flush()
+        self.pending += 1
+        if self.fsync_every:
+            self._unsynced += 1
+            if self._unsynced >= self.fsync_every:
+                self.sync()
+
+    def append(self, trade, next_value):
+        """Journals one applied trade (a TradeHistory.record() row) plus the trade value that follows it.
+
+        O(1) in history length.
+        """
+        self._write(dict(trade, next=next_value))
+
+    def append_state(self, state, clear_history=False):
+        """Journals a lifecycle change: the engine's to_state_dict() and whether the history was cleared."""
+        self._write({'op': 'state', 'state': state, 'clear_history': clear_history})
+        self.sync()
+
+    def append_batch(self, trades, state):
+        """Journals many applied trades (TradeHistory.record() rows) as one record, plus the resulting state.
+
+        One line, so a torn write loses the whole batch rather than half of it.
+        """
+        self._write({'op': 'batch', 'trades': trades, 'state': state})
+        self.sync()
+
+    def sync(self):
+        """Forces journaled records to stable storage."""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def needs_compaction(self):
+        return self.pending >= self.compact_min and self.pending >= self.snapshot_trades
+
+    def rotate(self, trade_count):
+        """Starts journal generation g+1 and parks generation g as .prev. Returns g+1.
+
+        Call on the appending thread at the moment the state for the next snapshot
+        (holding `trade_count` trades) is captured. At most one rotation may be
+        waiting for its write_snapshot().
+        """
+        if not self.loaded:
+            self.quarantine()
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+        if os.path.exists(self.journal_path):
+            if os.path.exists(self.prev_path):
+                # The previous snapshot never landed: keep its records and add these after them
+                with open(self.journal_path, 'rb') as src, open(self.prev_path, 'ab') as dst:
+                    src.readline()
+                    shutil.copyfileobj(src, dst)
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                os.remove(self.journal_path)
+            else:
+                os.replace(self.journal_path, self.prev_path)
+        self.generation += 1
+        self.snapshot_trades = trade_count
+        self.pending = 0
+        self._open()
+        return self.generation
+
+    def write_snapshot(self, session_data, generation):
+        """Atomically writes the snapshot for `generation` (temp file + fsync + os.replace), then drops .prev.
+
+        `session_data['trades_history']` may be session-file rows or a TradeHistory. Safe to call from a
+        worker thread: it touches neither the live journal nor any engine.
+        """
+        history = session_data.get('trades_history', [])
+        if binary_session.is_binary_path(self.snapshot_path):
+            if not isinstance(history, TradeHistory):
+                history = TradeHistory.from_records(history, session_data.get('session_date'))
+            binary_session.write_session(self.snapshot_path, session_data, history, generation)
+        else:
+            if isinstance(history, TradeHistory):
+                history = history.to_records()
+            session_data = dict(session_data, trades_history=history, journal_generation=generation)
+            temp_path = self.snapshot_path + '.tmp'
+            with open(temp_path, 'w') as f:
+                json.dump(session_data, f, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.snapshot_path)
+        if os.path.exists(self.prev_path):
+            os.remove(self.prev_path)
+
+    def compact(self, session_data):
+        """Synchronous checkpoint: rotate and write `session_data` as the new snapshot."""
+        generation = self.rotate(len(session_data.get('trades_history', ())))
+        self.write_snapshot(session_data, generation)
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
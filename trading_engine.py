@@ -0,0 +1,322 @@
+"""Headless session engine for the R2HABH Trading Manager.
+
+TradingEngine holds the session state and money-management rules that used to
+live inside the Tk window. It never touches widgets or dialogs: every trade
+returns a result event and the caller decides how to present it.
+"""
+import time
+from datetime import datetime
+from itertools import repeat
+
+from sizing import Martingale, policy_from_dict
+from trade_history import TradeHistory, WIN, LOSE
+
+# Default parameter grid (unchanged business logic)
+DEFAULT_INITIAL_CAPITAL = 50.0
+DEFAULT_DAILY_GROWTH_TARGET = 5.0
+DEFAULT_STOP_LOSS_LIMIT = 5.0
+DEFAULT_STARTING_TRADE_VALUE = 1.0
+DEFAULT_TRADE_MULTIPLIER = 1.5
+
+# Result events returned by TradingEngine.win() / TradingEngine.loss()
+TRADE_RECORDED = 'TRADE_RECORDED'              # Trade applied, no lock reached
+TARGET_HIT = 'TARGET_HIT'                      # Trade applied, daily target reached, trading locked
+STOP_HIT = 'STOP_HIT'                          # Trade applied, stop loss reached, trading locked
+STOP_BREACHED = 'STOP_BREACHED'                # Refused: balance already at/below stop loss, trading locked
+INSUFFICIENT_BALANCE = 'INSUFFICIENT_BALANCE'  # Refused: balance cannot cover the trade value
+TRADING_LOCKED = 'TRADING_LOCKED'              # Refused: a previous target/stop locked the session
+
+TRADE_APPLIED = frozenset((TRADE_RECORDED, TARGET_HIT, STOP_HIT))
+
+
+def _clock():
+    """Trade timestamp: epoch seconds."""
+    return int(time.time())
+
+
+def today():
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+class TradingEngine:
+    """GUI-free trading session: balance, pluggable sizing (martingale by default) and daily target/stop locks."""
+
+    __slots__ = (
+        'initial_capital', '_daily_growth_target', '_stop_loss_limit', 'starting_trade_value', 'trade_multiplier',
+        'current_balance', '_daily_start_balance', 'current_trade_value', 'trades_history',
+        'wins_count', 'losses_count', 'session_date', 'locked', '_target', '_stop', 'sizing'
+    )
+
+    def __init__(self, initial_capital=DEFAULT_INITIAL_CAPITAL, daily_growth_target=DEFAULT_DAILY_GROWTH_TARGET,
+                 stop_loss_limit=DEFAULT_STOP_LOSS_LIMIT, trade_multiplier=DEFAULT_TRADE_MULTIPLIER,
+                 starting_trade_value=DEFAULT_STARTING_TRADE_VALUE, sizing=None):
+        self.initial_capital = initial_capital
+        self._daily_growth_target = daily_growth_target
+        self._stop_loss_limit = stop_loss_limit
+        self.starting_trade_value = starting_trade_value
+        self.trade_multiplier = trade_multiplier
+        self.sizing = sizing or Martingale() # sizing.SizingPolicy deciding each next trade value
+
+        self.current_balance = initial_capital
+        self._daily_start_balance = initial_capital
+        self.current_trade_value = self.sizing.first(initial_capital, starting_trade_value)
+        self.trades_history = TradeHistory()
+        self.wins_count = 0
+        self.losses_count = 0
+        self.session_date = today()
+        self.locked = False
+        self._refresh_levels()
+
+    # ===================================================================
+    # LEVELS: target/stop are cached and only recomputed when an input changes
+    # ===================================================================
+
+    def _refresh_levels(self):
+        self._target = self._daily_start_balance * (1 + self._daily_growth_target / 100)
+        self._stop = max(0.01, self._daily_start_balance * (1 - self._stop_loss_limit / 100))
+
+    @property
+    def daily_start_balance(self):
+        return self._daily_start_balance
+
+    @daily_start_balance.setter
+    def daily_start_balance(self, value):
+        self._daily_start_balance = value
+        self._refresh_levels()
+
+    @property
+    def daily_growth_target(self):
+        return self._daily_growth_target
+
+    @daily_growth_target.setter
+    def daily_growth_target(self, value):
+        self._daily_growth_target = value
+        self._refresh_levels()
+
+    @property
+    def stop_loss_limit(self):
+        return self._stop_loss_limit
+
+    @stop_loss_limit.setter
+    def stop_loss_limit(self, value):
+        self._stop_loss_limit = value
+        self._refresh_levels()
+
+    def calculate_daily_target(self):
+        return self._target
+
+    def calculate_stop_loss(self):
+        return self._stop
+
+    # ===================================================================
+    # TRADES
+    # ===================================================================
+
+    def check_can_trade(self):
+        """Returns None when a trade may be placed, otherwise the refusal event."""
+        if self.locked:
+            return TRADING_LOCKED
+        if self.current_balance < self.current_trade_value:
+            return INSUFFICIENT_BALANCE
+        if self.current_balance <= self._stop:
+            self.locked = True
+            return STOP_BREACHED
+        return None
+
+    def win(self, timestamp=None):
+        """Applies a winning trade and returns its result event."""
+        refusal = self.check_can_trade()
+        if refusal is not None:
+            return refusal
+        value = self.current_trade_value
+        self.current_balance += value
+        history = self.trades_history
+        history.types.append(WIN)
+        history.amounts.append(value)
+        history.balances.append(self.current_balance)
+        history.timestamps.append(_clock() if timestamp is None else timestamp)
+        self.wins_count += 1
+        self.current_trade_value = self.sizing.step(
+            True, value, self.current_balance, self.starting_trade_value, self.trade_multiplier
+        )
+        if self.current_balance >= self._target:
+            self.locked = True
+            return TARGET_HIT
+        return TRADE_RECORDED
+
+    def loss(self, timestamp=None):
+        """Applies a losing trade and returns its result event."""
+        refusal = self.check_can_trade()
+        if refusal is not None:
+            return refusal
+        value = self.current_trade_value
+        self.current_balance -= value
+        history = self.trades_history
+        history.types.append(LOSE)
+        history.amounts.append(value)
+        history.balances.append(self.current_balance)
+        history.timestamps.append(_clock() if timestamp is None else timestamp)
+        self.losses_count += 1
+        self.current_trade_value = self.sizing.step(
+            False, value, self.current_balance, self.starting_trade_value, self.trade_multiplier
+        )
+        if self.current_balance <= self._stop:
+            self.locked = True
+            return STOP_HIT
+        return TRADE_RECORDED
+
+    def replay(self, outcomes, timestamp=None, timestamps=None):
+        """Applies a stream of outcomes (truthy = WIN) until one is refused or locks the session.
+
+        Same rules as win()/loss() with the loop state kept in locals, which is
+        what makes bulk replay fast. Each trade is stamped with the matching
+        item of `timestamps` when given, else with `timestamp` (default: now).
+        Returns (trades_applied, last_event).
+        """
+        if self.locked:
+            return 0, TRADING_LOCKED
+        if timestamps is None:
+            timestamps = repeat(_clock() if timestamp is None else timestamp)
+        next_stamp = iter(timestamps).__next__
+        balance = self.current_balance
+        value = self.current_trade_value
+        start_value = self.starting_trade_value
+        multiplier = self.trade_multiplier
+        target = self._target
+        stop = self._stop
+        next_value = self.sizing.step
+        history = self.trades_history
+        add_type, add_amount = history.types.append, history.amounts.append
+        add_balance, add_stamp = history.balances.append, history.timestamps.append
+        wins = losses = 0
+        event = TRADE_RECORDED
+        for outcome in outcomes:
+            if balance < value:
+                event = INSUFFICIENT_BALANCE
+                break
+            if balance <= stop:
+                self.locked = True
+                event = STOP_BREACHED
+                break
+            if outcome:
+                balance += value
+                add_type(WIN); add_amount(value); add_balance(balance); add_stamp(next_stamp())
+                wins += 1
+                value = next_value(True, value, balance, start_value, multiplier)
+                if balance >= target:
+                    self.locked = True
+                    event = TARGET_HIT
+                    break
+            else:
+                balance -= value
+                add_type(LOSE); add_amount(value); add_balance(balance); add_stamp(next_stamp())
+                losses += 1
+                value = next_value(False, value, balance, start_value, multiplier)
+                if balance <= stop:
+                    self.locked = True
+                    event = STOP_HIT
+                    break
+        self.current_balance = balance
+        self.current_trade_value = value
+        self.wins_count += wins
+        self.losses_count += losses
+        return wins + losses, event
+
+    # ===================================================================
+    # SESSION LIFECYCLE
+    # ===================================================================
+
+    def _clear_cycle(self):
+        self.current_trade_value = self.sizing.first(self.current_balance, self.starting_trade_value)
+        self.trades_history = TradeHistory()
+        self.wins_count = 0
+        self.losses_count = 0
+        self.session_date = today()
+        self.locked = False
+
+    def new_day(self):
+        """Starts a new cycle from the current balance."""
+        self.daily_start_balance = self.current_balance
+        self._clear_cycle()
+
+    def reset(self):
+        """Wipes the session back to the initial capital."""
+        self.current_balance = self.initial_capital
+        self.daily_start_balance = self.initial_capital
+        self._clear_cycle()
+
+    def apply_settings(self, initial_capital, daily_growth_target, stop_loss_limit, trade_multiplier, sizing=None):
+        """Validates and applies new parameters. Returns True when a capital change reset the session.
+
+        A different `sizing` policy takes over from the next trade, which it re-sizes.
+        """
+        if initial_capital <= 0: raise ValueError("Capital must be positive")
+        if daily_growth_target <= 0: raise ValueError("Growth target must be positive")
+        if stop_loss_limit <= 0: raise ValueError("Stop loss must be positive")
+        if trade_multiplier <= 1: raise ValueError("Multiplier must be greater than 1")
+
+        self._daily_growth_target = daily_growth_target
+        self._stop_loss_limit = stop_loss_limit
+        self.trade_multiplier = trade_multiplier
+        if sizing is not None and sizing != self.sizing:
+            self.sizing = sizing
+            self.current_trade_value = sizing.first(self.current_balance, self.starting_trade_value)
+        self.locked = False
+        capital_changed = initial_capital != self.initial_capital
+        self.initial_capital = initial_capital
+        if capital_changed:
+            self.current_balance = initial_capital
+            self.daily_start_balance = initial_capital
+            self.current_trade_value = self.sizing.first(initial_capital, self.starting_trade_value)
+            self.trades_history = TradeHistory()
+            self.wins_count = 0
+            self.losses_count = 0
+        else:
+            self._refresh_levels()
+        return capital_changed
+
+    # ===================================================================
+    # PERSISTENCE
+    # ===================================================================
+
+    def to_state_dict(self):
+        """Scalars and settings in the trading_manager_session.json layout, without trades_history."""
+        return {
+            'current_balance': self.current_balance, 'daily_start_balance': self._daily_start_balance,
+            'current_trade_value': self.current_trade_value,
+            'wins_count': self.wins_count, 'losses_count': self.losses_count, 'session_date': self.session_date,
+            'settings': {
+                'initial_capital': self.initial_capital, 'daily_growth_target': self._daily_growth_target,
+                'stop_loss_limit': self._stop_loss_limit, 'trade_multiplier': self.trade_multiplier,
+                'sizing': self.sizing.to_dict()
+            }
+        }
+
+    def to_session_dict(self):
+        """Returns the session in the trading_manager_session.json layout."""
+        session_data = self.to_state_dict()
+        session_data['trades_history'] = self.trades_history.to_records()
+        return session_data
+
+    def load_state_dict(self, state):
+        """Restores scalars and settings from a to_state_dict() payload; trades_history is left alone."""
+        settings = state.get('settings', {})
+        self.initial_capital = settings.get('initial_capital', DEFAULT_INITIAL_CAPITAL)
+        self._daily_growth_target = settings.get('daily_growth_target', DEFAULT_DAILY_GROWTH_TARGET)
+        self._stop_loss_limit = settings.get('stop_loss_limit', DEFAULT_STOP_LOSS_LIMIT)
+        self.trade_multiplier = settings.get('trade_multiplier', DEFAULT_TRADE_MULTIPLIER)
+        self.sizing = policy_from_dict(settings.get('sizing'))
+
+        self.current_balance = state.get('current_balance', self.initial_capital)
+        self._daily_start_balance = state.get('daily_start_balance', self.initial_capital)
+        self.current_trade_value = state.get('current_trade_value', self.starting_trade_value)
+        self.session_date = state.get('session_date', today())
+        self.wins_count = state.get('wins_count', 0)
+        self.losses_count = state.get('losses_count', 0)
+        self.locked = False
+        self._refresh_levels()
+
+    def load_session_dict(self, session_data):
+        """Restores state from a trading_manager_session.json payload."""
+        self.load_state_dict(session_data)
+        self.trades_history = TradeHistory.from_records(session_data.get('trades_history', []), self.session_date)